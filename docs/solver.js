@@ -2,184 +2,137 @@ document.addEventListener('DOMContentLoaded', () => {
     const solveButton = document.getElementById('solve-button');
     const solutionInput = document.getElementById('solution');
     const resultsDiv = document.getElementById('results');
-    let wordList = [];
-
-    // Fetch the word list
-    fetch('wordle-list.json')
-        .then(response => response.json())
-        .then(data => {
-            wordList = data;
+    let solver = null;
+
+    // The word table and decision tree exported by wordle/export.py. Every
+    // guess and score shown below is looked up in it; nothing is scored here.
+    fetch('solver.bin')
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.arrayBuffer();
+        })
+        .then(buffer => {
+            solver = loadSolver(buffer);
         })
         .catch(error => {
-            console.error('Error loading word list:', error);
-            resultsDiv.innerHTML = '<p>Error loading word list. Please check the console.</p>';
+            console.error('Error loading solver data:', error);
+            resultsDiv.innerHTML = '<p>Error loading solver data. Please check the console.</p>';
         });
 
     solveButton.addEventListener('click', () => {
         const solution = solutionInput.value.trim().toUpperCase();
-        if (solution.length !== 5 || !/^[A-Z]+$/.test(solution)) {
-            resultsDiv.innerHTML = '<p>Please enter a valid 5-letter solution.</p>';
+        if (solver === null) {
+            resultsDiv.innerHTML = '<p>The solver is still loading. Please try again.</p>';
+            return;
+        }
+        if (solution.length !== solver.wordLength || !/^[A-Z]+$/.test(solution)) {
+            resultsDiv.innerHTML = `<p>Please enter a valid ${solver.wordLength}-letter solution.</p>`;
             return;
         }
-        if (!wordList.includes(solution.toLowerCase())) {
+        if (!solver.wordIds.has(solution)) {
             resultsDiv.innerHTML = `<p>The word "${solution}" is not in our word list.</p>`;
             return;
         }
-        solve(solution);
+        solve(solver.wordIds.get(solution));
     });
 
-    function scoreGuess(guess, solution) {
-        const score = new Array(5).fill('0');
-        const solutionFreq = {};
+    const NO_PARENT = 0xFFFFFFFF;
 
-        for (const char of solution) {
-            solutionFreq[char] = (solutionFreq[char] || 0) + 1;
+    function readArray(view, offset, count, size) {
+        const values = new Array(count);
+        for (let i = 0; i < count; i++) {
+            const at = offset + i * size;
+            values[i] = size === 4 ? view.getUint32(at, true)
+                : size === 2 ? view.getUint16(at, true)
+                : view.getUint8(at);
         }
+        return values;
+    }
 
-        // Pass 1: Greens
-        for (let i = 0; i < 5; i++) {
-            if (guess[i] === solution[i]) {
-                score[i] = '2';
-                solutionFreq[guess[i]]--;
-            }
+    function loadSolver(buffer) {
+        const view = new DataView(buffer);
+        const ascii = new TextDecoder('ascii');
+        const magic = ascii.decode(new Uint8Array(buffer, 0, 8));
+        if (magic !== 'WRDLWEB\0' || view.getUint16(8, true) !== 1) {
+            throw new Error('Unsupported solver data format.');
         }
-
-        // Pass 2: Yellows
-        for (let i = 0; i < 5; i++) {
-            if (score[i] !== '2') {
-                const char = guess[i];
-                if (solutionFreq[char] > 0) {
-                    score[i] = '1';
-                    solutionFreq[char]--;
-                }
-            }
+        const wordLength = view.getUint16(10, true);
+        const numWords = view.getUint32(12, true);
+        const numNodes = view.getUint32(16, true);
+        let offset = 20;
+
+        const table = ascii.decode(new Uint8Array(buffer, offset, numWords * wordLength));
+        offset += numWords * wordLength;
+        const words = [];
+        const wordIds = new Map();
+        for (let i = 0; i < numWords; i++) {
+            words.push(table.slice(i * wordLength, (i + 1) * wordLength));
+            wordIds.set(words[i], i);
         }
-        return score.join('');
-    }
 
-    function filterCandidates(guess, score, candidates) {
-        const mustBe = new Array(5).fill(null);
-        const forbidAtPos = Array.from({ length: 5 }, () => new Set());
-        const greens = {};
-        const yellows = {};
-        const grays = {};
-        const minCount = {};
-        const maxCount = {};
-
-        for (let i = 0; i < 5; i++) {
-            const gch = guess[i];
-            const s = score[i];
-            if (s === '2') {
-                mustBe[i] = gch;
-                greens[gch] = (greens[gch] || 0) + 1;
-            } else if (s === '1') {
-                forbidAtPos[i].add(gch);
-                yellows[gch] = (yellows[gch] || 0) + 1;
-            } else { // s === '0'
-                // No positional constraint for grays, but will be used for max_count
-                grays[gch] = (grays[gch] || 0) + 1;
+        const guess = readArray(view, offset, numNodes, 2);
+        offset += 2 * numNodes;
+        const candidates = readArray(view, offset, numNodes, 2);
+        offset += 2 * numNodes;
+        const parent = readArray(view, offset, numNodes, 4);
+        offset += 4 * numNodes;
+        const code = readArray(view, offset, numNodes, 1);
+        offset += numNodes;
+        const solves = readArray(view, offset, numNodes, 1);
+
+        // Each word is solved by exactly one node of the tree
+        const solvedBy = new Array(numWords).fill(-1);
+        for (let n = 0; n < numNodes; n++) {
+            if (solves[n]) {
+                solvedBy[guess[n]] = n;
             }
         }
+        return { wordLength, words, wordIds, guess, candidates, parent, code, solvedBy };
+    }
 
-        const allLetters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ";
-        for (const letter of allLetters) {
-            minCount[letter] = (greens[letter] || 0) + (yellows[letter] || 0);
-            if (grays[letter] > 0 && (greens[letter] > 0 || yellows[letter] > 0)) {
-                maxCount[letter] = minCount[letter];
-            } else if (grays[letter] > 0) {
-                 maxCount[letter] = (greens[letter] || 0);
-            }
-            else {
-                maxCount[letter] = 5; // No upper bound
-            }
+    function decodeScore(patternCode) {
+        const digits = [];
+        for (let i = 0; i < solver.wordLength; i++) {
+            digits.push(patternCode % 3);
+            patternCode = Math.floor(patternCode / 3);
         }
-
-        return candidates.filter(candidate => {
-            const w = candidate.toUpperCase();
-
-            // Greens check
-            for (let i = 0; i < 5; i++) {
-                if (mustBe[i] && w[i] !== mustBe[i]) {
-                    return false;
-                }
-            }
-
-            // Yellows positional check
-             for (let i = 0; i < 5; i++) {
-                if (forbidAtPos[i].has(w[i])) {
-                     return false;
-                }
-            }
-
-
-            // Letter count bounds
-            const wCounts = {};
-            for (const char of w) {
-                wCounts[char] = (wCounts[char] || 0) + 1;
-            }
-
-            for (const letter of allLetters) {
-                const count = wCounts[letter] || 0;
-                if (count < minCount[letter] || count > maxCount[letter]) {
-                    return false;
-                }
-            }
-
-            return true;
-        });
+        return digits.reverse().join('');
     }
 
-    function solve(solution) {
-        let candidates = [...wordList];
-        let solved = false;
-        let guessCount = 0;
-        const usedGuesses = new Set();
+    function solve(wordId) {
         resultsDiv.innerHTML = ''; // Clear previous results
 
-        const guessHistory = [];
-
-        while (!solved && guessCount < 10) { // Safety break
-            if (candidates.length === 0) {
-                resultsDiv.innerHTML += `<p>No more candidate words left. Something went wrong.</p>`;
-                break;
-            }
-
-            let availableCandidates = candidates.filter(c => !usedGuesses.has(c));
-            if (availableCandidates.length === 0) {
-                 resultsDiv.innerHTML += `<p>Ran out of unique words to guess.</p>`;
-                 break;
-            }
-            // A good starting word, or a random one if it's not available
-            let guess = (guessCount == 0 && availableCandidates.includes("crane")) ? "crane" : availableCandidates[Math.floor(Math.random() * availableCandidates.length)];
-            usedGuesses.add(guess);
-            guessCount++;
+        // The game for this solution is the path from the root to its node
+        const path = [];
+        for (let n = solver.solvedBy[wordId]; n !== -1 && n !== NO_PARENT; n = solver.parent[n]) {
+            path.push(n);
+        }
+        path.reverse();
 
-            const score = scoreGuess(guess.toUpperCase(), solution);
-            const remainingCandidates = filterCandidates(guess.toUpperCase(), score, candidates);
+        path.forEach((node, i) => {
+            const next = path[i + 1];
+            const guess = solver.words[solver.guess[node]];
+            const score = next === undefined ? '2'.repeat(solver.wordLength) : decodeScore(solver.code[next]);
+            const remaining = next === undefined ? 1 : solver.candidates[next];
 
             const resultEntry = document.createElement('div');
             resultEntry.classList.add('result-step');
             resultEntry.innerHTML = `
-                <p><strong>Guess ${guessCount}:</strong> ${guess.toUpperCase()}</p>
+                <p><strong>Guess ${i + 1}:</strong> ${guess}</p>
                 <p><strong>Score:</strong> ${score}</p>
-                <p><strong>Candidates remaining:</strong> ${remainingCandidates.length}</p>
+                <p><strong>Candidates remaining:</strong> ${remaining}</p>
             `;
             resultsDiv.appendChild(resultEntry);
+        });
 
-
-            if (score === "22222") {
-                solved = true;
-                const successMsg = document.createElement('p');
-                successMsg.className = 'success';
-                successMsg.textContent = `Successfully guessed the word '${guess.toUpperCase()}' in ${guessCount} tries!`;
-                resultsDiv.appendChild(successMsg);
-                break;
-            }
-
-            candidates = remainingCandidates;
-        }
-
-         if (!solved) {
+        if (path.length > 0) {
+            const successMsg = document.createElement('p');
+            successMsg.className = 'success';
+            successMsg.textContent = `Successfully guessed the word '${solver.words[wordId]}' in ${path.length} tries!`;
+            resultsDiv.appendChild(successMsg);
+        } else {
             const errorMsg = document.createElement('p');
             errorMsg.className = 'error';
             errorMsg.textContent = 'Failed to solve the puzzle.';
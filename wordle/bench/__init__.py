@@ -0,0 +1,11 @@
+"""
+Benchmarks for the solver's hot paths.
+
+Run from the repository root:
+  python -m wordle.bench --output bench.json
+  python -m wordle.bench --baseline bench.json
+
+See wordle/bench/runner.py for the benchmarks and options.
+"""
+
+from wordle.bench.runner import BENCHMARKS, compare_results, run_benchmarks
@@ -0,0 +1,4 @@
+from wordle.bench.runner import main
+
+if __name__ == "__main__":
+    main()
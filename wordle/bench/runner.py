@@ -0,0 +1,250 @@
+"""
+Times the solver's hot paths at several word-list sizes.
+
+Each benchmark reports operations per second and the peak memory allocated
+while running one call (measured with tracemalloc, which also sees NumPy
+buffers).  Results can be written as JSON and compared against a stored
+baseline from another commit; benchmarks that got slower than the tolerance
+allows are flagged and make the command exit with status 1.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from wordle.candidates import CandidateIndex
+from wordle.evaluator import simulate_game
+from wordle.feedback import FeedbackMatrix
+from wordle.ranker import rank_words
+from wordle.scorer import filterCandidates, scoreGuess
+from wordle.strategies import EntropyStrategy, RandomStrategy
+from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+
+DEFAULT_SIZES = [250, 1000, 2309]
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_TOLERANCE = 0.2
+RESULT_FORMAT_VERSION = 1
+
+
+def _sample_clues(words, count, rng):
+    clues = []
+    for _ in range(count):
+        guess, solution = rng.choice(words), rng.choice(words)
+        clues.append((guess, scoreGuess(guess, solution)))
+    return clues
+
+
+# Each benchmark takes (words, rng) and returns (operation, ops per call).
+
+def bench_score_guess(words, rng):
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(1000)]
+
+    def op():
+        for guess, solution in pairs:
+            scoreGuess(guess, solution)
+    return op, len(pairs)
+
+
+def bench_filter_candidates(words, rng):
+    clues = _sample_clues(words, 20, rng)
+
+    def op():
+        for guess, score in clues:
+            filterCandidates(guess, score, words)
+    return op, len(clues)
+
+
+def bench_index_filter(words, rng):
+    index = CandidateIndex(words)
+    clues = _sample_clues(words, 20, rng)
+
+    def op():
+        for guess, score in clues:
+            index.filter(guess, score)
+    return op, len(clues)
+
+
+def bench_feedback_matrix(words, rng):
+    return (lambda: FeedbackMatrix(words)), 1
+
+
+def bench_rank_words(words, rng):
+    return (lambda: rank_words(words)), 1
+
+
+def bench_simulate_game(words, rng):
+    index = CandidateIndex(words)
+    solutions = [rng.choice(words) for _ in range(20)]
+    strategy = RandomStrategy(random.Random(rng.random()))
+
+    def op():
+        for solution in solutions:
+            simulate_game(solution, words, index=index, strategy=strategy)
+    return op, len(solutions)
+
+
+def bench_simulate_game_entropy(words, rng):
+    feedback = FeedbackMatrix(words)
+    index = CandidateIndex(words)
+    solutions = [rng.choice(words) for _ in range(5)]
+
+    def op():
+        # A fresh strategy each call, so remembered decisions are not reused
+        strategy = EntropyStrategy(feedback)
+        for solution in solutions:
+            simulate_game(solution, words, feedback=feedback, index=index, strategy=strategy)
+    return op, len(solutions)
+
+
+BENCHMARKS = {
+    "score_guess": bench_score_guess,
+    "filter_candidates": bench_filter_candidates,
+    "index_filter": bench_index_filter,
+    "feedback_matrix": bench_feedback_matrix,
+    "rank_words": bench_rank_words,
+    "simulate_game": bench_simulate_game,
+    "simulate_game_entropy": bench_simulate_game_entropy,
+}
+
+
+def _measure(op, ops_per_call, min_time):
+    op()  # Warm-up
+
+    tracemalloc.start()
+    op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or calls == 0:
+        op()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls * ops_per_call / elapsed, peak
+
+
+def run_benchmarks(word_list, sizes=DEFAULT_SIZES, names=None, min_time=DEFAULT_MIN_TIME,
+                   seed=0, verbose=False):
+    """
+    Runs the named benchmarks (default: all) on the first `size` words of a
+    seeded shuffle of the word list, for every size.  Returns the result
+    document that --output writes.
+    """
+    shuffled = list(word_list)
+    random.Random(seed).shuffle(shuffled)
+
+    results = []
+    for name in names or BENCHMARKS:
+        for size in sizes:
+            words = shuffled[:size]
+            op, ops_per_call = BENCHMARKS[name](words, random.Random(seed))
+            ops_per_sec, peak = _measure(op, ops_per_call, min_time)
+            results.append({
+                "name": name,
+                "size": len(words),
+                "ops_per_sec": ops_per_sec,
+                "peak_memory_bytes": peak,
+            })
+            if verbose:
+                print(f"  {name} @ {len(words)}: {ops_per_sec:,.1f} ops/s", file=sys.stderr)
+
+    return {
+        "format": RESULT_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare_results(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Returns (name, size, current ops/s, baseline ops/s, ratio) for every
+    benchmark present in both documents whose throughput dropped by more than
+    `tolerance` (0.2 = 20%).
+    """
+    previous = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["name"], result["size"]))
+        if before is None or before["ops_per_sec"] <= 0:
+            continue
+        ratio = result["ops_per_sec"] / before["ops_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append((result["name"], result["size"], result["ops_per_sec"],
+                                before["ops_per_sec"], ratio))
+    return regressions
+
+
+def print_results(document, baseline=None):
+    previous = {}
+    if baseline is not None:
+        previous = {(r["name"], r["size"]): r for r in baseline["results"]}
+
+    print(f"{'Benchmark':<22}  {'Size':>5}  {'Ops/sec':>12}  {'Peak memory':>12}  {'vs baseline':>11}")
+    print(f"{'-' * 22}  {'-' * 5}  {'-' * 12}  {'-' * 12}  {'-' * 11}")
+    for r in document["results"]:
+        before = previous.get((r["name"], r["size"]))
+        change = ""
+        if before is not None and before["ops_per_sec"] > 0:
+            change = f"{r['ops_per_sec'] / before['ops_per_sec'] - 1:+.1%}"
+        print(f"{r['name']:<22}  {r['size']:>5}  {r['ops_per_sec']:>12,.1f}  "
+              f"{r['peak_memory_bytes'] / 1024:>10,.0f}KB  {change:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Wordle solver's hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Word-list sizes to run at (default: {DEFAULT_SIZES})")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None,
+                        help="Run only these benchmarks")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help=f"Seconds to run each benchmark for (default: {DEFAULT_MIN_TIME})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for word and clue sampling")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Compare against results previously written with --output")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Slowdown allowed before flagging a regression (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    try:
+        word_list = load_word_list()
+    except Exception as e:
+        print(f"Error loading word list from {DEFAULT_WORD_LIST}: {e}")
+        sys.exit(2)
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        except Exception as e:
+            print(f"Error loading baseline from {args.baseline}: {e}")
+            sys.exit(2)
+
+    document = run_benchmarks(word_list, args.sizes, args.only, args.min_time, args.seed,
+                              verbose=True)
+    print_results(document, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+    if baseline is not None:
+        regressions = compare_results(document, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for name, size, now, before, ratio in regressions:
+                print(f"  {name} @ {size}: {now:,.1f} ops/s vs {before:,.1f} ({ratio - 1:+.1%})")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
@@ -0,0 +1,180 @@
+"""
+Opening books: precomputed early guesses for a fixed opener.
+
+After a fixed opener the first reply is one of at most 243 patterns, and
+after the book's second guess the reply again narrows things to a handful of
+cases, so the most expensive decisions of every game (the ones made over the
+largest candidate sets) are the same few hundred in every game.  An opening
+book computes them once with a deterministic strategy and stores them by the
+pattern codes received so far:
+
+  ()          -> the opener
+  (c1,)       -> the second guess after the opener scored c1
+  (c1, c2)    -> the third guess, with depth=2
+
+WordleGame and evaluator.simulate_game consult a book before asking their
+strategy, so those guesses become dictionary lookups.  A book is only valid
+for the word lists it was built from; `key` identifies them.
+
+Usage:
+  python wordle/book.py --opener CRANE --depth 2 --output crane.book.npz
+  python wordle/evaluator.py --strategy entropy --exhaustive --book crane.book.npz
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.feedback import (
+        FeedbackMatrix, cache_key, encode_score, load_feedback_matrix,
+    )
+    from wordle.strategies import EntropyStrategy
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+except ImportError:
+    from feedback import (
+        FeedbackMatrix, cache_key, encode_score, load_feedback_matrix,
+    )
+    from strategies import EntropyStrategy
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+
+BOOK_FORMAT_VERSION = 1
+MAX_BOOK_DEPTH = 2
+# Code paths of moves shallower than the book's depth are padded with the
+# largest value of their dtype: uint8 (255) for 5-letter words, whose codes
+# stop at 242, and uint16 for longer words.
+
+
+class OpeningBook:
+    """
+    The guess to play for every sequence of pattern codes the book covers,
+    starting from its opener.  `key` is the `feedback.cache_key` of the word
+    lists it was built for.
+    """
+
+    def __init__(self, opener: str, moves: dict, key: str, depth: int):
+        self.opener = opener.upper()
+        self.moves = moves
+        self.key = key
+        self.depth = depth
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def matches(self, feedback: FeedbackMatrix) -> bool:
+        """True if the book was built for the matrix's word lists."""
+        return self.key == cache_key(feedback.guesses, feedback.solutions)
+
+    def lookup(self, history) -> str:
+        """
+        Returns the book's guess after a history of (guess, score) pairs, or
+        None once the game has left the book: past its depth, or after a
+        guess the book would not have played.
+        """
+        codes = ()
+        for guess, score in history:
+            if self.moves.get(codes) != guess.upper():
+                return None
+            codes += (encode_score(score, len(score)),)
+        return self.moves.get(codes)
+
+    def save(self, path: str):
+        """Writes the book as a compact .npz file of fixed-width arrays."""
+        words = sorted(set(self.moves.values()))
+        word_ids = {w: i for i, w in enumerate(words)}
+        widest = max((max(codes) for codes in self.moves if codes), default=0)
+        dtype = np.uint8 if widest < np.iinfo(np.uint8).max else np.uint16
+        paths = np.full((len(self.moves), self.depth), np.iinfo(dtype).max, dtype=dtype)
+        guesses = np.empty(len(self.moves), dtype=np.uint16)
+        for n, (codes, guess) in enumerate(sorted(self.moves.items())):
+            paths[n, :len(codes)] = codes
+            guesses[n] = word_ids[guess]
+        # Passing a file object keeps np.savez from appending ".npz" to the name
+        with open(path, "wb") as f:
+            np.savez(f, format=BOOK_FORMAT_VERSION, key=self.key, depth=self.depth,
+                     words=np.array(words, dtype="S"), paths=paths, guesses=guesses)
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        with np.load(path) as data:
+            if int(data["format"]) != BOOK_FORMAT_VERSION:
+                raise ValueError("Unsupported opening book format.")
+            words = [w.decode("ascii") for w in data["words"]]
+            padding = np.iinfo(data["paths"].dtype).max
+            moves = {
+                tuple(int(c) for c in codes if c != padding): words[guess]
+                for codes, guess in zip(data["paths"], data["guesses"])
+            }
+            return cls(moves[()], moves, str(data["key"]), int(data["depth"]))
+
+
+def build_opening_book(feedback: FeedbackMatrix, opener: str, depth: int = 1,
+                       strategy=None) -> OpeningBook:
+    """
+    Computes the opening book for `opener` over all solutions of the matrix,
+    `depth` guesses beyond the opener (1 or 2).  The strategy must offer
+    `best_guess(columns)`, as EntropyStrategy (the default) does.
+    """
+    opener = opener.upper()
+    if opener not in feedback.guess_index:
+        raise ValueError(f"'{opener}' is not in the guess list.")
+    if not 1 <= depth <= MAX_BOOK_DEPTH:
+        raise ValueError(f"Book depth must be between 1 and {MAX_BOOK_DEPTH}.")
+    if strategy is None:
+        strategy = EntropyStrategy(feedback)
+
+    moves = {(): opener}
+    pending = [((), opener, np.arange(len(feedback.solutions), dtype=np.intp))]
+    while pending:
+        codes, guess, columns = pending.pop()
+        row = feedback.row(guess)[columns]
+        for code in np.unique(row):
+            if code == feedback.solved_pattern:
+                continue
+            path = codes + (int(code),)
+            remaining = columns[row == code]
+            moves[path] = strategy.best_guess(remaining, used_guesses=_moves_along(moves, path))
+            if len(path) < depth:
+                pending.append((path, moves[path], remaining))
+
+    return OpeningBook(opener, moves, cache_key(feedback.guesses, feedback.solutions), depth)
+
+
+def _moves_along(moves: dict, codes: tuple) -> set:
+    """The guesses the book has already played on the way to `codes`."""
+    return {moves[codes[:n]] for n in range(len(codes))}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build an opening book of the entropy strategy's early guesses."
+    )
+    parser.add_argument("--opener", type=str, required=True, help="The fixed first guess")
+    parser.add_argument("--depth", type=int, default=1, choices=range(1, MAX_BOOK_DEPTH + 1),
+                        help="Guesses to precompute after the opener (default: 1)")
+    parser.add_argument("--output", type=str, required=True, help="Write the book to this file")
+    args = parser.parse_args()
+
+    try:
+        word_list = load_word_list()
+    except Exception as e:
+        print(f"Error loading word list from {DEFAULT_WORD_LIST}: {e}")
+        return
+
+    feedback = load_feedback_matrix(word_list)
+    try:
+        book = build_opening_book(feedback, args.opener, args.depth)
+    except ValueError as e:
+        print(e)
+        return
+    book.save(args.output)
+    print(f"Opening book for {book.opener}: {len(book)} moves, depth {book.depth}, "
+          f"written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
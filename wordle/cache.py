@@ -0,0 +1,79 @@
+"""
+A bounded least-recently-used cache with hit, miss and eviction counters.
+
+Used to remember results that recur across games, such as the suggestion for
+a popular opening, while keeping memory bounded.  The counters make it
+possible to size a cache for a workload: a high eviction count next to a low
+hit rate means the cache is too small for the working set.
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+
+
+def canonical_state(history) -> tuple:
+    """The cache key of a game state: its (GUESS, score) pairs as a tuple."""
+    return tuple((guess.upper(), score) for guess, score in history)
+
+
+class LRUCache:
+    """
+    Maps keys to values, holding at most `maxsize` entries and evicting the
+    least recently used one when full.  Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        # Does not count as a lookup or refresh the entry
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Returns the value for key, marking it most recently used."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            elif len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._entries[key] = value
+
+    def clear(self):
+        """Drops every entry; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
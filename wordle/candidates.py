@@ -0,0 +1,210 @@
+"""
+Index-based candidate filtering.
+
+`CandidateIndex` precomputes, for a fixed word list, one boolean mask per
+(position, letter) pair and one letter-count array per letter.  Applying a
+guess/score clue is then a handful of vectorized mask operations over the
+candidate set, and the result is an array of word indices rather than a new
+list of strings.  The clue semantics are exactly those of
+`scorer.filterCandidates`.
+
+Games scored through a FeedbackMatrix skip the clue altogether: the words
+still in play are exactly those that would have produced the same pattern
+code, so `CandidateIndex.filter_code` narrows the candidates with one table
+lookup and comparison.
+"""
+
+import weakref
+from collections import Counter
+
+import numpy as np
+
+try:
+    from wordle.feedback import WORD_LENGTH
+    from wordle.profiling import profiled
+    from wordle.words import ALPHABET_SIZE, WordTable
+except ImportError:
+    from feedback import WORD_LENGTH
+    from profiling import profiled
+    from words import ALPHABET_SIZE, WordTable
+
+
+def letter_constraints(guess: str, score: str, length: int = WORD_LENGTH):
+    """
+    Translates a guess and its score, both `length` characters long, into
+    letter constraints.
+
+    Returns (must_be, forbid_at_pos, min_count, max_count): the letter required
+    at each position (or None), the letters excluded at each position, and the
+    allowed count range of every letter that appears in the guess.  Letters
+    absent from the guess are unconstrained.
+    """
+    if len(guess) != length or len(score) != length:
+        raise ValueError(f"Guess and score must both be of length {length}.")
+    if not guess.isalpha():
+        raise ValueError("Guess must contain only alphabetic characters.")
+    if not all(c in '012' for c in score):
+        raise ValueError("Score must only contain characters '0', '1', or '2'.")
+
+    guess = guess.upper()
+
+    must_be = [None] * length
+    forbid_at_pos = [set() for _ in range(length)]
+    found = Counter()
+    grays = Counter()
+
+    for i, (gch, s) in enumerate(zip(guess, score)):
+        if s == '2':
+            must_be[i] = gch
+            found[gch] += 1
+        else:
+            # Both '0' and '1' rule the letter out at this position
+            forbid_at_pos[i].add(gch)
+            if s == '1':
+                found[gch] += 1
+            else:
+                grays[gch] += 1
+
+    min_count = {}
+    max_count = {}
+    for letter in set(guess):
+        min_count[letter] = found[letter]
+        max_count[letter] = found[letter] if grays[letter] > 0 else length
+
+    return must_be, forbid_at_pos, min_count, max_count
+
+
+class CandidateIndex:
+    """
+    Precomputed letter masks for a word list (or an existing WordTable).
+
+    `position_masks[p, c]` is True for the words with letter c (A=0 ... Z=25)
+    at position p, and `letter_counts[c]` holds how often letter c occurs in
+    each word.  Word indices are the ids of the underlying `table`, and
+    clues must have the table's `length`.
+    """
+
+    def __init__(self, words):
+        self.table = words if isinstance(words, WordTable) else WordTable(words)
+        self.words = self.table.words
+        self.word_index = self.table.word_index
+        self.letters = self.table.letters
+        self.letter_counts = self.table.letter_counts
+        self.length = self.table.length
+
+        alphabet = np.arange(ALPHABET_SIZE, dtype=np.uint8)[:, None]
+        self.position_masks = np.stack(
+            [self.letters[:, p] == alphabet for p in range(self.length)]
+        )
+        self._feedback_columns = weakref.WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def updated(self, words: list[str]) -> "CandidateIndex":
+        """Returns the index of an edited word list, reusing this one's letters and counts."""
+        return CandidateIndex(self.table.updated(words))
+
+    def all_ids(self) -> np.ndarray:
+        return self.table.all_ids()
+
+    def ids(self, words: list[str]) -> np.ndarray:
+        """Returns the index of each word in the list."""
+        return self.table.ids(words)
+
+    @profiled(size=lambda self, ids: len(ids))
+    def words_at(self, ids) -> list[str]:
+        """Returns the words at the given indices."""
+        return self.table.words_at(ids)
+
+    @profiled(size=lambda self, guess, score, candidates=None: _count(self, candidates))
+    def filter_hard(self, guess: str, score: str, candidates: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the indices among `candidates` (default: all words) that hard
+        mode still allows after the clue: words with every green letter in
+        place and every revealed letter at least as often as it was revealed.
+        Unlike `filter`, grays and yellow positions rule nothing out.
+
+        Hard-mode constraints only accumulate, so applying each clue to the
+        previous pool gives the pool for the whole history.
+        """
+        must_be, _, min_count, _ = letter_constraints(guess, score, self.length)
+
+        ids = self.all_ids() if candidates is None else np.asarray(candidates, dtype=np.intp)
+        keep = np.ones(len(ids), dtype=bool)
+        for i in range(self.length):
+            if must_be[i] is not None:
+                keep &= self._position_mask(i, must_be[i])[ids]
+        for ch, low in min_count.items():
+            if low:
+                keep &= self._letter_count(ch)[ids] >= low
+        return ids[keep]
+
+    def feedback_columns(self, feedback):
+        """
+        Returns the solution column of every word of the index in a
+        FeedbackMatrix, or None if some word is not one of its solutions.
+        The mapping is computed once per matrix.
+        """
+        if feedback not in self._feedback_columns:
+            columns = np.array([feedback.solution_index.get(w.upper(), -1) for w in self.words],
+                               dtype=np.intp)
+            self._feedback_columns[feedback] = None if (columns < 0).any() else columns
+        return self._feedback_columns[feedback]
+
+    @profiled(size=lambda self, patterns, code, candidates=None, columns=None:
+              _count(self, candidates))
+    def filter_code(self, patterns: np.ndarray, code: int, candidates: np.ndarray = None,
+                    columns: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the indices among `candidates` (default: all words) whose
+        entry in `patterns`, one guess's row of pattern codes, equals `code`.
+
+        Equivalent to `filter` with the score of that code, for any code the
+        guess can actually receive.  `columns` maps word indices to positions
+        in `patterns` (default: the same positions).
+        """
+        ids = self.all_ids() if candidates is None else candidates
+        positions = ids if columns is None else columns[ids]
+        return ids[patterns[positions] == code]
+
+    @profiled(size=lambda self, guess, score, candidates=None: _count(self, candidates))
+    def filter(self, guess: str, score: str, candidates: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the indices among `candidates` (default: all words) that are
+        consistent with `guess` having scored `score`.
+        """
+        must_be, forbid_at_pos, min_count, max_count = letter_constraints(guess, score,
+                                                                          self.length)
+
+        ids = self.all_ids() if candidates is None else np.asarray(candidates, dtype=np.intp)
+        keep = np.ones(len(ids), dtype=bool)
+
+        for i in range(self.length):
+            if must_be[i] is not None:
+                keep &= self._position_mask(i, must_be[i])[ids]
+            for ch in forbid_at_pos[i]:
+                keep &= ~self._position_mask(i, ch)[ids]
+
+        for ch, low in min_count.items():
+            counts = self._letter_count(ch)[ids]
+            keep &= (counts >= low) & (counts <= max_count[ch])
+
+        return ids[keep]
+
+    def _position_mask(self, position: int, letter: str) -> np.ndarray:
+        code = ord(letter) - ord('A')
+        if not 0 <= code < ALPHABET_SIZE:
+            return np.zeros(len(self.words), dtype=bool)
+        return self.position_masks[position, code]
+
+    def _letter_count(self, letter: str) -> np.ndarray:
+        code = ord(letter) - ord('A')
+        if not 0 <= code < ALPHABET_SIZE:
+            return np.zeros(len(self.words), dtype=np.uint8)
+        return self.letter_counts[code]
+
+
+def _count(index: CandidateIndex, candidates) -> int:
+    """Size of a candidate set passed to a CandidateIndex method (None: all words)."""
+    return len(index) if candidates is None else len(candidates)
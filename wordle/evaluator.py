@@ -1,24 +1,58 @@
 import argparse
-import json
+import functools
+import multiprocessing
 import random
 import sys
 import os
+import time
 
 # Add the root directory to sys.path to allow absolute imports if needed
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 try:
-    from wordle.scorer import WordleGame
+    from wordle.scorer import QuordleGame, WordleGame
+    from wordle.book import OpeningBook
+    from wordle.cache import LRUCache
+    from wordle.feedback import load_feedback_matrix
+    from wordle.candidates import CandidateIndex
+    from wordle.profiling import PROFILER, add_profile_arguments, profiled, start_profiling
+    from wordle.strategies import STRATEGY_NAMES, make_multi_board_strategy, make_strategy
+    from wordle.tree import TreeBuilder
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+    from wordle.words import merge_guess_list
 except ImportError:
     # Fallback for running directly from the wordle directory
-    from scorer import WordleGame
+    from scorer import QuordleGame, WordleGame
+    from book import OpeningBook
+    from cache import LRUCache
+    from feedback import load_feedback_matrix
+    from candidates import CandidateIndex
+    from profiling import PROFILER, add_profile_arguments, profiled, start_profiling
+    from strategies import STRATEGY_NAMES, make_multi_board_strategy, make_strategy
+    from tree import TreeBuilder
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+    from words import merge_guess_list
 
-def simulate_game(solution, word_list, first_guess=None):
+# Guesses allowed in a real game; longer games count as failures
+MAX_GUESSES = 6
+
+@profiled()
+def simulate_game(solution, word_list, first_guess=None, feedback=None, index=None,
+                  strategy=None, filter_cache=None, hard_mode=False, guess_index=None,
+                  book=None):
     """
     Simulates a single Wordle game for a given solution and word list.
-    Optionally starts with a specific first guess.
+    Optionally starts with a specific first guess. A FeedbackMatrix, a
+    CandidateIndex of the word list, a guess strategy and an LRUCache of
+    filtered candidate sets can be shared between games; the word list itself
+    is never copied or modified. A separate CandidateIndex of allowed guesses
+    only matters in hard mode; strategies take their guesses from the matrix.
+    An OpeningBook, if given, picks the early guesses (and the opener, unless
+    first_guess is given) before the strategy does.
     """
-    game = WordleGame(solution, word_list.copy())
+    game = WordleGame(solution, word_list, feedback=feedback, index=index,
+                      strategy=strategy, filter_cache=filter_cache, hard_mode=hard_mode,
+                      guess_index=guess_index, book=book)
 
     if first_guess:
         game.guess_count += 1
@@ -38,7 +72,35 @@ def simulate_game(solution, word_list, first_guess=None):
             break
     return game.guess_count
 
-def evaluate_strategy(word_list, num_runs, first_guess=None):
+@profiled()
+def simulate_multi_game(solutions, word_list, first_guess=None, feedback=None, index=None,
+                        strategy=None, max_guesses=None, filter_cache=None, hard_mode=False,
+                        guess_index=None):
+    """
+    Quietly plays one multi-board (Quordle-style) game, one board per
+    solution, and returns (won, guesses, boards_solved). The game stops once
+    every board is solved or after max_guesses (default: boards + 5) guesses.
+    """
+    game = QuordleGame(solutions, word_list, feedback=feedback, strategy=strategy,
+                       max_guesses=max_guesses, index=index, filter_cache=filter_cache,
+                       hard_mode=hard_mode, guess_index=guess_index)
+
+    while not game.solved and game.guess_count < game.max_guesses:
+        if first_guess and game.guess_count == 0:
+            guess = first_guess
+        else:
+            try:
+                guess = game.suggest_guess()
+            except ValueError:
+                break
+        game.guess_count += 1
+        game.guess_and_update(guess)
+
+    return game.solved, game.guess_count, sum(1 for board in game.games if board.solved)
+
+def evaluate_strategy(word_list, num_runs, first_guess=None, feedback=None, index=None,
+                      strategy=None, filter_cache=None, hard_mode=False, guess_index=None,
+                      book=None):
     """
     Runs num_runs simulations and returns the average number of guesses.
     If first_guess is None, the solver uses its default suggestion for each guess.
@@ -46,31 +108,431 @@ def evaluate_strategy(word_list, num_runs, first_guess=None):
     total_guesses = 0
     for _ in range(num_runs):
         solution = random.choice(word_list)
-        total_guesses += simulate_game(solution, word_list, first_guess)
+        total_guesses += simulate_game(solution, word_list, first_guess, feedback=feedback,
+                                       index=index, strategy=strategy,
+                                       filter_cache=filter_cache, hard_mode=hard_mode,
+                                       guess_index=guess_index, book=book)
     return total_guesses / num_runs
 
+# Games handed to a worker at a time. Shards are fixed-size and seeded by
+# their position, so results do not depend on the number of workers.
+SHARD_SIZE = 32
+
+# Per-process state for pool workers, set up once by _init_worker
+_worker = {}
+
+def _load_feedback(word_list, guesses=None):
+    if guesses is None:
+        return load_feedback_matrix(word_list)
+    return load_feedback_matrix(guesses, word_list)
+
+def _init_worker(word_list, strategy_name, filter_cache_size=0, hard_mode=False, guesses=None,
+                 book=None):
+    # The feedback matrix comes from the memory-mapped cache, so all workers
+    # share one copy of it
+    _worker.clear()
+    _worker["word_list"] = word_list
+    _worker["feedback"] = _load_feedback(word_list, guesses)
+    _worker["index"] = CandidateIndex(word_list)
+    _worker["guess_index"] = CandidateIndex(guesses) if guesses is not None else None
+    _worker["strategy_name"] = strategy_name
+    _worker["filter_cache"] = LRUCache(filter_cache_size) if filter_cache_size else None
+    _worker["hard_mode"] = hard_mode
+    _worker["book"] = book
+
+def _shard_strategy(seed, multi_board=False):
+    # Random strategies get a fresh RNG per shard so that seeded runs are
+    # reproducible; deterministic ones are kept for the worker's lifetime so
+    # their remembered decisions carry over between shards
+    name = _worker["strategy_name"]
+    make = make_multi_board_strategy if multi_board else make_strategy
+    if name == "random":
+        return make(name, _worker["feedback"], random.Random(seed))
+    key = "multi_board_strategy" if multi_board else "strategy"
+    if key not in _worker:
+        _worker[key] = make(name, _worker["feedback"])
+    return _worker[key]
+
+def _run_profiled(run, shard):
+    # Hands the worker's profile counters back with each shard's results
+    return run(shard), PROFILER.take()
+
+def _map_shards(pool, run, shards):
+    """pool.map(run, shards), merging the workers' profiles into this process's."""
+    if not PROFILER.enabled:
+        return pool.map(run, shards)
+    results = []
+    for result, phases in pool.map(functools.partial(_run_profiled, run), shards):
+        PROFILER.merge(phases)
+        results.append(result)
+    return results
+
+def _run_shard(shard):
+    solutions, first_guess, seed = shard
+    feedback = _worker["feedback"]
+    strategy = _shard_strategy(seed)
+    return [
+        simulate_game(solution, _worker["word_list"], first_guess, feedback=feedback,
+                      index=_worker["index"], strategy=strategy,
+                      filter_cache=_worker["filter_cache"], hard_mode=_worker["hard_mode"],
+                      guess_index=_worker["guess_index"], book=_worker["book"])
+        for solution in solutions
+    ]
+
+def simulate_games_parallel(word_list, solutions, first_guess=None, strategy_name="random",
+                            workers=None, seed=None, filter_cache_size=0, hard_mode=False,
+                            guesses=None, book=None):
+    """
+    Plays one game per solution across a pool of worker processes and returns
+    the guess counts in the same order as `solutions`.
+    Each shard of games uses its own RNG derived from `seed`, so a given seed
+    reproduces the same results for any number of workers (workers=1 runs the
+    shards in this process; None uses one worker per CPU). With a
+    filter_cache_size each worker keeps an LRUCache of candidate sets,
+    `guesses` is a separate allowed-guess list (default: the word list) and
+    `book` an OpeningBook every game consults.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    shards = [
+        (solutions[start:start + SHARD_SIZE], first_guess, seed * 100003 + n)
+        for n, start in enumerate(range(0, len(solutions), SHARD_SIZE))
+    ]
+    if workers == 1:
+        _init_worker(word_list, strategy_name, filter_cache_size, hard_mode, guesses, book)
+        results = [_run_shard(shard) for shard in shards]
+    else:
+        # Build the shared cache file before the workers try to open it
+        _load_feedback(word_list, guesses)
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(word_list, strategy_name, filter_cache_size,
+                                            hard_mode, guesses, book)) as pool:
+            results = _map_shards(pool, _run_shard, shards)
+    return [guesses for shard in results for guesses in shard]
+
+def _run_multi_shard(shard):
+    games, first_guess, max_guesses, seed = shard
+    strategy = _shard_strategy(seed, multi_board=True)
+    return [
+        simulate_multi_game(solutions, _worker["word_list"], first_guess,
+                            feedback=_worker["feedback"], index=_worker["index"],
+                            strategy=strategy, max_guesses=max_guesses,
+                            filter_cache=_worker["filter_cache"], hard_mode=_worker["hard_mode"],
+                            guess_index=_worker["guess_index"])
+        for solutions in games
+    ]
+
+def evaluate_multi_board(word_list, num_boards, num_games, first_guess=None,
+                         strategy_name="random", workers=1, seed=None, max_guesses=None,
+                         filter_cache_size=0, hard_mode=False, guesses=None):
+    """
+    Plays num_games multi-board games of num_boards distinct random solutions
+    each, quietly and in fixed-size seeded shards like simulate_games_parallel
+    (workers=1 runs them in this process; None uses one worker per CPU).
+    Returns the summary from summarize_multi_results, including games/sec.
+    """
+    if max_guesses is None:
+        max_guesses = num_boards + 5
+    if seed is None:
+        seed = random.randrange(2**32)
+    rng = random.Random(seed)
+    games = [rng.sample(word_list, num_boards) for _ in range(num_games)]
+    shards = [
+        (games[start:start + SHARD_SIZE], first_guess, max_guesses, seed * 100003 + n)
+        for n, start in enumerate(range(0, len(games), SHARD_SIZE))
+    ]
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        _init_worker(word_list, strategy_name, filter_cache_size, hard_mode, guesses)
+        results = [_run_multi_shard(shard) for shard in shards]
+    else:
+        _load_feedback(word_list, guesses)
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(word_list, strategy_name, filter_cache_size,
+                                            hard_mode, guesses)) as pool:
+            results = _map_shards(pool, _run_multi_shard, shards)
+    elapsed = time.perf_counter() - start_time
+
+    summary = summarize_multi_results([game for shard in results for game in shard], num_boards)
+    summary["seconds"] = elapsed
+    summary["games_per_sec"] = num_games / elapsed if elapsed > 0 else 0.0
+    return summary
+
+def evaluate_parallel(word_list, num_runs, first_guess=None, strategy_name="random",
+                      workers=None, seed=None, filter_cache_size=0, hard_mode=False,
+                      guesses=None, book=None):
+    """
+    Parallel version of evaluate_strategy: samples num_runs solutions and
+    returns the average number of guesses, simulating games in `workers`
+    processes.
+    """
+    rng = random.Random(seed)
+    solutions = [rng.choice(word_list) for _ in range(num_runs)]
+    results = simulate_games_parallel(word_list, solutions, first_guess, strategy_name,
+                                      workers, seed, filter_cache_size, hard_mode, guesses,
+                                      book)
+    return sum(results) / num_runs
+
+def summarize_results(guess_counts):
+    """
+    Summarizes per-game guess counts: number of games, mean, max, failures
+    (games over MAX_GUESSES) and the distribution {guesses: games}.
+    """
+    distribution = {}
+    for guesses in guess_counts:
+        distribution[guesses] = distribution.get(guesses, 0) + 1
+    return {
+        "games": len(guess_counts),
+        "mean": sum(guess_counts) / len(guess_counts) if guess_counts else 0.0,
+        "max": max(guess_counts, default=0),
+        "failures": sum(1 for guesses in guess_counts if guesses > MAX_GUESSES),
+        "distribution": dict(sorted(distribution.items())),
+    }
+
+def summarize_multi_results(results, num_boards):
+    """
+    Summarizes (won, guesses, boards_solved) results of multi-board games:
+    number of games, wins, win rate, mean guesses of the won games, the
+    distribution {guesses: games} of won games and the mean boards solved.
+    """
+    wins = [guesses for won, guesses, _ in results if won]
+    distribution = {}
+    for guesses in wins:
+        distribution[guesses] = distribution.get(guesses, 0) + 1
+    return {
+        "games": len(results),
+        "boards": num_boards,
+        "wins": len(wins),
+        "win_rate": len(wins) / len(results) if results else 0.0,
+        "mean": sum(wins) / len(wins) if wins else 0.0,
+        "mean_boards_solved": (sum(solved for _, _, solved in results) / len(results)
+                               if results else 0.0),
+        "distribution": dict(sorted(distribution.items())),
+    }
+
+def evaluate_exhaustive(word_list, first_guess=None, feedback=None, index=None, strategy=None,
+                        filter_cache=None, hard_mode=False, guess_index=None, book=None):
+    """
+    Plays every word in the list exactly once as the solution and returns the
+    summary from summarize_results. With a deterministic strategy the result
+    is exact, so runs are directly comparable.
+    """
+    if index is None:
+        index = CandidateIndex(word_list)
+    guess_counts = [
+        simulate_game(solution, word_list, first_guess, feedback=feedback, index=index,
+                      strategy=strategy, filter_cache=filter_cache, hard_mode=hard_mode,
+                      guess_index=guess_index, book=book)
+        for solution in word_list
+    ]
+    return summarize_results(guess_counts)
+
+def evaluate_tree(builder, first_guess=None):
+    """
+    Exhaustive evaluation of a deterministic strategy by building its decision
+    tree (see wordle/tree.py) and walking it once, instead of simulating one
+    game per solution.
+    """
+    tree = builder.build(first_guess)
+    return summarize_results(list(tree.guess_counts().values()))
+
+def print_summary(summary, label):
+    print(f"Exhaustive evaluation ({label}) over {summary['games']} solutions:")
+    print(f"  Mean guesses: {summary['mean']:.4f}  Max: {summary['max']}  "
+          f"Failures (>{MAX_GUESSES} guesses): {summary['failures']}")
+    for guesses, games in summary["distribution"].items():
+        print(f"  {guesses:>3} guesses: {games}")
+
+def print_multi_summary(summary, label):
+    print(f"{summary['boards']}-board evaluation ({label}) over {summary['games']} games:")
+    print(f"  Win rate: {summary['win_rate']:.1%} ({summary['wins']}/{summary['games']})  "
+          f"Mean guesses (wins): {summary['mean']:.4f}  "
+          f"Mean boards solved: {summary['mean_boards_solved']:.2f}")
+    print(f"  Throughput: {summary['games_per_sec']:,.1f} games/sec "
+          f"({summary['seconds']:.2f}s)")
+    for guesses, games in summary["distribution"].items():
+        print(f"  {guesses:>3} guesses: {games}")
+
+def print_cache_stats(stats, label="Filter cache"):
+    print(f"{label}: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.1%} hit rate), {stats['evictions']} evictions, "
+          f"{stats['size']}/{stats['maxsize']} entries")
+
+def report_filter_cache(args, filter_cache=None):
+    # Games run by the sharded runner use the cache of the worker they ran in,
+    # which is only visible here when that worker was this process
+    if not args.filter_cache:
+        return
+    if args.workers != 1:
+        print("Filter cache counters are kept per worker process; run with --workers 1 to see them.")
+        return
+    if args.seed is not None or args.boards > 1:
+        filter_cache = _worker.get("filter_cache")
+    if filter_cache is not None:
+        print_cache_stats(filter_cache.stats())
+
 def main():
     parser = argparse.ArgumentParser(description="Evaluate Wordle strategies.")
     parser.add_argument("--num-runs", type=int, default=100, help="Number of runs to average (default: 100)")
     parser.add_argument("--words", nargs="+", help="Specific first guesses to evaluate")
+    parser.add_argument("--strategy", choices=STRATEGY_NAMES, default="random",
+                        help="How the solver picks guesses after the first (default: random)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes to simulate games in (default: 1)")
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="Play every word in the list once as the solution instead of sampling")
+    parser.add_argument("--tree", action="store_true",
+                        help="With --exhaustive and the entropy strategy, walk its decision tree "
+                             "instead of simulating each game")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed; seeded runs give the same results for any --workers")
+    parser.add_argument("--filter-cache", type=int, default=0, metavar="SIZE",
+                        help="Remember up to SIZE filtered candidate sets by guess/score history "
+                             "and report the cache counters (default: 0, off)")
+    parser.add_argument("--hard", action="store_true",
+                        help="Play in hard mode: every guess must use all revealed hints")
+    parser.add_argument("--boards", type=int, default=1,
+                        help="Play Quordle-style games with this many boards at once; "
+                             "--num-runs is then the number of games (default: 1)")
+    parser.add_argument("--guesses", type=str, default=None, metavar="FILE",
+                        help="JSON list of allowed guesses; solutions still come from the word "
+                             "list (default: guess from the word list too)")
+    parser.add_argument("--book", type=str, default=None, metavar="FILE",
+                        help="Opening book (see wordle/book.py) whose early guesses are played "
+                             "before the strategy's")
+    parser.add_argument("--word-list", type=str, default=DEFAULT_WORD_LIST, metavar="FILE",
+                        help="JSON word list to play with; its words may have any one length "
+                             "(default: wordle/wordle-list.txt)")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
 
-    # Determine the path to wordle-list.txt relative to this script
-    word_list_path = os.path.join(os.path.dirname(__file__), "wordle-list.txt")
+    # Words come back in uppercase, from the compiled copy when it is current
     try:
-        with open(word_list_path, "r") as f:
-            # Normalize all words to uppercase to ensure consistent behavior
-            word_list = [w.upper() for w in json.load(f)]
+        word_list = load_word_list(args.word_list)
     except Exception as e:
-        print(f"Error loading word list from {word_list_path}: {e}")
+        print(f"Error loading word list from {args.word_list}: {e}")
+        return
+
+    guesses = None
+    if args.guesses:
+        try:
+            guesses = merge_guess_list(load_word_list(args.guesses), word_list)
+        except Exception as e:
+            print(f"Error loading guesses from {args.guesses}: {e}")
+            return
+
+    word_set = set(word_list if guesses is None else guesses)
+
+    if args.boards > 1:
+        if args.exhaustive or args.tree or args.book:
+            print("--exhaustive, --tree and --book only apply to single-board games.")
+            return
+        if args.boards > len(word_list):
+            print(f"--boards cannot exceed the {len(word_list)} words in the list.")
+            return
+        for word in args.words or [None]:
+            if word is None:
+                label = f"{args.strategy} strategy"
+            else:
+                word = word.upper()
+                if word not in word_set:
+                    print(f"Warning: '{word}' is not in the word list.")
+                label = f"starting with '{word}'"
+            summary = evaluate_multi_board(word_list, args.boards, args.num_runs, word,
+                                           args.strategy, args.workers, args.seed,
+                                           filter_cache_size=args.filter_cache,
+                                           hard_mode=args.hard, guesses=guesses)
+            print_multi_summary(summary, label)
+            report_filter_cache(args)
         return
 
-    word_set = set(word_list)
+    # Every guess/solution score comes from the cached table; games only look them up
+    feedback = _load_feedback(word_list, guesses)
+    index = CandidateIndex(word_list)
+    guess_index = CandidateIndex(guesses) if guesses is not None else None
+    strategy = make_strategy(args.strategy, feedback)
+    filter_cache = LRUCache(args.filter_cache) if args.filter_cache else None
 
-    if not args.words:
+    book = None
+    if args.book:
+        try:
+            book = OpeningBook.load(args.book)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading opening book from {args.book}: {e}")
+            return
+        if not book.matches(feedback):
+            print(f"The opening book {args.book} was built for a different word list.")
+            return
+
+    builder = None
+    if args.tree:
+        if args.strategy != "entropy":
+            print("--tree needs a deterministic strategy; use --strategy entropy.")
+            return
+        if args.hard:
+            print("--tree does not support --hard.")
+            return
+        if book is not None:
+            print("--tree does not use --book; the tree already covers every guess.")
+            return
+        builder = TreeBuilder(feedback, strategy)
+
+    def book_label(label, first_guess=None):
+        if book is None:
+            return label
+        if first_guess is not None and first_guess != book.opener:
+            print(f"Warning: the opening book starts with '{book.opener}', so it is not used "
+                  f"after '{first_guess}'.")
+            return label
+        if first_guess is None:
+            label = f"{args.strategy} strategy"
+        return f"{label}, {book.opener} opening book"
+
+    def evaluate_all(first_guess=None):
+        if builder is not None:
+            return evaluate_tree(builder, first_guess)
+        if args.workers > 1 or args.seed is not None:
+            guess_counts = simulate_games_parallel(word_list, word_list, first_guess,
+                                                   args.strategy, args.workers, args.seed,
+                                                   args.filter_cache, args.hard, guesses, book)
+            return summarize_results(guess_counts)
+        return evaluate_exhaustive(word_list, first_guess, feedback=feedback, index=index,
+                                   strategy=strategy, filter_cache=filter_cache,
+                                   hard_mode=args.hard, guess_index=guess_index, book=book)
+
+    def evaluate(first_guess=None):
+        # Seeded runs always go through the sharded runner so that they give
+        # the same results whatever the number of workers
+        if args.workers > 1 or args.seed is not None:
+            return evaluate_parallel(word_list, args.num_runs, first_guess, args.strategy,
+                                     args.workers, args.seed, args.filter_cache, args.hard,
+                                     guesses, book)
+        return evaluate_strategy(word_list, args.num_runs, first_guess, feedback=feedback,
+                                 index=index, strategy=strategy, filter_cache=filter_cache,
+                                 hard_mode=args.hard, guess_index=guess_index, book=book)
+
+    if args.exhaustive:
+        for word in args.words or [None]:
+            if word is None:
+                label = "random first guess" if args.strategy == "random" else f"{args.strategy} strategy"
+            else:
+                word = word.upper()
+                if word not in word_set:
+                    print(f"Warning: '{word}' is not in the word list.")
+                label = f"starting with '{word}'"
+            try:
+                summary = evaluate_all(first_guess=word)
+            except ValueError as e:
+                print(e)  # e.g. a --tree opener that is not in the guess list
+                continue
+            print_summary(summary, book_label(label, word))
+    elif not args.words:
         # Strategy 1: Baseline with random first guess for each run
-        avg = evaluate_strategy(word_list, args.num_runs)
-        print(f"Average number of guesses (random first guess) over {args.num_runs} runs: {avg:.2f}")
+        avg = evaluate()
+        label = "random first guess" if args.strategy == "random" else f"{args.strategy} strategy"
+        print(f"Average number of guesses ({book_label(label)}) over {args.num_runs} runs: {avg:.2f}")
     else:
         # Strategy 2: Evaluate each provided word as a first guess
         for word in args.words:
@@ -79,8 +541,11 @@ def main():
             if word_upper not in word_set:
                 print(f"Warning: '{word}' is not in the word list.")
 
-            avg = evaluate_strategy(word_list, args.num_runs, first_guess=word_upper)
-            print(f"Average number of guesses (starting with '{word_upper}') over {args.num_runs} runs: {avg:.2f}")
+            avg = evaluate(first_guess=word_upper)
+            label = book_label(f"starting with '{word_upper}'", word_upper)
+            print(f"Average number of guesses ({label}) over {args.num_runs} runs: {avg:.2f}")
+
+    report_filter_cache(args, filter_cache)
 
 if __name__ == "__main__":
     main()
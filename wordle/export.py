@@ -0,0 +1,141 @@
+"""
+Exports the solver as a static artifact for the web page in docs/.
+
+The page only has to replay the entropy strategy's decision tree (see
+wordle/tree.py), so instead of the word list and a JavaScript copy of the
+scorer it loads one small binary file holding the packed word table and the
+tree.  Every score shown in the browser is then one the Python scorer
+produced at build time.
+
+Format (little-endian):
+
+  magic       8 bytes   b"WRDLWEB\\0"
+  version     uint16    WEB_FORMAT_VERSION
+  length      uint16    letters per word
+  words       uint32    number of words
+  nodes       uint32    number of tree nodes; node 0 is the root
+  word table  words x length bytes of uppercase ASCII
+  guess       nodes x uint16   word id of the node's guess
+  candidates  nodes x uint16   solutions still possible at the node
+  parent      nodes x uint32   parent node (0xFFFFFFFF for the root)
+  code        nodes x uint8    pattern code the parent's guess received
+  solves      nodes x uint8    1 if the node's guess is one of its candidates
+
+Each solution is solved by exactly one node, so the page finds the game for
+a solution by walking from that node up to the root.
+
+Usage:
+  python wordle/export.py --opener CRANE --output docs/solver.bin
+"""
+
+import argparse
+import os
+import struct
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.feedback import load_feedback_matrix
+    from wordle.strategies import EntropyStrategy
+    from wordle.tree import DecisionTree, TreeBuilder
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+except ImportError:
+    from feedback import load_feedback_matrix
+    from strategies import EntropyStrategy
+    from tree import DecisionTree, TreeBuilder
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+
+WEB_MAGIC = b"WRDLWEB\0"
+WEB_FORMAT_VERSION = 1
+NO_PARENT = 0xFFFFFFFF
+_HEADER = struct.Struct("<8sHHII")
+
+
+def export_web_artifact(tree: DecisionTree, words: list[str]) -> bytes:
+    """Packs the word table and the tree into the format described above."""
+    words = [w.upper() for w in words]
+    if len(words) > 0xFFFF:
+        raise ValueError("The web artifact holds at most 65535 words.")
+    word_ids = {w: i for i, w in enumerate(words)}
+    length = len(words[0]) if words else 0
+    if length > 5:
+        raise ValueError("The web artifact stores pattern codes as bytes, so words of at most 5 letters.")
+
+    # Breadth-first, so parents always come before their children
+    nodes, parents, codes = [tree.root], [NO_PARENT], [0]
+    for n, node in enumerate(nodes):
+        for code in sorted(node.children):
+            nodes.append(node.children[code])
+            parents.append(n)
+            codes.append(code)
+
+    candidates = np.array([int(node.solves) for node in nodes], dtype=np.int64)
+    for n in range(len(nodes) - 1, 0, -1):
+        candidates[parents[n]] += candidates[n]
+
+    return b"".join([
+        _HEADER.pack(WEB_MAGIC, WEB_FORMAT_VERSION, length, len(words), len(nodes)),
+        "".join(words).encode("ascii"),
+        np.array([word_ids[node.guess] for node in nodes], dtype="<u2").tobytes(),
+        candidates.astype("<u2").tobytes(),
+        np.array(parents, dtype="<u4").tobytes(),
+        np.array(codes, dtype=np.uint8).tobytes(),
+        np.array([node.solves for node in nodes], dtype=np.uint8).tobytes(),
+    ])
+
+
+def read_web_artifact(data: bytes) -> dict:
+    """Unpacks an artifact into its word list and node arrays (for checking builds)."""
+    magic, version, length, num_words, num_nodes = _HEADER.unpack_from(data)
+    if magic != WEB_MAGIC or version != WEB_FORMAT_VERSION:
+        raise ValueError("Not a web solver artifact of a supported version.")
+    offset = _HEADER.size
+    table = data[offset:offset + num_words * length].decode("ascii")
+    offset += num_words * length
+    arrays = {}
+    for name, dtype in [("guess", "<u2"), ("candidates", "<u2"), ("parent", "<u4"),
+                        ("code", np.uint8), ("solves", np.uint8)]:
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=num_nodes, offset=offset)
+        offset += arrays[name].nbytes
+    if offset != len(data):
+        raise ValueError("The web solver artifact has the wrong size.")
+    arrays["words"] = [table[i:i + length] for i in range(0, len(table), length)]
+    return arrays
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the entropy strategy's decision tree for the web solver in docs/."
+    )
+    parser.add_argument("--opener", type=str, default="CRANE",
+                        help="First guess of every game (default: CRANE)")
+    parser.add_argument("--output", type=str,
+                        default=os.path.normpath(os.path.join(
+                            os.path.dirname(os.path.abspath(__file__)), "..", "docs", "solver.bin")),
+                        help="Where to write the artifact (default: docs/solver.bin)")
+    args = parser.parse_args()
+
+    try:
+        word_list = load_word_list()
+    except Exception as e:
+        print(f"Error loading word list from {DEFAULT_WORD_LIST}: {e}")
+        return
+
+    feedback = load_feedback_matrix(word_list)
+    try:
+        tree = TreeBuilder(feedback, EntropyStrategy(feedback)).build(args.opener)
+    except ValueError as e:
+        print(e)
+        return
+    data = export_web_artifact(tree, word_list)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"Wrote {len(word_list)} words and {tree.num_nodes()} nodes "
+          f"({len(data):,} bytes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""
+Precomputed Wordle feedback for every guess/solution pair of a word list.
+
+A score string such as "20011" is encoded as a base-3 integer, reading the
+first letter as the most significant digit:
+
+  "00000" -> 0
+  "20011" -> 2*81 + 0*27 + 0*9 + 1*3 + 1 = 166
+  "22222" -> 242
+
+Every code of a 5-letter word fits in a byte, so the feedback for a whole
+word list is a single uint8 array and scoring a guess becomes a table lookup
+instead of a call to `scoreGuess`.  Other word lengths use the same encoding
+with 3**length codes, stored as uint8 up to 5 letters and as uint16 up to
+MAX_WORD_LENGTH; the length is taken from the word lists.
+
+Building the table for the full list takes a noticeable fraction of a second,
+so `load_feedback_matrix` keeps a copy on disk, keyed by a hash of the word
+lists, and memory-maps it on later runs.  Every process that opens the cache
+shares the same read-only pages instead of holding its own copy.
+
+Every edit of a list leaves the files of its old version behind, so
+`prune_cache` keeps only the most recently used few files of each kind.
+"""
+
+import functools
+import hashlib
+import os
+import re
+import tempfile
+
+import numpy as np
+
+try:
+    from wordle.profiling import profiled
+except ImportError:
+    from profiling import profiled
+
+# The classic game; the defaults wherever no word list says otherwise
+WORD_LENGTH = 5
+NUM_PATTERNS = 3 ** WORD_LENGTH
+SOLVED_PATTERN = NUM_PATTERNS - 1
+# Longest words whose pattern codes (3**10 = 59049) still fit in a uint16
+MAX_WORD_LENGTH = 10
+
+# Rows of the guess list scored per vectorized step when building a matrix.
+DEFAULT_CHUNK_SIZE = 256
+# Rows histogrammed per np.bincount call; small blocks stay in cache.
+HISTOGRAM_CHUNK_SIZE = 64
+# Below this many columns, sorting each row beats a 243-bucket histogram
+# (scaled with the number of buckets for other word lengths).
+SORTED_ENTROPY_MAX_COLUMNS = 48
+
+# Bump whenever the pattern encoding changes so older cache files are ignored.
+CACHE_FORMAT_VERSION = 1
+# Where caches go unless WORDLE_CACHE_DIR says otherwise (see cache_directory)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# Files of each kind (feedback-, totals-, words-) that prune_cache keeps.
+DEFAULT_CACHE_ENTRIES = 8
+# Names of the cache files: <kind>-<16 hex digits of a key>.<npy or bin>
+_CACHE_FILE = re.compile(r"([a-z]+)-[0-9a-f]{16}\.(npy|bin)")
+
+
+def pattern_dtype(length: int) -> type:
+    """The smallest unsigned integer type holding every code of `length`-letter words."""
+    if not 1 <= length <= MAX_WORD_LENGTH:
+        raise ValueError(f"Words must have between 1 and {MAX_WORD_LENGTH} letters.")
+    return np.uint8 if 3 ** length <= 256 else np.uint16
+
+
+def encode_score(score: str, length: int = WORD_LENGTH) -> int:
+    """Return the base-3 pattern code of a score string like "20011"."""
+    if len(score) != length or not all(c in '012' for c in score):
+        raise ValueError(f"Score must be {length} characters of '0', '1', or '2'.")
+    return int(score, 3)
+
+
+def decode_score(code: int, length: int = WORD_LENGTH) -> str:
+    """Return the score string for a pattern code (the inverse of encode_score)."""
+    if not 0 <= code < 3 ** length:
+        raise ValueError(f"Pattern code must be between 0 and {3 ** length - 1}.")
+    digits = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        digits.append(str(digit))
+    return "".join(reversed(digits))
+
+
+@functools.lru_cache(maxsize=None)
+def score_strings(length: int = WORD_LENGTH) -> list[str]:
+    """Score string of every pattern code of `length`-letter words, so decoding is a list lookup."""
+    return [decode_score(code, length) for code in range(3 ** length)]
+
+
+@functools.lru_cache(maxsize=None)
+def pattern_totals(num_patterns: int = NUM_PATTERNS) -> np.ndarray:
+    """
+    Sum of the score digits (2 per green, 1 per yellow) of the codes below
+    `num_patterns`.  Leading zero digits add nothing, so the sums do not
+    depend on the word length.
+    """
+    codes = np.arange(num_patterns)
+    totals = np.zeros(num_patterns, dtype=np.int64)
+    while codes.any():
+        codes, digits = np.divmod(codes, 3)
+        totals += digits
+    totals.flags.writeable = False
+    return totals
+
+
+SCORE_STRINGS = score_strings(WORD_LENGTH)
+PATTERN_TOTALS = pattern_totals(NUM_PATTERNS)
+
+
+def encode_words(words: list[str], length: int = None) -> np.ndarray:
+    """
+    Returns an (n, length) uint8 array of letter indices (A=0 ... Z=25) for
+    the words.  The length defaults to that of the first word.
+    """
+    if length is None:
+        length = len(words[0]) if words else WORD_LENGTH
+    joined = "".join(words).upper()
+    if (not all(len(w) == length for w in words)
+            or not joined.isascii() or not (joined.isalpha() or not joined)):
+        bad = next(w for w in words
+                   if len(w) != length or not w.isascii() or not w.isalpha())
+        raise ValueError(f"'{bad}' is not a {length}-letter alphabetic word.")
+    letters = np.frombuffer(joined.encode("ascii"), dtype=np.uint8) - ord('A')
+    return letters.reshape(len(words), length)
+
+
+def compute_patterns(guess_letters: np.ndarray, solution_letters: np.ndarray) -> np.ndarray:
+    """
+    Scores every guess against every solution at once.
+
+    Takes the encoded letters of g guesses and s solutions (see `encode_words`)
+    and returns a (g, s) array of pattern codes, of `pattern_dtype` for their
+    length, following exactly the two-pass green/yellow rules of `scoreGuess`.
+    """
+    length = guess_letters.shape[1]
+    # Value of each score digit, most significant first: [81, 27, 9, 3, 1] for 5 letters.
+    place_values = 3 ** np.arange(length - 1, -1, -1)
+    green = guess_letters[:, None, :] == solution_letters[None, :, :]
+
+    # Occurrences of each letter in each solution, shape (s, 26).
+    solution_counts = np.zeros((len(solution_letters), 26), dtype=np.int8)
+    for i in range(length):
+        np.add.at(solution_counts, (np.arange(len(solution_letters)), solution_letters[:, i]), 1)
+
+    # Pass 1: Greens
+    codes = (green * (2 * place_values)).sum(axis=2)
+
+    # Pass 2: Yellows. A guess letter is yellow while the solution still has
+    # copies of it left over after the greens and after earlier yellows of
+    # the same letter have claimed theirs.
+    yellows = []
+    for i in range(length):
+        same_letter = guess_letters == guess_letters[:, i][:, None]
+        remaining = solution_counts[:, guess_letters[:, i]].T
+        for k in range(length):
+            remaining = remaining - (green[:, :, k] & same_letter[:, k][:, None])
+        for k in range(i):
+            remaining = remaining - (yellows[k] & same_letter[:, k][:, None])
+        yellow = ~green[:, :, i] & (remaining > 0)
+        yellows.append(yellow)
+        codes += yellow * place_values[i]
+
+    return codes.astype(pattern_dtype(length))
+
+
+def pattern_histograms(patterns: np.ndarray, chunk_size: int = HISTOGRAM_CHUNK_SIZE,
+                       num_patterns: int = NUM_PATTERNS) -> np.ndarray:
+    """
+    Counts how often each pattern code occurs in every row of `patterns`.
+
+    Returns a (rows, num_patterns) array (243 columns for 5-letter words);
+    row i is the bucket sizes that guess i splits the columns (candidate
+    solutions) into.
+    """
+    rows = patterns.shape[0]
+    counts = np.empty((rows, num_patterns), dtype=np.int64)
+    for start in range(0, rows, chunk_size):
+        block = patterns[start:start + chunk_size]
+        offsets = block + (np.arange(len(block)) * num_patterns)[:, None]
+        counts[start:start + len(block)] = np.bincount(
+            offsets.ravel(), minlength=len(block) * num_patterns
+        ).reshape(len(block), num_patterns)
+    return counts
+
+
+def entropies(histograms: np.ndarray) -> np.ndarray:
+    """Returns the Shannon entropy, in bits, of each row of pattern bucket sizes."""
+    totals = histograms.sum(axis=1)
+    # n*log2(n) for every bucket size that can occur, looked up instead of
+    # taking a logarithm per bucket
+    sizes = np.arange(int(totals.max(initial=0)) + 1, dtype=np.float64)
+    sizes[1:] *= np.log2(sizes[1:])
+    weighted = sizes[histograms].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(totals > 0, np.log2(totals) - weighted / totals, 0.0)
+
+
+def sorted_entropies(patterns: np.ndarray) -> np.ndarray:
+    """
+    Same result as `entropies(pattern_histograms(patterns))`, computed from the
+    runs of equal codes in each sorted row instead of full histograms.  The
+    cost grows with the number of columns rather than with the 243 possible
+    codes, which makes it much cheaper for a handful of candidates.
+    """
+    rows, n = patterns.shape
+    if n == 0:
+        return np.zeros(rows, dtype=np.float64)
+    ordered = np.sort(patterns, axis=1)
+    starts = np.ones((rows, n), dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+
+    # Every row begins a run, so runs never span two rows
+    run_starts = np.flatnonzero(starts.ravel())
+    run_lengths = np.diff(np.append(run_starts, rows * n))
+    first_runs = np.concatenate([[0], np.cumsum(starts.sum(axis=1))[:-1]])
+
+    sizes = np.arange(n + 1, dtype=np.float64)
+    sizes[1:] *= np.log2(sizes[1:])
+    weighted = np.add.reduceat(sizes[run_lengths], first_runs)
+    return np.log2(n) - weighted / n
+
+
+def pattern_entropies(patterns: np.ndarray, num_patterns: int = NUM_PATTERNS) -> np.ndarray:
+    """
+    Returns the entropy, in bits, of the pattern codes in every row, choosing
+    the faster method for the number of columns.
+    """
+    if patterns.shape[1] <= SORTED_ENTROPY_MAX_COLUMNS * num_patterns // NUM_PATTERNS:
+        return sorted_entropies(patterns)
+    return entropies(pattern_histograms(patterns, num_patterns=num_patterns))
+
+
+class FeedbackMatrix:
+    """
+    Pattern codes for every (guess, solution) pair of two word lists.
+
+    `patterns[i, j]` is the code of scoring `guesses[i]` against `solutions[j]`.
+    When `solutions` is omitted the guess list doubles as the solution list.
+    A precomputed `patterns` array (e.g. a memory-mapped cache) may be passed
+    to skip the build.
+
+    All words must have the same length, which sets `num_patterns` (3**length),
+    `solved_pattern` and the dtype of the codes (see `pattern_dtype`).
+    """
+
+    def __init__(self, guesses: list[str], solutions: list[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, patterns: np.ndarray = None):
+        self.guesses = [w.upper() for w in guesses]
+        self.solutions = self.guesses if solutions is None else [w.upper() for w in solutions]
+        self.guess_index = {w: i for i, w in enumerate(self.guesses)}
+        self.solution_index = {w: i for i, w in enumerate(self.solutions)}
+        self.length = len(self.guesses[0]) if self.guesses else WORD_LENGTH
+        self.num_patterns = 3 ** self.length
+        self.solved_pattern = self.num_patterns - 1
+        dtype = pattern_dtype(self.length)
+
+        if patterns is not None:
+            if patterns.shape != (len(self.guesses), len(self.solutions)):
+                raise ValueError("Pattern table does not match the word lists.")
+            if patterns.dtype != dtype:
+                raise ValueError(f"Pattern table should hold {np.dtype(dtype).name} codes.")
+            self.patterns = patterns
+            return
+
+        guess_letters = encode_words(self.guesses)
+        solution_letters = (guess_letters if solutions is None
+                            else encode_words(self.solutions, self.length))
+
+        self.patterns = np.empty((len(self.guesses), len(self.solutions)), dtype=dtype)
+        for start in range(0, len(self.guesses), chunk_size):
+            stop = start + chunk_size
+            self.patterns[start:stop] = compute_patterns(guess_letters[start:stop], solution_letters)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.patterns.shape
+
+    def row(self, guess: str) -> np.ndarray:
+        """Returns the pattern codes of `guess` against every solution."""
+        return self.patterns[self.guess_index[guess.upper()]]
+
+    def guess_rows(self, words: list[str]) -> np.ndarray:
+        """Returns the row index of each word in the guess list."""
+        return np.array([self.guess_index[w.upper()] for w in words], dtype=np.intp)
+
+    def solution_columns(self, words: list[str]) -> np.ndarray:
+        """Returns the column index of each word in the solution list."""
+        return np.array([self.solution_index[w.upper()] for w in words], dtype=np.intp)
+
+    def pattern(self, guess: str, solution: str) -> int:
+        """
+        Returns the pattern code for a guess against a solution.
+
+        Pairs outside the matrix are scored directly, so any valid words of
+        the matrix's length may be passed.
+        """
+        i = self.guess_index.get(guess.upper())
+        j = self.solution_index.get(solution.upper())
+        if i is not None and j is not None:
+            return int(self.patterns[i, j])
+        return int(compute_patterns(encode_words([guess], self.length),
+                                    encode_words([solution], self.length))[0, 0])
+
+    def score(self, guess: str, solution: str) -> str:
+        """Returns the same score string as `scoreGuess(guess, solution)`."""
+        return decode_score(self.pattern(guess, solution), self.length)
+
+    def updated(self, guesses: list[str], solutions: list[str] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> "FeedbackMatrix":
+        """
+        Returns the matrix for edited word lists, in any order, reusing the
+        codes of every pair already in this matrix.  Only pairs involving
+        words new to the lists are scored, so adding or removing d words
+        costs O(n*d) scoring instead of the O(n**2) of a full build (the
+        kept codes are still copied).
+        """
+        guesses = [w.upper() for w in guesses]
+        new_solutions = guesses if solutions is None else [w.upper() for w in solutions]
+        guess_letters = encode_words(guesses, self.length)
+        solution_letters = (guess_letters if solutions is None
+                            else encode_words(new_solutions, self.length))
+
+        old_rows = np.array([self.guess_index.get(w, -1) for w in guesses], dtype=np.intp)
+        old_columns = np.array([self.solution_index.get(w, -1) for w in new_solutions],
+                               dtype=np.intp)
+        kept_rows, kept_columns = np.flatnonzero(old_rows >= 0), np.flatnonzero(old_columns >= 0)
+        new_rows, new_columns = np.flatnonzero(old_rows < 0), np.flatnonzero(old_columns < 0)
+
+        patterns = np.empty((len(guesses), len(new_solutions)), dtype=self.patterns.dtype)
+        patterns[np.ix_(kept_rows, kept_columns)] = \
+            self.patterns[np.ix_(old_rows[kept_rows], old_columns[kept_columns])]
+        for start in range(0, len(new_rows), chunk_size):
+            rows = new_rows[start:start + chunk_size]
+            patterns[rows] = compute_patterns(guess_letters[rows], solution_letters)
+        if len(new_columns):
+            for start in range(0, len(kept_rows), chunk_size):
+                rows = kept_rows[start:start + chunk_size]
+                patterns[np.ix_(rows, new_columns)] = compute_patterns(
+                    guess_letters[rows], solution_letters[new_columns])
+        return FeedbackMatrix(guesses, solutions, patterns=patterns)
+
+
+def cache_key(guesses: list[str], solutions: list[str] = None) -> str:
+    """Returns a hex digest identifying the feedback table of the given word lists."""
+    digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}\n".encode())
+    digest.update("\n".join(w.upper() for w in guesses).encode())
+    if solutions is not None:
+        digest.update(b"\n--\n")
+        digest.update("\n".join(w.upper() for w in solutions).encode())
+    return digest.hexdigest()
+
+
+def cache_directory() -> str:
+    """
+    The directory of the on-disk caches: $WORDLE_CACHE_DIR, or
+    DEFAULT_CACHE_DIR.  It is looked up on every use, so setting the
+    variable takes effect even after this module has been imported.
+    """
+    return os.environ.get("WORDLE_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def feedback_cache_path(guesses: list[str], solutions: list[str] = None,
+                        cache_dir: str = None) -> str:
+    """The cache file holding the feedback table of the given word lists."""
+    key = cache_key(guesses, solutions)
+    return os.path.join(cache_dir or cache_directory(), f"feedback-{key[:16]}.npy")
+
+
+def save_feedback_matrix(matrix: FeedbackMatrix, cache_dir: str = None) -> str:
+    """
+    Writes the matrix to its cache file, replacing it atomically, and returns
+    the path.  Raises OSError if the cache directory is not writable.
+    """
+    cache_dir = cache_dir or cache_directory()
+    solutions = None if matrix.solutions is matrix.guesses else matrix.solutions
+    path = feedback_cache_path(matrix.guesses, solutions, cache_dir)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            np.save(f, matrix.patterns)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def mark_cache_used(path: str):
+    """Refreshes a cache file's modification time, which `prune_cache` orders by."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # Read-only cache directory; it is never pruned either
+
+
+def prune_cache(cache_dir: str = None, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                keep=()) -> list[str]:
+    """
+    Removes all but the `max_entries` most recently used cache files of each
+    kind, never removing the paths in `keep`, and returns the removed paths.
+    Other files in the directory are left alone.  A process still reading a
+    removed file keeps its open copy; the next one to need it rebuilds it.
+    """
+    cache_dir = cache_dir or cache_directory()
+    keep = {os.path.abspath(p) for p in keep}
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return []
+    by_kind = {}
+    for name in names:
+        match = _CACHE_FILE.fullmatch(name)
+        if match is None:
+            continue
+        path = os.path.abspath(os.path.join(cache_dir, name))
+        try:
+            by_kind.setdefault(match.group(1), []).append((os.stat(path).st_mtime_ns, path))
+        except OSError:
+            pass  # Removed by another process meanwhile
+
+    removed = []
+    for files in by_kind.values():
+        files.sort(reverse=True)
+        retained = sum(1 for _, path in files if path in keep)
+        for _, path in files:
+            if path in keep:
+                continue
+            if retained < max_entries:
+                retained += 1
+                continue
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError:
+                pass
+    return removed
+
+
+@profiled()
+def load_feedback_matrix(guesses: list[str], solutions: list[str] = None,
+                         cache_dir: str = None) -> FeedbackMatrix:
+    """
+    Returns the FeedbackMatrix for the word lists, using the on-disk cache.
+
+    The cache file is named after `cache_key`, so editing the word list makes
+    the old file stale and a fresh table is built and written atomically.
+    Unreadable or mismatched files are rebuilt the same way.  Existing caches
+    are opened read-only with memory mapping.  If the cache directory is not
+    writable the matrix is simply built in memory.  Writing a new file prunes
+    the cache (see `prune_cache`).
+    """
+    path = feedback_cache_path(guesses, solutions, cache_dir)
+
+    if os.path.exists(path):
+        try:
+            patterns = np.load(path, mmap_mode="r")
+            matrix = FeedbackMatrix(guesses, solutions, patterns=patterns)
+            mark_cache_used(path)
+            return matrix
+        except (OSError, ValueError):
+            pass  # Truncated or mismatched file; rebuild it below
+
+    matrix = FeedbackMatrix(guesses, solutions)
+    try:
+        save_feedback_matrix(matrix, cache_dir)
+    except OSError:
+        return matrix
+    prune_cache(cache_dir, keep=[path])
+
+    return FeedbackMatrix(guesses, solutions, patterns=np.load(path, mmap_mode="r"))
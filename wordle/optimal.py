@@ -0,0 +1,435 @@
+"""
+Exact search for the strategy with the fewest total guesses.
+
+The cost of a candidate set S is the total number of guesses needed to solve
+every word in S when playing optimally.  Every solution spends the next guess
+g, and the pattern g receives splits the rest into buckets, so
+
+  cost(S) = min over g of  |S| + sum of cost(bucket) over the non-solving buckets
+
+with cost({w}) = 1.  The mean guesses of the optimal strategy is
+cost(all solutions) / number of solutions.
+
+The minimum is found by a depth-first branch and bound:
+
+* Lower bounds.  A set of n > 1 words costs at least 2n - 1 (one word solved
+  by the next guess, every other word by the one after).  Applied to the
+  buckets of a guess this gives the bucket-count bound
+  3n - 2*solved - buckets, computed for every guess at once from its sorted
+  pattern row, so guesses that cannot beat the best found so far are skipped
+  without splitting.
+* Move ordering.  Guesses are tried by increasing bound, ties broken by
+  entropy, so a good guess is found early and the rest are cut off.
+* Memoization.  Every candidate set searched is remembered by
+  `tree.candidate_set_key`: its exact cost and best guess once known, or
+  the lower bound a cut-off search proved.
+* Incumbent.  The root starts from the cost of the entropy strategy's tree,
+  which the optimum can only improve on.
+
+The whole list is far beyond a single run of minutes, so the search takes a
+node or time budget, reports progress periodically and saves the memo to a
+checkpoint file.  Every memo entry is a proven fact about its set, so a run
+resumed from a checkpoint skips all work finished before.
+
+Usage:
+  python wordle/optimal.py --opener SALET --checkpoint salet.ckpt.npz --hours 12
+  python wordle/optimal.py --solutions small-list.json --output optimal-tree.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.feedback import (
+        FeedbackMatrix, cache_key, load_feedback_matrix, pattern_entropies,
+    )
+    from wordle.strategies import EntropyStrategy
+    from wordle.tree import DecisionTree, Node, TreeBuilder, candidate_set_key
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+    from wordle.words import merge_guess_list
+except ImportError:
+    from feedback import (
+        FeedbackMatrix, cache_key, load_feedback_matrix, pattern_entropies,
+    )
+    from strategies import EntropyStrategy
+    from tree import DecisionTree, Node, TreeBuilder, candidate_set_key
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+    from words import merge_guess_list
+
+CHECKPOINT_FORMAT_VERSION = 1
+# Seconds between progress reports and between checkpoint saves
+DEFAULT_PROGRESS_INTERVAL = 10.0
+DEFAULT_CHECKPOINT_INTERVAL = 300.0
+
+
+class BudgetExhausted(Exception):
+    """Raised inside the search once its node or time budget is used up."""
+
+
+def set_lower_bound(size: int) -> int:
+    """Fewest total guesses any strategy can need for `size` candidates."""
+    return 1 if size == 1 else 2 * size - 1
+
+
+class OptimalSolver:
+    """
+    Branch-and-bound search over a FeedbackMatrix whose solutions are all
+    allowed guesses.
+
+    `max_nodes` and `max_seconds` bound each call to `solve`; `progress` is
+    called with `stats()` every `progress_interval` seconds.  With a
+    `checkpoint` path the memo is loaded from it (if it exists) and saved to
+    it every `checkpoint_interval` seconds and when a search ends.
+    """
+
+    def __init__(self, feedback: FeedbackMatrix, max_nodes: int = None, max_seconds: float = None,
+                 progress=None, progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+                 checkpoint: str = None, checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        missing = [w for w in feedback.solutions if w not in feedback.guess_index]
+        if missing:
+            raise ValueError(f"'{missing[0]}' is a solution but not an allowed guess.")
+        self.feedback = feedback
+        self.key = cache_key(feedback.guesses, feedback.solutions)
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        # Guess row of every solution column, for sets small enough to solve directly
+        self._solution_rows = feedback.guess_rows(feedback.solutions)
+        # candidate_set_key -> (cost or lower bound, exact, guess row or -1)
+        self._memo = {}
+        self.nodes = 0
+        self.best_total = None
+        self.best_guess = None
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load_checkpoint(checkpoint)
+
+    def solve(self, opener: str = None, solutions: list[str] = None) -> dict:
+        """
+        Searches for the optimal strategy for all solutions of the matrix (or
+        the given subset), starting with `opener` if one is given.
+
+        Returns a dict with the best total found, its mean per solution, the
+        best first guess, and `complete`: whether the total is proven optimal
+        or the budget ran out first (the total is then the best strategy known
+        and `lower_bound` what the optimum was proven to be at least).
+        """
+        if opener is not None and opener.upper() not in self.feedback.guess_index:
+            raise ValueError(f"'{opener}' is not in the guess list.")
+        if solutions is None:
+            columns = np.arange(len(self.feedback.solutions), dtype=np.intp)
+        else:
+            unknown = [w for w in solutions if w.upper() not in self.feedback.solution_index]
+            if unknown:
+                raise ValueError(f"Solutions must also be guesses; not in the guess list: "
+                                 f"{', '.join(w.upper() for w in unknown[:5])}"
+                                 f"{' ...' if len(unknown) > 5 else ''}.")
+            columns = np.unique(self.feedback.solution_columns(solutions))
+
+        greedy = TreeBuilder(self.feedback, EntropyStrategy(self.feedback)).build(
+            opener, [self.feedback.solutions[c] for c in columns])
+        self.best_total = sum(greedy.guess_counts().values())
+        self.best_guess = greedy.root.guess
+        self.nodes = 0
+        self._started = self._last_progress = self._last_checkpoint = time.monotonic()
+
+        complete = True
+        lower = set_lower_bound(len(columns))
+        try:
+            if opener is None:
+                total = self._search(columns, self.best_total + 1, depth=0)
+                # The memo holds the guess the tree is read back with, which
+                # may differ from an equally good greedy opener
+                row = (self._solution_rows[columns[0]] if len(columns) <= 2
+                       else self._memo[candidate_set_key(columns)][2])
+                self.best_total, self.best_guess = total, self.feedback.guesses[row]
+            else:
+                row = self.feedback.guess_index[opener.upper()]
+                total = self._try_guess(columns, row, self.best_total + 1, depth=0)
+                if total <= self.best_total:
+                    self.best_total, self.best_guess = total, opener.upper()
+            lower = min(total, self.best_total)
+        except BudgetExhausted:
+            complete = False
+            if opener is None:
+                lower = self._known_lower_bound(columns)
+            else:
+                row = self.feedback.guess_index[opener.upper()]
+                lower = len(columns) + sum(self._known_lower_bound(bucket)
+                                           for bucket in self._buckets(columns, row))
+        finally:
+            if self.checkpoint is not None:
+                self.save_checkpoint(self.checkpoint)
+
+        return {
+            "complete": complete,
+            "guess": self.best_guess,
+            "total": self.best_total,
+            "mean": self.best_total / len(columns),
+            "lower_bound": lower,
+            "solutions": len(columns),
+            "nodes": self.nodes,
+            "seconds": time.monotonic() - self._started,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "nodes": self.nodes,
+            "memo": len(self._memo),
+            "best_total": self.best_total,
+            "best_guess": self.best_guess,
+            "seconds": time.monotonic() - self._started,
+        }
+
+    def tree(self, opener: str = None, solutions: list[str] = None) -> DecisionTree:
+        """
+        The optimal decision tree, read back from the memo after a complete
+        `solve` with the same arguments.
+        """
+        if solutions is None:
+            columns = np.arange(len(self.feedback.solutions), dtype=np.intp)
+        else:
+            columns = np.unique(self.feedback.solution_columns(solutions))
+        row = None if opener is None else self.feedback.guess_index[opener.upper()]
+        return DecisionTree(self._node(columns, row))
+
+    def _node(self, columns: np.ndarray, row) -> Node:
+        if row is None:
+            if len(columns) <= 2:
+                row = self._solution_rows[columns[0]]
+            else:
+                entry = self._memo.get(candidate_set_key(columns))
+                if entry is None or not entry[1]:
+                    raise ValueError("The search has not solved this position; run solve() first.")
+                row = entry[2]
+        codes = self.feedback.patterns[row, columns]
+        solved = self.feedback.solved_pattern
+        node = Node(self.feedback.guesses[row], bool((codes == solved).any()), {})
+        for code in np.unique(codes):
+            if code != solved:
+                node.children[int(code)] = self._node(columns[codes == code], None)
+        return node
+
+    def _search(self, columns: np.ndarray, beta: int, depth: int) -> int:
+        """
+        Returns cost(columns) if it is below `beta`, otherwise some lower bound
+        of it that is at least `beta`.
+        """
+        n = len(columns)
+        if n <= 2:
+            return set_lower_bound(n)
+        key = candidate_set_key(columns)
+        entry = self._memo.get(key)
+        if entry is not None and (entry[1] or entry[0] >= beta):
+            return entry[0]
+        lower = set_lower_bound(n) if entry is None else entry[0]
+        if lower >= beta:
+            return lower
+        self._tick()
+
+        block = self.feedback.patterns[:, columns]
+        ordered = np.sort(block, axis=1)
+        buckets = 1 + np.count_nonzero(ordered[:, 1:] != ordered[:, :-1], axis=1)
+        solved = ordered[:, -1] == self.feedback.solved_pattern
+        bounds = 3 * n - 2 * solved - (buckets - solved)
+        # A guess that neither solves nor splits anything makes no progress
+        useful = np.flatnonzero((buckets > 1) | solved)
+        entropies = pattern_entropies(block[useful], self.feedback.num_patterns)
+        order = useful[np.lexsort((-entropies, bounds[useful]))]
+
+        best, best_row = beta, -1
+        for row in order:
+            if bounds[row] >= best:
+                break  # Sorted by bound, so no later guess can do better
+            total = self._try_guess(columns, row, best, depth, codes=block[row])
+            if total < best:
+                best, best_row = total, int(row)
+                if depth == 0 and best < self.best_total:
+                    self.best_total, self.best_guess = best, self.feedback.guesses[best_row]
+
+        if best_row >= 0:
+            self._memo[key] = (best, True, best_row)
+            return best
+        # Every guess costs at least beta
+        self._memo[key] = (max(beta, lower), False, -1)
+        return max(beta, lower)
+
+    def _known_lower_bound(self, columns: np.ndarray) -> int:
+        """The best lower bound of cost(columns) proven so far."""
+        if len(columns) <= 2:
+            return set_lower_bound(len(columns))
+        entry = self._memo.get(candidate_set_key(columns))
+        return set_lower_bound(len(columns)) if entry is None else entry[0]
+
+    def _buckets(self, columns: np.ndarray, row: int, codes: np.ndarray = None) -> list:
+        """The sorted columns of each non-solving bucket guess `row` splits `columns` into."""
+        if codes is None:
+            codes = self.feedback.patterns[row, columns]
+        ordering = np.argsort(codes, kind="stable")
+        ordered = codes[ordering]
+        starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+        return [
+            columns[ordering[start:stop]]
+            for start, stop in zip(starts, np.append(starts[1:], len(codes)))
+            if ordered[start] != self.feedback.solved_pattern
+        ]
+
+    def _try_guess(self, columns: np.ndarray, row: int, beta: int, depth: int,
+                   codes: np.ndarray = None) -> int:
+        """
+        Returns the total cost of guessing `row` next if it is below `beta`,
+        otherwise a lower bound of it that is at least `beta`.
+        """
+        bucket_columns = self._buckets(columns, row, codes)
+        if len(bucket_columns) == 1 and len(bucket_columns[0]) == len(columns):
+            return max(beta, set_lower_bound(len(columns)) + len(columns))
+        # Largest buckets first: they decide most often that the guess is cut off
+        bucket_columns.sort(key=len, reverse=True)
+
+        remaining = sum(set_lower_bound(len(b)) for b in bucket_columns)
+        total = len(columns)
+        for bucket in bucket_columns:
+            remaining -= set_lower_bound(len(bucket))
+            total += self._search(bucket, beta - total - remaining, depth + 1)
+            if total + remaining >= beta:
+                return total + remaining
+        return total
+
+    def _tick(self):
+        self.nodes += 1
+        now = time.monotonic()
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExhausted()
+        if self.max_seconds is not None and now - self._started > self.max_seconds:
+            raise BudgetExhausted()
+        if self.progress is not None and now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.progress(self.stats())
+        if self.checkpoint is not None and now - self._last_checkpoint >= self.checkpoint_interval:
+            self._last_checkpoint = now
+            self.save_checkpoint(self.checkpoint)
+
+    def save_checkpoint(self, path: str):
+        """Writes the memo to `path` as an .npz file, replacing it atomically."""
+        entries = list(self._memo.items())
+        keys = np.array([np.frombuffer(k, dtype=np.uint8) for k, _ in entries],
+                        dtype=np.uint8).reshape(len(entries), 16)
+        values = np.array([v for _, (v, _, _) in entries], dtype=np.int64)
+        exact = np.array([e for _, (_, e, _) in entries], dtype=bool)
+        rows = np.array([r for _, (_, _, r) in entries], dtype=np.int32)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            try:
+                np.savez(f, format=CHECKPOINT_FORMAT_VERSION, key=self.key,
+                         keys=keys, values=values, exact=exact, rows=rows)
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+    def load_checkpoint(self, path: str):
+        """Adds the memo entries saved in `path` to this solver's memo."""
+        with np.load(path) as data:
+            if int(data["format"]) != CHECKPOINT_FORMAT_VERSION:
+                raise ValueError("Unsupported checkpoint format.")
+            if str(data["key"]) != self.key:
+                raise ValueError(f"{path} was saved for different word lists.")
+            for key, value, exact, row in zip(data["keys"], data["values"],
+                                              data["exact"], data["rows"]):
+                key = key.tobytes()
+                known = self._memo.get(key)
+                if known is None or (not known[1] and (exact or value > known[0])):
+                    self._memo[key] = (int(value), bool(exact), int(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search for the strategy with the fewest total guesses (branch and bound)."
+    )
+    parser.add_argument("--opener", type=str, default=None,
+                        help="Fix the first guess (default: search over all first guesses)")
+    parser.add_argument("--guesses", type=str, default=None,
+                        help="JSON list of allowed guesses (default: the word list)")
+    parser.add_argument("--solutions", type=str, default=None,
+                        help="JSON list of the solutions to solve (default: the word list)")
+    parser.add_argument("--max-nodes", type=int, default=None,
+                        help="Stop after expanding this many candidate sets")
+    parser.add_argument("--hours", type=float, default=None,
+                        help="Stop after this many hours")
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="Resume from this file if it exists, and save progress to it")
+    parser.add_argument("--checkpoint-interval", type=float, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help=f"Seconds between checkpoint saves (default: {DEFAULT_CHECKPOINT_INTERVAL:.0f})")
+    parser.add_argument("--progress-interval", type=float, default=DEFAULT_PROGRESS_INTERVAL,
+                        help=f"Seconds between progress lines (default: {DEFAULT_PROGRESS_INTERVAL:.0f})")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the optimal decision tree to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        word_list = load_word_list()
+    except Exception as e:
+        print(f"Error loading word list from {DEFAULT_WORD_LIST}: {e}")
+        return
+    guesses = None
+    solutions = None
+    try:
+        if args.solutions:
+            solutions = load_word_list(args.solutions)
+        if args.guesses:
+            guesses = merge_guess_list(load_word_list(args.guesses), word_list)
+    except (OSError, ValueError) as e:
+        print(f"Error loading word lists: {e}")
+        return
+
+    def report(stats):
+        print(f"[{stats['seconds']:.0f}s] {stats['nodes']:,} sets searched, "
+              f"{stats['memo']:,} memoized, best {stats['best_guess']} "
+              f"({stats['best_total']} guesses)", flush=True)
+
+    if guesses is None:
+        feedback = load_feedback_matrix(word_list)
+    else:
+        feedback = load_feedback_matrix(guesses, word_list)
+
+    try:
+        solver = OptimalSolver(
+            feedback, max_nodes=args.max_nodes,
+            max_seconds=None if args.hours is None else args.hours * 3600,
+            progress=report, progress_interval=args.progress_interval,
+            checkpoint=args.checkpoint, checkpoint_interval=args.checkpoint_interval,
+        )
+        result = solver.solve(args.opener, solutions)
+    except ValueError as e:
+        print(e)
+        return
+
+    status = "optimal" if result["complete"] else "best found (budget exhausted)"
+    print(f"{status}: first guess {result['guess']}, {result['total']} guesses for "
+          f"{result['solutions']} solutions, mean {result['mean']:.4f}")
+    if not result["complete"]:
+        print(f"Proven lower bound: {result['lower_bound']} guesses "
+              f"(mean {result['lower_bound'] / result['solutions']:.4f})")
+        if args.checkpoint:
+            print(f"Progress saved to {args.checkpoint}; run again to resume.")
+    print(f"{result['nodes']:,} sets searched in {result['seconds']:.1f}s")
+
+    if args.output and result["complete"]:
+        solver.tree(args.opener, solutions).save(args.output)
+        print(f"Decision tree written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
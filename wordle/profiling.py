@@ -0,0 +1,201 @@
+"""
+Opt-in per-phase timing of the solver's hot paths.
+
+Functions decorated with `@profiled()` count their calls, their cumulative
+time and, where it makes sense, the size of the candidate set they worked on.
+Nothing is recorded unless profiling is on, and then a summary is printed at
+exit.  It is turned on by the `--profile` option of the scorer, ranker and
+evaluator, or for any entry point by the environment:
+
+  WORDLE_PROFILE=table          print a table to stderr at exit
+  WORDLE_PROFILE=json           print the summary as JSON instead
+  WORDLE_PROFILE_OUTPUT=FILE    write the summary to FILE instead of stderr
+
+Times are cumulative: a phase that calls another phase includes its time.
+Worker processes of the evaluator inherit the setting through the
+environment, and their counters are merged into the parent's summary.
+
+Each decorated function is replaced by its wrapper once, when it is
+defined, so every import and alias of it is profiled alike.  While profiling
+is off the wrapper calls straight through, which costs a check per call.
+"""
+
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+ENV_VAR = "WORDLE_PROFILE"
+OUTPUT_ENV_VAR = "WORDLE_PROFILE_OUTPUT"
+FORMATS = ["table", "json"]
+
+
+class Profiler:
+    """
+    Counters of every profiled phase: its calls, cumulative seconds and the
+    count, sum and maximum of the candidate-set sizes it was given.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.format = "table"
+        self.output = None
+        self.phases = {}
+        self._exit_hook = False
+
+    def enable(self, summary_format: str = "table", output: str = None):
+        """
+        Starts recording and prints the summary when the process exits.  The
+        setting is also exported to the environment for worker processes.
+        """
+        if summary_format not in FORMATS:
+            raise ValueError(f"Unknown profile format '{summary_format}'. "
+                             f"Choose from: {', '.join(FORMATS)}.")
+        self.enabled = True
+        self.format = summary_format
+        self.output = output
+        os.environ[ENV_VAR] = summary_format
+        if output is not None:
+            os.environ[OUTPUT_ENV_VAR] = output
+        if not self._exit_hook:
+            atexit.register(self._dump_at_exit)
+            self._exit_hook = True
+
+    def disable(self):
+        """Stops recording."""
+        self.enabled = False
+
+    def record(self, name: str, seconds: float, size: int = None):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = [0, 0.0, 0, 0, 0]
+        stats[0] += 1
+        stats[1] += seconds
+        if size is not None:
+            stats[2] += 1
+            stats[3] += size
+            if size > stats[4]:
+                stats[4] = size
+
+    def take(self) -> dict:
+        """Returns the counters recorded so far and starts over."""
+        phases, self.phases = self.phases, {}
+        return phases
+
+    def merge(self, phases: dict):
+        """Adds counters returned by `take`, e.g. from a worker process."""
+        for name, (calls, seconds, sized, size_total, size_max) in phases.items():
+            stats = self.phases.setdefault(name, [0, 0.0, 0, 0, 0])
+            stats[0] += calls
+            stats[1] += seconds
+            stats[2] += sized
+            stats[3] += size_total
+            stats[4] = max(stats[4], size_max)
+
+    def clear(self):
+        self.phases = {}
+
+    def summary(self) -> list[dict]:
+        """One entry per phase, the most time-consuming first."""
+        rows = []
+        for name, (calls, seconds, sized, size_total, size_max) in self.phases.items():
+            rows.append({
+                "phase": name,
+                "calls": calls,
+                "seconds": seconds,
+                "us_per_call": seconds / calls * 1e6 if calls else 0.0,
+                "mean_size": size_total / sized if sized else None,
+                "max_size": size_max if sized else None,
+            })
+        rows.sort(key=lambda row: row["seconds"], reverse=True)
+        return rows
+
+    def format_table(self) -> str:
+        lines = [f"{'Phase':<40} {'Calls':>10} {'Seconds':>10} {'us/call':>10} "
+                 f"{'Mean size':>10} {'Max size':>9}"]
+        for row in self.summary():
+            mean_size = "" if row["mean_size"] is None else f"{row['mean_size']:.1f}"
+            max_size = "" if row["max_size"] is None else str(row["max_size"])
+            lines.append(f"{row['phase']:<40} {row['calls']:>10} {row['seconds']:>10.4f} "
+                         f"{row['us_per_call']:>10.1f} {mean_size:>10} {max_size:>9}")
+        return "\n".join(lines)
+
+    def dump(self, file=None):
+        """Writes the summary in the configured format to `file` (default: stderr)."""
+        file = file if file is not None else sys.stderr
+        if self.format == "json":
+            json.dump({"phases": self.summary()}, file, indent=2)
+            file.write("\n")
+        else:
+            file.write("Profile (cumulative time per phase):\n")
+            file.write(self.format_table() + "\n")
+
+    def _dump_at_exit(self):
+        # Workers hand their counters to the parent instead
+        if not self.enabled or multiprocessing.parent_process() is not None:
+            return
+        if self.output is None:
+            self.dump()
+        else:
+            with open(self.output, "w") as f:
+                self.dump(f)
+
+
+PROFILER = Profiler()
+# Forked workers would otherwise report the parent's counters a second time
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=PROFILER.clear)
+
+
+def profiled(name: str = None, size=None):
+    """
+    Decorator recording each call of a function under `name` (default: its
+    qualified name) while profiling is on.  `size`, if given, is called with
+    the function's arguments and returns the candidate-set size to record.
+    """
+    def decorate(func):
+        phase = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            # Sized before the call, which may narrow the candidates
+            count = None if size is None else size(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(phase, time.perf_counter() - start, count)
+        return wrapper
+    return decorate
+
+
+def add_profile_arguments(parser):
+    """Adds the --profile and --profile-output options to a command's parser."""
+    parser.add_argument("--profile", nargs="?", const="table", default=None, choices=FORMATS,
+                        help="Time the solver's phases and print a summary at exit "
+                             "(default format: table)")
+    parser.add_argument("--profile-output", type=str, default=None, metavar="FILE",
+                        help="Write the --profile summary to FILE instead of stderr")
+
+
+def start_profiling(args):
+    """Turns profiling on if the parsed command-line options ask for it."""
+    if args.profile:
+        PROFILER.enable(args.profile, args.profile_output)
+
+
+def _enable_from_environment():
+    summary_format = os.environ.get(ENV_VAR, "")
+    if summary_format in ("", "0"):
+        return
+    if summary_format not in FORMATS:
+        summary_format = "table"
+    PROFILER.enable(summary_format, os.environ.get(OUTPUT_ENV_VAR) or None)
+
+
+_enable_from_environment()
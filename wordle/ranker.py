@@ -8,56 +8,273 @@ against every other word in the list, where each position contributes:
   0 = gray   (letter not present)
 
 A higher total means the word reveals more information on average.
+
+Other metrics (--metric) rank guesses by how they split the solutions into
+feedback buckets instead:
+  entropy        expected information of the feedback, in bits (higher is better)
+  expected-size  expected number of solutions left after the guess (lower is better)
+  max-bucket     solutions left in the worst case (lower is better)
+All metrics are derived from one pass that counts, for every guess, how many
+solutions produce each feedback pattern.
+
+The green-yellow totals of the whole word list are cached next to its
+feedback table (see `load_score_totals`), so wordle/update.py can patch
+them when words are added or removed instead of ranking again.
 """
 
 import argparse
-import json
 import os
 import sys
+import tempfile
+
+import numpy as np
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 try:
     from wordle.scorer import scoreGuess
+    from wordle.feedback import (
+        FeedbackMatrix, cache_directory, cache_key, compute_patterns, encode_words, entropies,
+        load_feedback_matrix, mark_cache_used, pattern_histograms, pattern_totals,
+    )
+    from wordle.profiling import add_profile_arguments, profiled, start_profiling
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+    from wordle.words import merge_guess_list
 except ImportError:
     from scorer import scoreGuess
+    from feedback import (
+        FeedbackMatrix, cache_directory, cache_key, compute_patterns, encode_words, entropies,
+        load_feedback_matrix, mark_cache_used, pattern_histograms, pattern_totals,
+    )
+    from profiling import add_profile_arguments, profiled, start_profiling
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+    from words import merge_guess_list
+
+# Guesses scored per batch by pattern_histogram_table
+RANK_CHUNK_SIZE = 256
+
+
+def score_word(word: str, word_list: list[str], feedback: FeedbackMatrix = None) -> int:
+    """
+    Return the total score of guessing `word` against every word in the list.
 
+    If a FeedbackMatrix covering `word` and the list is given, the scores are
+    looked up instead of recomputed.
+    """
+    if feedback is not None:
+        codes = feedback.row(word)[feedback.solution_columns(word_list)]
+        return _lookup_total(codes, feedback.num_patterns)
 
-def score_word(word: str, word_list: list[str]) -> int:
-    """Return the total score of guessing `word` against every word in the list."""
     total = 0
     for solution in word_list:
         if solution == word:
             continue
-        for ch in scoreGuess(word, solution):
+        for ch in scoreGuess(word, solution, len(word)):
             total += int(ch)
     return total
 
 
-def rank_words(word_list: list[str], verbose: bool = False) -> list[tuple[str, int]]:
+def _lookup_total(codes, num_patterns: int) -> int:
+    """Sums the green/yellow points of pattern codes, skipping the guess's own entry."""
+    return int(pattern_totals(num_patterns)[codes[codes != num_patterns - 1]].sum())
+
+
+@profiled(size=lambda guesses, solutions, *args, **kwargs: len(solutions))
+def pattern_histogram_table(guesses: list[str], solutions: list[str],
+                            feedback: FeedbackMatrix = None, chunk_size: int = RANK_CHUNK_SIZE,
+                            verbose: bool = False) -> np.ndarray:
     """
-    Returns a list of (word, total_score) tuples sorted descending by score.
+    Returns a (len(guesses), 3**length) array (243 columns for 5-letter
+    words) counting how many solutions give each feedback pattern for every
+    guess.
+
+    Guesses are scored against the solutions in batches of `chunk_size`, so at
+    most chunk_size x len(solutions) pattern codes are held at once.  The
+    codes are read from `feedback` when given, and computed otherwise.
     """
-    n = len(word_list)
-    scores = []
+    n = len(guesses)
+    if feedback is not None:
+        columns = feedback.solution_columns(solutions)
+        num_patterns = feedback.num_patterns
+    else:
+        guess_letters = encode_words(guesses)
+        solution_letters = encode_words(solutions, guess_letters.shape[1])
+        num_patterns = 3 ** guess_letters.shape[1]
+    histograms = np.empty((n, num_patterns), dtype=np.int64)
 
-    for i, word in enumerate(word_list):
-        if verbose and i % 100 == 0:
-            print(f"  Scoring word {i+1}/{n}...", end="\r", flush=True)
-        total = score_word(word, word_list)
-        scores.append((word, total))
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        if verbose:
+            print(f"  Scoring word {start+1}/{n}...", end="\r", flush=True)
+        if feedback is not None:
+            codes = feedback.patterns[np.ix_(feedback.guess_rows(guesses[start:stop]), columns)]
+        else:
+            codes = compute_patterns(guess_letters[start:stop], solution_letters)
+        histograms[start:stop] = pattern_histograms(codes, num_patterns=num_patterns)
 
     if verbose:
         print()  # newline after progress
 
-    scores.sort(key=lambda x: x[1], reverse=True)
+    return histograms
+
+
+def green_yellow_totals(histograms: np.ndarray) -> np.ndarray:
+    """Green/yellow points of each guess; a word is not scored against itself."""
+    points = pattern_totals(histograms.shape[1]).copy()
+    points[-1] = 0  # The solved pattern is the last code
+    return histograms @ points
+
+
+def expected_sizes(histograms: np.ndarray) -> np.ndarray:
+    """Expected number of solutions left after each guess."""
+    totals = histograms.sum(axis=1)
+    return (histograms ** 2).sum(axis=1) / np.maximum(totals, 1)
+
+
+def max_buckets(histograms: np.ndarray) -> np.ndarray:
+    """Number of solutions left after each guess in the worst case."""
+    return histograms.max(axis=1)
+
+
+# Metric name -> (function of the histogram table, whether higher is better)
+METRICS = {
+    "green-yellow": (green_yellow_totals, True),
+    "entropy": (entropies, True),
+    "expected-size": (expected_sizes, False),
+    "max-bucket": (max_buckets, False),
+}
+
+
+def score_totals(word_list: list[str], feedback: FeedbackMatrix = None,
+                 chunk_size: int = RANK_CHUNK_SIZE, verbose: bool = False) -> np.ndarray:
+    """Returns the `score_word` total of every word in the list as an array."""
+    return green_yellow_totals(
+        pattern_histogram_table(word_list, word_list, feedback, chunk_size, verbose)
+    )
+
+
+def score_totals_path(word_list: list[str], cache_dir: str = None) -> str:
+    """The cache file holding the green-yellow totals of a word list."""
+    return os.path.join(cache_dir or cache_directory(), f"totals-{cache_key(word_list)[:16]}.npy")
+
+
+def save_score_totals(word_list: list[str], totals: np.ndarray,
+                      cache_dir: str = None) -> str:
+    """Writes the totals to their cache file atomically and returns its path."""
+    cache_dir = cache_dir or cache_directory()
+    path = score_totals_path(word_list, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            np.save(f, np.asarray(totals, dtype=np.int64))
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_score_totals(word_list: list[str], feedback: FeedbackMatrix = None,
+                      cache_dir: str = None) -> np.ndarray:
+    """
+    Returns `score_totals(word_list)` from its cache file, computing and
+    caching it first if needed (from `feedback` when given).
+    """
+    path = score_totals_path(word_list, cache_dir)
+    try:
+        totals = np.load(path)
+        if totals.shape == (len(word_list),):
+            mark_cache_used(path)
+            return totals
+    except (OSError, ValueError):
+        pass  # Missing or damaged; compute it below
+    totals = score_totals(word_list, feedback)
+    try:
+        save_score_totals(word_list, totals, cache_dir)
+    except OSError:
+        pass  # Read-only cache directory
+    return totals
+
+
+def updated_score_totals(totals: np.ndarray, old_feedback: FeedbackMatrix,
+                         new_feedback: FeedbackMatrix) -> np.ndarray:
+    """
+    Patches the `score_totals` of old_feedback's word list into those of
+    new_feedback's (both square matrices over their list).  A kept word loses
+    its points against the removed words and gains those against the added
+    ones; only added words are summed in full, so a change of d words costs
+    O(n*d) instead of O(n^2).
+    """
+    points = pattern_totals(new_feedback.num_patterns).copy()
+    points[new_feedback.solved_pattern] = 0
+    words = new_feedback.guesses
+    old_ids = np.array([old_feedback.guess_index.get(w, -1) for w in words], dtype=np.intp)
+    kept, added = np.flatnonzero(old_ids >= 0), np.flatnonzero(old_ids < 0)
+    removed = np.setdiff1d(np.arange(len(old_feedback.guesses)), old_ids[kept])
+
+    patched = np.empty(len(words), dtype=np.int64)
+    patched[kept] = (
+        np.asarray(totals)[old_ids[kept]]
+        - points[old_feedback.patterns[np.ix_(old_ids[kept], removed)]].sum(axis=1)
+        + points[new_feedback.patterns[np.ix_(kept, added)]].sum(axis=1)
+    )
+    patched[added] = points[new_feedback.patterns[added]].sum(axis=1)
+    return patched
+
+
+def rank_guesses(guesses: list[str], solutions: list[str], metric: str = "green-yellow",
+                 feedback: FeedbackMatrix = None, chunk_size: int = RANK_CHUNK_SIZE,
+                 verbose: bool = False) -> list[tuple[str, float]]:
+    """
+    Returns (word, value) tuples for every guess, best first by `metric`
+    (see METRICS), measured against the given solutions.  Ties keep their
+    guess-list order.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}.")
+    compute, higher_is_better = METRICS[metric]
+    values = compute(pattern_histogram_table(guesses, solutions, feedback, chunk_size, verbose))
+    return _ranked(guesses, values, higher_is_better)
+
+
+def _ranked(words: list[str], values: np.ndarray, higher_is_better: bool) -> list[tuple]:
+    """(word, value) tuples, best first; ties keep their list order."""
+    scores = [(word, value.item()) for word, value in zip(words, values)]
+    scores.sort(key=lambda x: x[1], reverse=higher_is_better)
     return scores
 
 
+def rank_words(word_list: list[str], verbose: bool = False, feedback: FeedbackMatrix = None,
+               chunk_size: int = RANK_CHUNK_SIZE) -> list[tuple[str, int]]:
+    """
+    Returns a list of (word, total_score) tuples sorted descending by score.
+    """
+    return rank_guesses(word_list, word_list, "green-yellow", feedback, chunk_size, verbose)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Rank Wordle words by total score against the full word list."
     )
+    parser.add_argument(
+        "--metric", choices=list(METRICS), default="green-yellow",
+        help="What to rank guesses by (default: green-yellow)"
+    )
+    parser.add_argument(
+        "--solutions", type=str, default=None,
+        help="Rank against only the solutions in this JSON word list (default: the full list)"
+    )
+    parser.add_argument(
+        "--guesses", type=str, default=None,
+        help="Rank the allowed guesses in this JSON word list instead (solutions are added to it)"
+    )
+    parser.add_argument(
+        "--word-list", type=str, default=DEFAULT_WORD_LIST, metavar="FILE",
+        help="JSON word list to rank; its words may have any one length "
+             "(default: wordle/wordle-list.txt)"
+    )
     parser.add_argument(
         "--top", type=int, default=None,
         help="Only show the top N words (default: show all)"
@@ -70,26 +287,61 @@ def main():
         "--verbose", action="store_true",
         help="Show progress while scoring"
     )
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
 
-    word_list_path = os.path.join(os.path.dirname(__file__), "wordle-list.txt")
     try:
-        with open(word_list_path, "r") as f:
-            word_list = [w.upper() for w in json.load(f)]
+        word_list = load_word_list(args.word_list)
     except Exception as e:
-        print(f"Error loading word list from {word_list_path}: {e}")
+        print(f"Error loading word list from {args.word_list}: {e}")
         return
 
-    print(f"Scoring {len(word_list)} words against each other...")
-    ranked = rank_words(word_list, verbose=args.verbose)
+    solutions = word_list
+    if args.solutions:
+        try:
+            solutions = load_word_list(args.solutions)
+        except Exception as e:
+            print(f"Error loading solutions from {args.solutions}: {e}")
+            return
+
+    guesses = word_list
+    if args.guesses:
+        try:
+            guesses = merge_guess_list(load_word_list(args.guesses), solutions)
+        except Exception as e:
+            print(f"Error loading guesses from {args.guesses}: {e}")
+            return
+
+    if solutions is word_list and guesses is word_list:
+        print(f"Scoring {len(word_list)} words against each other...")
+    else:
+        print(f"Scoring {len(guesses)} words against {len(solutions)} solutions...")
+    if guesses is word_list:
+        feedback = load_feedback_matrix(word_list)
+    else:
+        feedback = load_feedback_matrix(guesses, word_list)
+    if not set(solutions) <= feedback.solution_index.keys():
+        feedback = None  # Solutions outside the cached table are scored directly
+    if args.metric == "green-yellow" and solutions is word_list and guesses is word_list:
+        ranked = _ranked(word_list, load_score_totals(word_list, feedback), True)
+    else:
+        ranked = rank_guesses(guesses, solutions, args.metric, feedback, verbose=args.verbose)
 
     display = ranked[:args.top] if args.top else ranked
-    max_score = ranked[0][1] if ranked else 1
 
-    print(f"\nRank  Word   Total Score")
-    print(f"----  -----  -----------")
-    for rank, (word, score) in enumerate(display, start=1):
-        print(f"{rank:>4}  {word}  {score:>11}")
+    width = max(4, len(word_list[0]) if word_list else 0)
+    if args.metric == "green-yellow":
+        print(f"\nRank  {'Word':<{width}}  Total Score")
+        print(f"----  {'-' * width}  -----------")
+        for rank, (word, score) in enumerate(display, start=1):
+            print(f"{rank:>4}  {word:<{width}}  {score:>11}")
+    else:
+        print(f"\nRank  {'Word':<{width}}  {args.metric:>13}")
+        print(f"----  {'-' * width}  -------------")
+        for rank, (word, value) in enumerate(display, start=1):
+            shown = f"{value:.4f}" if isinstance(value, float) else str(value)
+            print(f"{rank:>4}  {word:<{width}}  {shown:>13}")
 
     if args.output:
         with open(args.output, "w") as f:
@@ -1,15 +1,49 @@
 import argparse
-import json
+import functools
 import random
+import os
+import sys
 from collections import Counter
-from typing import List, Set
-
-def scoreGuess(guess: str, solution: str) -> str:
+from typing import List
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.cache import canonical_state
+    from wordle.candidates import CandidateIndex, letter_constraints
+    from wordle.feedback import WORD_LENGTH, load_feedback_matrix, score_strings
+    from wordle.profiling import add_profile_arguments, profiled, start_profiling
+    from wordle.strategies import (
+        FirstBoardStrategy, RandomStrategy, STRATEGY_NAMES, make_multi_board_strategy,
+        make_strategy,
+    )
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+    from wordle.words import merge_guess_list
+except ImportError:
+    from cache import canonical_state
+    from candidates import CandidateIndex, letter_constraints
+    from feedback import WORD_LENGTH, load_feedback_matrix, score_strings
+    from profiling import add_profile_arguments, profiled, start_profiling
+    from strategies import (
+        FirstBoardStrategy, RandomStrategy, STRATEGY_NAMES, make_multi_board_strategy,
+        make_strategy,
+    )
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+    from words import merge_guess_list
+
+# Candidate lists whose CandidateIndex filterCandidates keeps for reuse
+FILTER_INDEX_CACHE_SIZE = 16
+
+@profiled()
+def scoreGuess(guess: str, solution: str, length: int = WORD_LENGTH) -> str:
     """
-    Computes a 5-character score string comparing a guess to the solution using Wordle-like rules.
+    Computes a score string comparing a guess to the solution using Wordle-like rules.
+    Both words must have `length` letters (5 unless playing another variant).
     """
-    if len(guess) != 5 or len(solution) != 5:
-        raise ValueError("Both guess and solution must be of length 5.")
+    if len(guess) != length or len(solution) != length:
+        raise ValueError(f"Both guess and solution must be of length {length}.")
 
     if not guess.isalpha() or not solution.isalpha():
         raise ValueError("Both guess and solution must contain only alphabetic characters.")
@@ -17,17 +51,17 @@ def scoreGuess(guess: str, solution: str) -> str:
     guess = guess.upper()
     solution = solution.upper()
 
-    score = ['0'] * 5
+    score = ['0'] * length
     solution_freq = Counter(solution)
 
     # Pass 1: Greens
-    for i in range(5):
+    for i in range(length):
         if guess[i] == solution[i]:
             score[i] = '2'
             solution_freq[guess[i]] -= 1
 
     # Pass 2: Yellows
-    for i in range(5):
+    for i in range(length):
         if score[i] != '2':
             ch = guess[i]
             if solution_freq.get(ch, 0) > 0:
@@ -36,120 +70,184 @@ def scoreGuess(guess: str, solution: str) -> str:
 
     return "".join(score)
 
+@profiled(size=lambda guess, score, candidates: len(candidates))
 def filterCandidates(guess: str, score: str, candidates: List[str]) -> List[str]:
     """
     Filters a list of candidate words based on a guess and its corresponding score.
+    The guess and score must be as long as the candidates (5 letters for an
+    empty list).
     """
-    if len(guess) != 5 or len(score) != 5:
-        raise ValueError("Guess and score must both be of length 5.")
-    if not guess.isalpha():
-        raise ValueError("Guess must contain only alphabetic characters.")
-    if not all(c in '012' for c in score):
-        raise ValueError("Score must only contain characters '0', '1', or '2'.")
+    try:
+        index = _candidate_index(tuple(candidates))
+    except ValueError:
+        return _filter_words(guess, score, candidates)
+    return index.words_at(index.filter(guess, score))
 
-    guess = guess.upper()
 
-    # 1. Build positional constraints and letter statistics
-    must_be = [None] * 5
-    forbid_at_pos: List[Set[str]] = [set() for _ in range(5)]
-
-    greens = Counter()
-    yellows = Counter()
-    grays = Counter()
-
-    for i, (gch, s) in enumerate(zip(guess, score)):
-        if s == '2':
-            must_be[i] = gch
-            greens[gch] += 1
-        elif s == '1':
-            forbid_at_pos[i].add(gch)
-            yellows[gch] += 1
-        elif s == '0':
-            forbid_at_pos[i].add(gch)
-            grays[gch] += 1
-
-    min_count = Counter()
-    max_count = {}
-
-    all_letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    for letter in all_letters:
-        min_count[letter] = greens[letter] + yellows[letter]
-        if grays[letter] > 0:
-            max_count[letter] = min_count[letter]
-        else:
-            max_count[letter] = 5 # No upper bound from this clue
+@functools.lru_cache(maxsize=FILTER_INDEX_CACHE_SIZE)
+def _candidate_index(candidates: tuple) -> CandidateIndex:
+    # Callers usually filter the same few lists over and over, so building
+    # an index for each call would cost more than the filter itself
+    return CandidateIndex(list(candidates))
+
+
+def _filter_words(guess: str, score: str, candidates: List[str]) -> List[str]:
+    """
+    Word-by-word version of filterCandidates for lists a CandidateIndex cannot
+    encode, such as lists mixing words of different lengths.  Candidates of
+    another length than the guess never match.
+    """
+    length = len(guess)
+    must_be, forbid_at_pos, min_count, max_count = letter_constraints(guess, score, length)
 
-    # 2. Filter candidates
     result = []
     for candidate in candidates:
-        # Assuming candidates are already valid 5-letter words
-        # if len(candidate) != 5 or not candidate.isalpha():
-        #     continue
-
         w = candidate.upper()
-
-        ok = True
+        if len(w) != length:
+            continue
 
         # Greens check
-        for i in range(5):
-            if must_be[i] is not None and w[i] != must_be[i]:
-                ok = False
-                break
-        if not ok:
+        if any(must_be[i] is not None and w[i] != must_be[i] for i in range(length)):
             continue
 
         # Positional exclusions (covers both '0' and '1')
-        for i in range(5):
-            if w[i] in forbid_at_pos[i]:
-                ok = False
-                break
-        if not ok:
+        if any(w[i] in forbid_at_pos[i] for i in range(length)):
             continue
 
         # Letter count bounds
         w_counts = Counter(w)
-        for letter in all_letters:
-            count = w_counts[letter]
-            if not (min_count[letter] <= count <= max_count[letter]):
-                ok = False
-                break
-
-        if ok:
+        if all(min_count.get(letter, 0) <= w_counts[letter] <= max_count.get(letter, length)
+               for letter in set(w) | set(min_count)):
             result.append(candidate)
 
     return result
 
 
 class WordleGame:
-    def __init__(self, solution: str, word_list: List[str]):
-        if len(solution) != 5 or not solution.isalpha():
-            raise ValueError("Solution must be a 5-letter alphabetic word.")
+    def __init__(self, solution: str, word_list: List[str], feedback=None,
+                 index: CandidateIndex = None, strategy=None, filter_cache=None,
+                 hard_mode: bool = False, guess_index: CandidateIndex = None, book=None):
+        # Candidates are tracked as indices into a CandidateIndex, which can be
+        # shared by many games over the same word list
+        if index is None:
+            index = CandidateIndex(word_list)
+        self.index = index
+        # Every word of the game has as many letters as those of the word list
+        self.length = index.length
+        if len(solution) != self.length or not solution.isalpha():
+            raise ValueError(f"Solution must be a {self.length}-letter alphabetic word.")
         self.solution = solution.upper()
-        self.candidates = word_list
+        # In hard mode every guess must keep the revealed greens in place and
+        # reuse the revealed yellows; guess_pool_ids are the (sorted) ids of
+        # the words in guess_index that still do.  The allowed guesses default
+        # to the word list itself.
+        self.hard_mode = hard_mode
+        if index.table.same_words(word_list):
+            self.candidate_ids = index.all_ids()
+            self.guess_pool_ids = self.candidate_ids
+        else:
+            self.candidate_ids = index.ids(word_list)
+            self.guess_pool_ids = np.sort(self.candidate_ids)
+            # Cached candidate sets assume the game starts from the whole index
+            filter_cache = None
+        self.guess_index = index
+        if guess_index is not None and guess_index is not index:
+            self.guess_index = guess_index
+            self.guess_pool_ids = guess_index.all_ids()
+        # Optional LRUCache (see wordle/cache.py) of the candidate set after
+        # each guess/score history, shared by games over the same index
+        self.filter_cache = filter_cache
+        # Optional FeedbackMatrix (see wordle/feedback.py) used to look up scores
+        self.feedback = feedback
+        # When the matrix covers the solution and every indexed word, guesses
+        # are scored and filtered as integer pattern codes
+        self._columns = None
+        self._solution_column = None
+        if feedback is not None:
+            self._solution_column = feedback.solution_index.get(self.solution)
+            if self._solution_column is not None:
+                self._columns = index.feedback_columns(feedback)
+        # Picks each guess; see wordle/strategies.py
+        self.strategy = strategy if strategy is not None else RandomStrategy()
+        # Optional OpeningBook (see wordle/book.py) for the word list, whose
+        # early guesses are played before the strategy is asked
+        self.book = book
         self.used_guesses = set()
+        # (guess, score) pairs in the order they were played
+        self.history = []
         self.guess_count = 0
         self.solved = False
 
+    @property
+    def candidates(self) -> List[str]:
+        return self.index.words_at(self.candidate_ids)
+
+    @profiled(size=lambda self: len(self.candidate_ids))
     def suggest_guess(self) -> str:
-        available_candidates = [c for c in self.candidates if c not in self.used_guesses]
-        if not available_candidates:
-            raise ValueError("No more candidate words to suggest.")
-        return random.choice(available_candidates)
+        if self.book is not None:
+            guess = self.book.lookup(self.history)
+            if guess is not None and guess not in self.used_guesses and self.allows(guess):
+                return guess
+        return self.strategy.choose(self)
+
+    def allows(self, guess: str) -> bool:
+        """True if the guess may be played (always, outside hard mode)."""
+        if not self.hard_mode:
+            return True
+        word_id = self.guess_index.word_index.get(guess.upper())
+        if word_id is None:
+            return False
+        position = np.searchsorted(self.guess_pool_ids, word_id)
+        return position < len(self.guess_pool_ids) and self.guess_pool_ids[position] == word_id
 
     def guess_and_update(self, guess: str):
+        if not self.allows(guess):
+            raise ValueError(f"'{guess}' does not use every revealed hint (hard mode).")
+        return self._play(guess)
+
+    @profiled(name="WordleGame.play", size=lambda self, guess: len(self.candidate_ids))
+    def _play(self, guess: str) -> str:
         self.used_guesses.add(guess)
-        score = scoreGuess(guess, self.solution)
-        if score == "22222":
+        row = None
+        if self._columns is not None:
+            row = self.feedback.guess_index.get(guess.upper())
+        if row is not None:
+            patterns = self.feedback.patterns[row]
+            code = patterns[self._solution_column]
+            score = score_strings(self.length)[code]
+        elif self.feedback is not None:
+            score = self.feedback.score(guess, self.solution)
+        else:
+            score = scoreGuess(guess, self.solution, self.length)
+        self.history.append((guess, score))
+        if score == "2" * self.length:
             self.solved = True
-        self.candidates = filterCandidates(guess, score, self.candidates)
+        if self.hard_mode:
+            self.guess_pool_ids = self.guess_index.filter_hard(guess, score, self.guess_pool_ids)
+
+        key = candidate_ids = None
+        if self.filter_cache is not None:
+            key = (self.index, canonical_state(self.history))
+            candidate_ids = self.filter_cache.get(key)
+        if candidate_ids is None:
+            if row is not None:
+                candidate_ids = self.index.filter_code(patterns, code, self.candidate_ids,
+                                                       self._columns)
+            else:
+                candidate_ids = self.index.filter(guess, score, self.candidate_ids)
+            if key is not None:
+                # Shared with later games, so nobody may modify it in place
+                candidate_ids.flags.writeable = False
+                self.filter_cache.put(key, candidate_ids)
+        self.candidate_ids = candidate_ids
         return score
 
     def play_game(self):
         print(f"Trying to guess the word: {self.solution}")
-        print(f"Starting with {len(self.candidates)} possible words.")
+        print(f"Starting with {len(self.candidate_ids)} possible words.")
 
         while not self.solved:
-            if not self.candidates:
+            if len(self.candidate_ids) == 0:
                 print("No more candidate words left. Something went wrong.")
                 break
 
@@ -167,25 +265,67 @@ class WordleGame:
                 print(f"Successfully guessed the word '{guess}' in {self.guess_count} tries!")
                 break
 
-            print(f"  {len(self.candidates)} candidates remaining.")
+            print(f"  {len(self.candidate_ids)} candidates remaining.")
 
 
 class QuordleGame:
-    def __init__(self, solutions: List[str], word_list: List[str]):
-        self.games = [WordleGame(s, word_list.copy()) for s in solutions]
+    """
+    Several Wordle boards solved with one shared sequence of guesses: Quordle
+    with four solutions, Octordle with eight, and so on.  By default a game
+    allows five more guesses than it has boards (9 for Quordle).
+
+    In hard mode every guess must use all revealed hints of at least one
+    unsolved board, so `guess_pool_ids` is the union of their pools.
+    Requiring the hints of every board at once would soon leave no legal
+    guess at all, since different boards reveal conflicting greens.
+    """
+
+    def __init__(self, solutions: List[str], word_list: List[str], feedback=None,
+                 strategy=None, max_guesses: int = None, index: CandidateIndex = None,
+                 filter_cache=None, hard_mode: bool = False,
+                 guess_index: CandidateIndex = None):
+        # All boards track their candidates in one index, which may also be
+        # shared between games
+        if index is None:
+            index = CandidateIndex(word_list)
+        self.index = index
+        self.hard_mode = hard_mode
+        self.games = [WordleGame(s, word_list, feedback=feedback, index=index,
+                                 filter_cache=filter_cache, hard_mode=hard_mode,
+                                 guess_index=guess_index)
+                      for s in solutions]
+        self.guess_index = self.games[0].guess_index if self.games else index
         self.guess_count = 0
         self.used_guesses = set()
-
+        self.max_guesses = max_guesses if max_guesses is not None else len(solutions) + 5
+        # Picks each guess from all boards at once; see wordle/strategies.py
+        self.strategy = strategy if strategy is not None else FirstBoardStrategy()
+
+    @property
+    def solved(self) -> bool:
+        return all(g.solved for g in self.games)
+
+    @property
+    def guess_pool_ids(self) -> np.ndarray:
+        pools = [g.guess_pool_ids for g in self.games if not g.solved]
+        if not pools:
+            return self.games[0].guess_pool_ids
+        return functools.reduce(np.union1d, pools)
+
+    @profiled(size=lambda self: sum(len(g.candidate_ids) for g in self.games if not g.solved))
     def suggest_guess(self) -> str:
-        # For simplicity, we'll just use the suggestion from the first unsolved game.
-        # A more advanced solver might try to find a word that is optimal for all games.
-        for game in self.games:
-            if not game.solved:
-                available_candidates = [c for c in game.candidates if c not in self.used_guesses]
-                if not available_candidates:
-                    continue
-                return random.choice(available_candidates)
-        raise ValueError("No more candidate words to suggest across all games.")
+        return self.strategy.choose(self)
+
+    def guess_and_update(self, guess: str) -> List[str]:
+        """
+        Plays a guess on every unsolved board and returns each board's score
+        (None for boards that were already solved).
+        """
+        if self.hard_mode and not any(g.allows(guess) for g in self.games if not g.solved):
+            raise ValueError(f"'{guess}' does not use every revealed hint (hard mode).")
+        self.used_guesses.add(guess)
+        # The hard-mode check above covers all boards, so each board just plays
+        return [None if game.solved else game._play(guess) for game in self.games]
 
     def play_game(self):
         print("--- Welcome to Quordle Solver ---")
@@ -193,12 +333,11 @@ class QuordleGame:
             print(f"Game {i+1} Solution: {game.solution}")
         print("---------------------------------")
 
-        while not all(g.solved for g in self.games):
+        while not self.solved:
             self.guess_count += 1
 
             try:
                 guess = self.suggest_guess()
-                self.used_guesses.add(guess)
             except ValueError as e:
                 print(e)
                 break
@@ -206,52 +345,91 @@ class QuordleGame:
             print(f"Guess {self.guess_count}: {guess}")
 
             scores = []
-            for i, game in enumerate(self.games):
-                if not game.solved:
-                    score = game.guess_and_update(guess)
-                    scores.append(f"Game {i+1}: {score}")
-                    if game.solved:
-                        print(f"  Game {i+1} solved! Word: {game.solution}")
-                else:
+            for i, score in enumerate(self.guess_and_update(guess)):
+                if score is None:
                     scores.append(f"Game {i+1}: SOLVED")
+                else:
+                    scores.append(f"Game {i+1}: {score}")
+                    if self.games[i].solved:
+                        print(f"  Game {i+1} solved! Word: {self.games[i].solution}")
 
             print("  Scores: " + ", ".join(scores))
 
-            if self.guess_count >= 9:
-                print("\nQuordle failed to solve within 9 guesses.")
+            if self.guess_count >= self.max_guesses:
+                print(f"\nQuordle failed to solve within {self.max_guesses} guesses.")
                 break
 
-        if all(g.solved for g in self.games):
+        if self.solved:
             print(f"\nSuccessfully solved Quordle in {self.guess_count} guesses!")
 
 
 def main():
     parser = argparse.ArgumentParser(description="A Wordle and Quordle solver.")
     # Wordle arguments
-    parser.add_argument("--solution", type=str, help="The 5-letter solution word for Wordle.")
+    parser.add_argument("--solution", type=str,
+                        help="The solution word for Wordle (5 letters with the default word list).")
     # Quordle arguments
     parser.add_argument("--s1", type=str, help="Solution for the first Quordle game.")
     parser.add_argument("--s2", type=str, help="Solution for the second Quordle game.")
     parser.add_argument("--s3", type=str, help="Solution for the third Quordle game.")
     parser.add_argument("--s4", type=str, help="Solution for the fourth Quordle game.")
+    parser.add_argument("--boards", type=str, nargs="+",
+                        help="Solutions for a game with any number of boards (e.g. eight for Octordle).")
+    parser.add_argument("--strategy", choices=STRATEGY_NAMES, default="random",
+                        help="How the solver picks guesses (default: random)")
+    parser.add_argument("--hard", action="store_true",
+                        help="Hard mode: every guess must use all revealed hints")
+    parser.add_argument("--guesses", type=str, default=None,
+                        help="JSON list of allowed guesses (default: the word list)")
+    parser.add_argument("--word-list", type=str, default=DEFAULT_WORD_LIST, metavar="FILE",
+                        help="JSON word list to play with; its words may have any one length "
+                             "(default: wordle/wordle-list.txt)")
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
+    start_profiling(args)
 
+    # Found next to this file, whatever the working directory
     try:
-        with open("wordle/wordle-list.txt", "r") as f:
-            word_list = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading or parsing wordle-list.txt: {e}")
+        word_list = load_word_list(args.word_list)
+    except (OSError, ValueError) as e:
+        print(f"Error reading or parsing {os.path.basename(args.word_list)}: {e}")
         return
 
+    guesses = None
+    if args.guesses:
+        try:
+            guesses = merge_guess_list(load_word_list(args.guesses), word_list)
+        except (OSError, ValueError) as e:
+            print(f"Error reading or parsing {args.guesses}: {e}")
+            return
+
+    if args.strategy == "random":
+        feedback = None
+    elif guesses is None:
+        feedback = load_feedback_matrix(word_list)
+    else:
+        feedback = load_feedback_matrix(guesses, word_list)
+    guess_index = CandidateIndex(guesses) if guesses is not None else None
+
     if args.s1 and args.s2 and args.s3 and args.s4:
         # Run Quordle
         solutions = [args.s1, args.s2, args.s3, args.s4]
-        game = QuordleGame(solutions, word_list)
+        game = QuordleGame(solutions, word_list, feedback=feedback,
+                           strategy=make_multi_board_strategy(args.strategy, feedback),
+                           hard_mode=args.hard, guess_index=guess_index)
         game.play_game()
     elif args.solution:
         # Run Wordle
-        game = WordleGame(solution=args.solution, word_list=word_list)
+        game = WordleGame(solution=args.solution, word_list=word_list, feedback=feedback,
+                          strategy=make_strategy(args.strategy, feedback), hard_mode=args.hard,
+                          guess_index=guess_index)
+        game.play_game()
+    elif args.boards:
+        # Run a game with any number of boards
+        game = QuordleGame(args.boards, word_list, feedback=feedback,
+                           strategy=make_multi_board_strategy(args.strategy, feedback),
+                           hard_mode=args.hard, guess_index=guess_index)
         game.play_game()
     else:
         print("Please provide a solution for Wordle (--solution) or four solutions for Quordle (--s1, --s2, --s3, --s4).")
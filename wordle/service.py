@@ -0,0 +1,375 @@
+"""
+Long-lived solver service for games whose feedback arrives over time.
+
+The service loads the word list, feedback table, candidate index and strategy
+once, then answers line-based requests on stdin or on a local socket.  Every
+connection is its own game session; all sessions share the same read-only
+precomputed data and, for the entropy strategy, the same remembered
+decisions, so after warm-up most replies are a mask update and a dictionary
+lookup.
+
+Protocol (one request per line, one reply per line):
+
+  CRANE 00102   the guess played and the score it received; replies with
+                the next suggestion and the number of candidates left,
+                e.g. "SOLID 12", or "solved 3" once the score is 22222
+  suggest       the current suggestion, in the same format
+  candidates    the remaining candidates, space-separated
+  new           starts a new game in this session
+  quit          ends the session
+
+Malformed requests get a reply starting with "error:" and leave the game as
+it was.
+
+Callers serving many players from one event loop can instead pass whole game
+states to `SolverService.suggest_many`, which answers a batch at once.
+
+When started from a word list file, the service checks that file before each
+new game or batch.  If wordle/update.py has published a new version, the
+service switches to it: the new feedback table is already cached, and the
+candidate index is patched rather than rebuilt.  Games in progress finish on
+the version they started with.
+
+Usage:
+  python wordle/service.py --strategy entropy
+  python wordle/service.py --socket /tmp/wordle.sock
+  python wordle/service.py --port 8765
+"""
+
+import argparse
+import asyncio
+import os
+import socketserver
+import sys
+import threading
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.cache import DEFAULT_MAXSIZE, LRUCache, canonical_state
+    from wordle.candidates import CandidateIndex
+    from wordle.feedback import load_feedback_matrix
+    from wordle.strategies import STRATEGY_NAMES, make_strategy
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list, word_list_stamp
+except ImportError:
+    from cache import DEFAULT_MAXSIZE, LRUCache, canonical_state
+    from candidates import CandidateIndex
+    from feedback import load_feedback_matrix
+    from strategies import STRATEGY_NAMES, make_strategy
+    from wordlist import DEFAULT_WORD_LIST, load_word_list, word_list_stamp
+
+
+class Session:
+    """
+    One game in progress against an unknown solution.
+
+    Offers the same `candidates`/`candidate_ids`, `index`, `used_guesses` and
+    `history` as WordleGame, so any strategy can choose its guesses.
+    """
+
+    def __init__(self, index: CandidateIndex, strategy):
+        self.index = index
+        self.strategy = strategy
+        self.reset()
+
+    def reset(self):
+        self.candidate_ids = self.index.all_ids()
+        self.used_guesses = set()
+        self.history = []
+        self.solved = False
+
+    @property
+    def candidates(self) -> List[str]:
+        return self.index.words_at(self.candidate_ids)
+
+    @property
+    def guess_count(self) -> int:
+        return len(self.history)
+
+    def suggest(self) -> str:
+        return self.strategy.choose(self)
+
+    def update(self, guess: str, score: str):
+        """Applies the score a guess received; raises ValueError if it is malformed."""
+        candidate_ids = self.index.filter(guess, score, self.candidate_ids)
+        guess = guess.upper()
+        self.used_guesses.add(guess)
+        self.history.append((guess, score))
+        self.candidate_ids = candidate_ids
+        self.solved = score == "2" * self.index.length
+
+
+class _Snapshot:
+    """Everything derived from one version of the word list, swapped as a unit."""
+
+    def __init__(self, index: CandidateIndex, feedback, strategy, suggestions: LRUCache):
+        self.index = index
+        self.feedback = feedback
+        self.strategy = strategy
+        self.suggestions = suggestions
+
+
+class SolverService:
+    """
+    The shared, read-only state of the service and its request handling.
+
+    Deterministic strategies are shared by all sessions; the random strategy
+    gets its own instance per session.  Their suggestions are also remembered
+    per game state in `suggestions`, an LRUCache of `cache_size` entries.
+
+    With `word_list_path`, `refresh` reloads the list when that file changes.
+    """
+
+    def __init__(self, word_list: List[str], strategy_name: str = "entropy", feedback=None,
+                 cache_size: int = DEFAULT_MAXSIZE, word_list_path: str = None,
+                 cache_dir: str = None):
+        self.strategy_name = strategy_name
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.word_list_path = word_list_path
+        self._stamp = word_list_stamp(word_list_path) if word_list_path else None
+        self._refresh_lock = threading.Lock()
+        self._state = self._snapshot(CandidateIndex(word_list), feedback)
+
+    def _snapshot(self, index: CandidateIndex, feedback=None) -> _Snapshot:
+        if feedback is None and self.strategy_name != "random":
+            feedback = load_feedback_matrix(index.words, cache_dir=self.cache_dir)
+        strategy = None
+        if self.strategy_name != "random":
+            strategy = make_strategy(self.strategy_name, feedback)
+        return _Snapshot(index, feedback, strategy, LRUCache(self.cache_size))
+
+    @property
+    def index(self) -> CandidateIndex:
+        return self._state.index
+
+    @property
+    def feedback(self):
+        return self._state.feedback
+
+    @property
+    def suggestions(self) -> LRUCache:
+        return self._state.suggestions
+
+    def refresh(self) -> bool:
+        """
+        Switches to the word list file's current version if it has changed
+        since it was loaded, and returns whether it did.  A list that cannot
+        be read leaves the service on the version it has.
+        """
+        if self.word_list_path is None:
+            return False
+        try:
+            if word_list_stamp(self.word_list_path) == self._stamp:
+                return False
+        except OSError:
+            return False
+        with self._refresh_lock:
+            try:
+                stamp = word_list_stamp(self.word_list_path)
+                if stamp == self._stamp:
+                    return False  # Another thread switched already
+                words = load_word_list(self.word_list_path, self.cache_dir)
+                state = self._snapshot(self._state.index.updated(words))
+            except (OSError, ValueError):
+                return False
+            # One assignment, so every reader sees either the old or the new state
+            self._state = state
+            self._stamp = stamp
+            return True
+
+    def new_session(self) -> Session:
+        self.refresh()
+        return self._session(self._state)
+
+    def _session(self, state: _Snapshot) -> Session:
+        strategy = state.strategy
+        if strategy is None:
+            strategy = make_strategy(self.strategy_name, state.feedback)
+        return Session(state.index, strategy)
+
+    def warm_up(self):
+        """Computes the opening suggestion so that the first request is fast."""
+        self.new_session().suggest()
+
+    async def suggest_many(self, states, return_exceptions: bool = False) -> list:
+        """
+        Suggests the next guess for each game state, given as its history of
+        (guess, score) pairs; states whose last score is 22222 get None.
+
+        The batch runs in a worker thread so the event loop stays responsive.
+        A malformed state raises its ValueError, or with return_exceptions
+        the error is returned in that state's place.
+        """
+        return await asyncio.to_thread(self.suggest_batch, states, return_exceptions)
+
+    def suggest_batch(self, states, return_exceptions: bool = False) -> list:
+        """
+        Synchronous version of suggest_many.  Identical states are answered
+        once, and states sharing a prefix of their history filter that prefix
+        only once.
+        """
+        self.refresh()
+        state = self._state  # The whole batch uses one version of the word list
+        keys = [canonical_state(history) for history in states]
+        prefixes = {(): state.index.all_ids()}
+        answers = {key: self._suggest_state(state, key, prefixes) for key in dict.fromkeys(keys)}
+
+        results = [answers[key] for key in keys]
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, ValueError):
+                    raise result
+        return results
+
+    def _suggest_state(self, state: _Snapshot, key: tuple, prefixes: dict):
+        if key and key[-1][1] == "2" * state.index.length:
+            return None
+        # Only deterministic strategies always give the same answer for a state
+        cacheable = state.strategy is not None
+        if cacheable:
+            guess = state.suggestions.get(key)
+            if guess is not None:
+                return guess
+
+        session = self._session(state)
+        try:
+            session.candidate_ids = self._candidates_for(state.index, key, prefixes)
+            session.used_guesses = {guess for guess, _ in key}
+            session.history = list(key)
+            guess = session.suggest()
+        except ValueError as e:
+            return e
+        if cacheable:
+            state.suggestions.put(key, guess)
+        return guess
+
+    def _candidates_for(self, index: CandidateIndex, key: tuple, prefixes: dict):
+        # Start from the longest prefix of the history filtered so far
+        known = len(key)
+        while key[:known] not in prefixes:
+            known -= 1
+        ids = prefixes[key[:known]]
+        for n in range(known, len(key)):
+            guess, score = key[n]
+            ids = index.filter(guess, score, ids)
+            prefixes[key[:n + 1]] = ids
+        return ids
+
+    def handle(self, session: Session, line: str) -> str:
+        """Returns the reply to one request line (None for quit)."""
+        parts = line.split()
+        if not parts:
+            return "error: empty request"
+        command = parts[0].lower()
+        if len(parts) == 1 and command == "quit":
+            return None
+        if len(parts) == 1 and command == "new":
+            fresh = self.new_session()  # Picks up a newly published word list
+            session.index, session.strategy = fresh.index, fresh.strategy
+            session.reset()
+            return self._suggestion(session)
+        if len(parts) == 1 and command == "suggest":
+            return self._suggestion(session)
+        if len(parts) == 1 and command == "candidates":
+            return " ".join(session.candidates)
+        if len(parts) == 2:
+            if session.solved:
+                return "error: the game is solved; send 'new' to start another"
+            try:
+                session.update(parts[0], parts[1])
+            except ValueError as e:
+                return f"error: {e}"
+            return self._suggestion(session)
+        return f"error: unknown request '{line.strip()}'"
+
+    def _suggestion(self, session: Session) -> str:
+        if session.solved:
+            return f"solved {session.guess_count}"
+        try:
+            guess = session.suggest()
+        except ValueError as e:
+            return f"error: {e}"
+        return f"{guess} {len(session.candidate_ids)}"
+
+    def serve_stream(self, infile, outfile):
+        """Serves one session over a pair of text streams until EOF or quit."""
+        session = self.new_session()
+        for line in infile:
+            reply = self.handle(session, line)
+            if reply is None:
+                break
+            outfile.write(reply + "\n")
+            outfile.flush()
+
+    def make_server(self, socket_path: str = None, port: int = None):
+        """
+        Returns a threaded socketserver serving one session per connection,
+        on a Unix socket or on a TCP port of localhost.
+        """
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                infile = (line.decode("utf-8", "replace") for line in self.rfile)
+                outfile = _TextWriter(self.wfile)
+                service.serve_stream(infile, outfile)
+
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        else:
+            server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        server.daemon_threads = True
+        return server
+
+
+class _TextWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str):
+        self.wfile.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve solver suggestions for games in progress.")
+    parser.add_argument("--strategy", choices=STRATEGY_NAMES, default="entropy",
+                        help="How the solver picks guesses (default: entropy)")
+    parser.add_argument("--socket", type=str, default=None,
+                        help="Listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--port", type=int, default=None,
+                        help="Listen on this TCP port of localhost instead of stdin/stdout")
+    args = parser.parse_args()
+
+    try:
+        word_list = load_word_list()
+    except Exception as e:
+        print(f"Error loading word list from {DEFAULT_WORD_LIST}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    service = SolverService(word_list, args.strategy, word_list_path=DEFAULT_WORD_LIST)
+    service.warm_up()
+
+    if args.socket is None and args.port is None:
+        service.serve_stream(sys.stdin, sys.stdout)
+        return
+
+    with service.make_server(args.socket, args.port) as server:
+        address = args.socket or f"127.0.0.1:{server.server_address[1]}"
+        print(f"Serving on {address}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    if args.socket is not None and os.path.exists(args.socket):
+        os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
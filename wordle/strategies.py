@@ -0,0 +1,259 @@
+"""
+Guess-selection strategies for WordleGame.
+
+A strategy is any object with a `choose(game)` method that returns the next
+word to guess, given a game with `candidates`/`candidate_ids`, `index` and
+`used_guesses`.  It raises ValueError when there is nothing left to suggest.
+Games in hard mode (`game.hard_mode`) also offer `guess_pool_ids`, the ids in
+`game.guess_index` of the words that may still be played, and strategies
+only pick from those.
+
+  RandomStrategy  - a uniformly random remaining candidate (the baseline)
+  EntropyStrategy - the guess whose feedback splits the remaining candidates
+                    into the most informative buckets
+
+Multi-board games (QuordleGame) use strategies whose `choose(game)` looks at
+all of `game.games` instead:
+
+  FirstBoardStrategy        - a random candidate of the first unsolved board
+  MultiBoardEntropyStrategy - the guess with the most information summed over
+                              every unsolved board
+"""
+
+import random
+
+import numpy as np
+
+try:
+    from wordle.cache import LRUCache
+    from wordle.feedback import FeedbackMatrix, pattern_entropies
+    from wordle.profiling import profiled
+except ImportError:
+    from cache import LRUCache
+    from feedback import FeedbackMatrix, pattern_entropies
+    from profiling import profiled
+
+# Candidate sets whose decisions an EntropyStrategy remembers; a full
+# exhaustive evaluation of the 2309-word list visits a few thousand
+DECISION_CACHE_SIZE = 65536
+
+
+class RandomStrategy:
+    """Picks uniformly at random among the candidates not guessed yet."""
+
+    def __init__(self, rng: random.Random = None):
+        # Defaults to the module-level generator so random.seed() still applies
+        self.rng = rng if rng is not None else random
+
+    def choose(self, game) -> str:
+        available_candidates = [c for c in game.candidates if c not in game.used_guesses]
+        if not available_candidates:
+            raise ValueError("No more candidate words to suggest.")
+        return self.rng.choice(available_candidates)
+
+
+class EntropyStrategy:
+    """
+    Picks the guess that maximizes the expected information of its feedback.
+
+    For every guess in the feedback matrix the remaining candidates are
+    bucketed by the pattern they would produce, and the guess with the highest
+    bucket entropy wins.  Ties go to guesses that could still be the solution.
+    The matrix's solution list must contain every word of the game's list.
+
+    The choice depends only on the candidate set, so decisions are remembered
+    per set, in an LRUCache of `cache_size` sets, and games that share a
+    strategy reuse each other's work.  A strategy may be shared by threads.
+    """
+
+    def __init__(self, feedback: FeedbackMatrix, cache_size: int = DECISION_CACHE_SIZE):
+        self.feedback = feedback
+        # Solution column of each guess row, or -1 if the guess is not a solution
+        self._guess_columns = np.array(
+            [feedback.solution_index.get(w, -1) for w in feedback.guesses], dtype=np.intp
+        )
+        # (index, its mapping) pairs, each replaced in a single assignment so
+        # another thread never sees an index with the mapping of a different one
+        self._index_columns = (None, None)
+        self._guess_index_rows = (None, None)
+        self.decisions = LRUCache(cache_size)
+
+    def choose(self, game) -> str:
+        return self.best_guess(self._columns(game), game.used_guesses, self._allowed_rows(game))
+
+    def best_guess(self, columns: np.ndarray, used_guesses=(), rows: np.ndarray = None) -> str:
+        """
+        Returns the best guess for the candidates at the given (sorted)
+        solution columns of the matrix, never repeating a used guess.  If
+        `rows` is given only those guess rows may be picked.
+        """
+        if len(columns) == 0:
+            raise ValueError("No more candidate words to suggest.")
+
+        key = columns.tobytes() if rows is None else (columns.tobytes(), rows.tobytes())
+        guess = self.decisions.get(key)
+        if guess is None:
+            guess = self._compute_best_guess(columns, (), rows)
+            self.decisions.put(key, guess)
+        if guess in used_guesses:
+            # Only this game has to avoid it; the remembered decision stays
+            guess = self._compute_best_guess(columns, used_guesses, rows)
+        return guess
+
+    @profiled(size=lambda self, columns, *args: len(columns))
+    def _compute_best_guess(self, columns: np.ndarray, used_guesses, rows=None) -> str:
+        if rows is None:
+            scores = pattern_entropies(self.feedback.patterns[:, columns],
+                                       self.feedback.num_patterns)
+        else:
+            scores = np.full(len(self.feedback.guesses), -np.inf)
+            scores[rows] = pattern_entropies(self.feedback.patterns[np.ix_(rows, columns)],
+                                             self.feedback.num_patterns)
+        for guess in used_guesses:
+            row = self.feedback.guess_index.get(guess.upper())
+            if row is not None:
+                scores[row] = -np.inf
+
+        best = np.flatnonzero(scores >= scores.max() - 1e-9)
+        if not np.isfinite(scores[best[0]]):
+            raise ValueError("No more candidate words to suggest.")
+        in_play = np.isin(self._guess_columns[best], columns)
+        row = best[in_play][0] if in_play.any() else best[0]
+        return self.feedback.guesses[row]
+
+    def _columns(self, game) -> np.ndarray:
+        """Maps the game's candidate ids to solution columns of the matrix."""
+        index, columns = self._index_columns
+        if game.index is not index:
+            index, columns = game.index, self.feedback.solution_columns(game.index.words)
+            self._index_columns = (index, columns)
+        return columns[game.candidate_ids]
+
+    def _allowed_rows(self, game):
+        """The guess rows a hard-mode game may still play, or None for any."""
+        if not getattr(game, "hard_mode", False):
+            return None
+        guess_index, index_rows = self._guess_index_rows
+        if game.guess_index is not guess_index:
+            guess_index = game.guess_index
+            index_rows = np.array(
+                [self.feedback.guess_index.get(w.upper(), -1) for w in guess_index.words],
+                dtype=np.intp,
+            )
+            self._guess_index_rows = (guess_index, index_rows)
+        rows = index_rows[game.guess_pool_ids]
+        return rows[rows >= 0]
+
+
+class FirstBoardStrategy:
+    """
+    Multi-board baseline: a random candidate of the first unsolved board that
+    has not been guessed yet, ignoring the other boards.
+    """
+
+    def __init__(self, rng: random.Random = None):
+        self.rng = rng if rng is not None else random
+
+    def choose(self, game) -> str:
+        for board in game.games:
+            if not board.solved:
+                available_candidates = [c for c in board.candidates if c not in game.used_guesses]
+                if not available_candidates:
+                    continue
+                return self.rng.choice(available_candidates)
+        raise ValueError("No more candidate words to suggest across all games.")
+
+
+class MultiBoardEntropyStrategy(EntropyStrategy):
+    """
+    Picks the guess that is most informative across all unsolved boards.
+
+    Each guess is scored by the sum of its bucket entropies on every unsolved
+    board, plus the chance that it solves a board outright (1/k for each board
+    with k candidates that it could be).  Each board's entropies come from
+    the same histogram pass as a single-board decision, computed once for
+    boards with identical candidate sets, so the opening decision costs about
+    as much as on one board and later ones about one pass per unsolved board.
+    Decisions are remembered per combination of candidate sets, like
+    EntropyStrategy does per set.
+    """
+
+    def choose(self, game) -> str:
+        boards = [board for board in game.games if not board.solved]
+        board_columns = [self._columns(board) for board in boards]
+        if not boards or all(len(columns) == 0 for columns in board_columns):
+            raise ValueError("No more candidate words to suggest across all games.")
+
+        rows = self._allowed_rows(game)
+        key = tuple(sorted(columns.tobytes() for columns in board_columns))
+        if rows is not None:
+            key = (key, rows.tobytes())
+        guess = self.decisions.get(key)
+        if guess is None:
+            guess = self._best_joint_guess(board_columns, (), rows)
+            self.decisions.put(key, guess)
+        if guess in game.used_guesses:
+            guess = self._best_joint_guess(board_columns, game.used_guesses, rows)
+        return guess
+
+    @profiled(size=lambda self, board_columns, *args: sum(map(len, board_columns)))
+    def _best_joint_guess(self, board_columns, used_guesses, rows=None) -> str:
+        # Boards with the same candidates (every board, at the start) score alike
+        distinct, counts = {}, {}
+        for columns in board_columns:
+            key = columns.tobytes()
+            distinct[key] = columns
+            counts[key] = counts.get(key, 0) + 1
+
+        patterns = self.feedback.patterns
+        scores = np.full(len(self.feedback.guesses), -np.inf)
+        scores[slice(None) if rows is None else rows] = 0
+        for key, columns in distinct.items():
+            if len(columns) == 0:
+                continue
+            if rows is None:
+                scores += counts[key] * pattern_entropies(patterns[:, columns],
+                                                          self.feedback.num_patterns)
+            else:
+                scores[rows] += counts[key] * pattern_entropies(
+                    patterns[np.ix_(rows, columns)], self.feedback.num_patterns)
+
+        for columns in board_columns:
+            if len(columns):
+                scores[np.isin(self._guess_columns, columns)] += 1 / len(columns)
+
+        for guess in used_guesses:
+            row = self.feedback.guess_index.get(guess.upper())
+            if row is not None:
+                scores[row] = -np.inf
+
+        row = int(np.argmax(scores))
+        if not np.isfinite(scores[row]):
+            raise ValueError("No more candidate words to suggest across all games.")
+        return self.feedback.guesses[row]
+
+
+STRATEGY_NAMES = ["random", "entropy"]
+
+
+def make_strategy(name: str, feedback: FeedbackMatrix = None, rng: random.Random = None):
+    """Creates a strategy by its command-line name."""
+    if name == "random":
+        return RandomStrategy(rng)
+    if name == "entropy":
+        if feedback is None:
+            raise ValueError("The entropy strategy needs a FeedbackMatrix.")
+        return EntropyStrategy(feedback)
+    raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGY_NAMES)}.")
+
+
+def make_multi_board_strategy(name: str, feedback: FeedbackMatrix = None,
+                              rng: random.Random = None):
+    """Creates a multi-board strategy by the same names as make_strategy."""
+    if name == "random":
+        return FirstBoardStrategy(rng)
+    if name == "entropy":
+        if feedback is None:
+            raise ValueError("The entropy strategy needs a FeedbackMatrix.")
+        return MultiBoardEntropyStrategy(feedback)
+    raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGY_NAMES)}.")
@@ -0,0 +1,24 @@
+from wordle.bench import BENCHMARKS, compare_results, run_benchmarks
+from wordle.testutil import WORDS
+
+def test_run_benchmarks_reports_every_benchmark_and_size():
+    document = run_benchmarks(WORDS, sizes=[8, 16], min_time=0.0)
+    results = document["results"]
+    assert len(results) == 2 * len(BENCHMARKS)
+    assert {(r["name"], r["size"]) for r in results} == {
+        (name, size) for name in BENCHMARKS for size in (8, 16)
+    }
+    assert all(r["ops_per_sec"] > 0 and r["peak_memory_bytes"] >= 0 for r in results)
+
+def _document(*results):
+    return {"results": [{"name": n, "size": s, "ops_per_sec": o, "peak_memory_bytes": 0}
+                        for n, s, o in results]}
+
+def test_compare_results_flags_slowdowns_beyond_tolerance():
+    baseline = _document(("score_guess", 100, 1000.0), ("rank_words", 100, 10.0),
+                         ("index_filter", 100, 50.0))
+    current = _document(("score_guess", 100, 850.0), ("rank_words", 100, 5.0),
+                        ("simulate_game", 100, 1.0))
+    regressions = compare_results(current, baseline, tolerance=0.2)
+    assert [(name, size) for name, size, *_ in regressions] == [("rank_words", 100)]
+    assert regressions[0][4] == 0.5
@@ -0,0 +1,57 @@
+import pytest
+from wordle.book import OpeningBook, build_opening_book
+from wordle.evaluator import evaluate_exhaustive, simulate_game
+from wordle.feedback import FeedbackMatrix
+from wordle.scorer import WordleGame, scoreGuess
+from wordle.strategies import EntropyStrategy
+from wordle.testutil import WORDS
+
+@pytest.fixture
+def feedback():
+    return FeedbackMatrix(WORDS)
+
+def test_book_holds_the_strategys_second_and_third_guesses(feedback):
+    book = build_opening_book(feedback, "crane", depth=2)
+    assert book.lookup([]) == "CRANE"
+    for solution in WORDS:
+        game = WordleGame(solution, WORDS, feedback=feedback, strategy=EntropyStrategy(feedback))
+        game.guess_and_update("CRANE")
+        for _ in range(2):
+            if game.solved:
+                break
+            expected = game.suggest_guess()
+            assert book.lookup(game.history) == expected
+            game.guess_and_update(expected)
+
+def test_book_lookup_stops_outside_the_book(feedback):
+    book = build_opening_book(feedback, "CRANE", depth=1)
+    score = scoreGuess("CRANE", "MOTOR")
+    second = book.lookup([("CRANE", score)])
+    assert second is not None
+    assert book.lookup([("SLATE", score)]) is None
+    assert book.lookup([("CRANE", score), (second, scoreGuess(second, "MOTOR"))]) is None
+
+def test_book_round_trips_through_a_file(feedback, tmp_path):
+    book = build_opening_book(feedback, "CRANE", depth=2)
+    path = str(tmp_path / "crane.book")
+    book.save(path)
+    loaded = OpeningBook.load(path)
+    assert loaded.moves == book.moves
+    assert loaded.opener == "CRANE" and loaded.depth == 2
+    assert loaded.matches(feedback) and not loaded.matches(FeedbackMatrix(WORDS[:-1] + ["CRATE"]))
+
+def test_games_with_a_book_play_like_the_strategy(feedback):
+    book = build_opening_book(feedback, "CRANE", depth=2)
+    strategy = EntropyStrategy(feedback)
+    with_book = evaluate_exhaustive(WORDS, feedback=feedback, strategy=strategy, book=book)
+    without = evaluate_exhaustive(WORDS, "CRANE", feedback=feedback,
+                                  strategy=EntropyStrategy(feedback))
+    assert with_book == without
+    assert simulate_game("MOTOR", WORDS, feedback=feedback, strategy=strategy, book=book) == \
+        simulate_game("MOTOR", WORDS, "CRANE", feedback=feedback, strategy=strategy)
+
+def test_build_rejects_unknown_opener_and_depth(feedback):
+    with pytest.raises(ValueError, match="not in the guess list"):
+        build_opening_book(feedback, "ZZZZZ")
+    with pytest.raises(ValueError, match="depth"):
+        build_opening_book(feedback, "CRANE", depth=3)
@@ -0,0 +1,35 @@
+import pytest
+from wordle.cache import LRUCache
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(4)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert cache.get("c", "default") == "default"
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["hit_rate"] == 1 / 3
+    assert stats["size"] == 1 and stats["maxsize"] == 4
+
+def test_lru_cache_put_refreshes_existing_key():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10 and "b" not in cache
+
+def test_lru_cache_rejects_empty_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from wordle.candidates import CandidateIndex, letter_constraints
+from wordle.feedback import FeedbackMatrix
+from wordle.scorer import WordleGame, _candidate_index, filterCandidates, scoreGuess
+from wordle.strategies import EntropyStrategy
+from wordle.testutil import FILTER_WORDS as WORDS
+
+def test_letter_constraints_duplicate_letters():
+    must_be, forbid_at_pos, min_count, max_count = letter_constraints("MUMMY", "20010")
+    assert must_be == ["M", None, None, None, None]
+    assert forbid_at_pos[1] == {"U"} and forbid_at_pos[3] == {"M"}
+    assert min_count == {"M": 2, "U": 0, "Y": 0}
+    assert max_count == {"M": 2, "U": 0, "Y": 0}
+
+def test_filter_returns_indices():
+    index = CandidateIndex(WORDS)
+    ids = index.filter("STARE", "20011")
+    assert ids.dtype == np.intp
+    assert index.words_at(ids) == ["SCREW", "SUPER"]
+
+def test_filter_within_candidate_subset():
+    index = CandidateIndex(WORDS)
+    subset = index.ids(["SUPER", "SAVER", "CIGAR"])
+    assert index.words_at(index.filter("STARE", "20011", subset)) == ["SUPER"]
+
+@pytest.mark.parametrize("guess, solution", [
+    ("CRANE", "SUGAR"), ("ARRAY", "CIGAR"), ("MUMMY", "MADAM"), ("BALMY", "DRAMA"),
+])
+def test_filter_matches_filter_candidates(guess, solution):
+    score = scoreGuess(guess, solution)
+    index = CandidateIndex(WORDS)
+    assert index.words_at(index.filter(guess, score)) == filterCandidates(guess, score, WORDS)
+
+def test_filter_preserves_original_spelling():
+    assert filterCandidates("STARE", "20011", ["screw", "GREAT", "Super"]) == ["screw", "Super"]
+
+def test_filter_candidates_reuses_the_index_of_an_unchanged_list():
+    words = list(WORDS)
+    filterCandidates("STARE", "20011", words)
+    index = _candidate_index(tuple(words))
+    assert filterCandidates("STARE", "20011", words) == ["SCREW", "SUPER"]
+    assert _candidate_index(tuple(words)) is index
+    words.remove("SUPER")  # Edited in place, so filtered with a fresh index
+    assert filterCandidates("STARE", "20011", words) == ["SCREW"]
+
+def test_filter_rejects_invalid_score():
+    with pytest.raises(ValueError, match="Score must only contain characters '0', '1', or '2'."):
+        CandidateIndex(WORDS).filter("STARE", "2001X")
+
+def test_games_share_one_index():
+    index = CandidateIndex(WORDS)
+    game = WordleGame("SUGAR", WORDS, index=index)
+    game.guess_and_update("CIGAR")
+    assert game.index is index
+    assert game.candidates == ["SUGAR"]
+
+def test_filter_code_matches_filter():
+    feedback = FeedbackMatrix(WORDS)
+    index = CandidateIndex(WORDS)
+    for guess in ["CRANE", "MAMMA", "RADAR"]:
+        row = feedback.row(guess)
+        for solution in WORDS:
+            code = feedback.pattern(guess, solution)
+            expected = index.filter(guess, feedback.score(guess, solution))
+            assert index.filter_code(row, code).tolist() == expected.tolist()
+
+def test_filter_code_maps_columns():
+    feedback = FeedbackMatrix(WORDS)
+    index = CandidateIndex(["SUGAR", "CRANE", "CIGAR"])
+    columns = index.feedback_columns(feedback)
+    assert columns.tolist() == feedback.solution_columns(["SUGAR", "CRANE", "CIGAR"]).tolist()
+    ids = index.filter_code(feedback.row("RADAR"), feedback.pattern("RADAR", "CIGAR"),
+                            columns=columns)
+    assert index.words_at(ids) == ["SUGAR", "CIGAR"]
+
+def test_feedback_columns_is_none_for_words_outside_the_matrix():
+    index = CandidateIndex(WORDS + ["SLATE"])
+    assert index.feedback_columns(FeedbackMatrix(WORDS)) is None
+
+def test_game_with_feedback_matches_string_scoring():
+    feedback = FeedbackMatrix(WORDS)
+    index = CandidateIndex(WORDS)
+    for solution in ["SUGAR", "MADAM", "CRANE"]:
+        with_table = WordleGame(solution, WORDS, feedback=feedback, index=index)
+        plain = WordleGame(solution, WORDS, index=index)
+        for guess in ["RADAR", "MAMMA", "SCRAM"]:
+            assert with_table.guess_and_update(guess) == plain.guess_and_update(guess)
+            assert with_table.candidates == plain.candidates
+
+def test_filter_hard_keeps_greens_and_revealed_letters():
+    index = CandidateIndex(WORDS)
+    # S green, E and R yellow: grays and yellow positions do not matter
+    assert index.words_at(index.filter_hard("STARE", "20011")) == ["SCREW", "SUPER", "SAVER"]
+
+def test_filter_hard_is_incremental():
+    index = CandidateIndex(WORDS)
+    pool = index.filter_hard("CRANE", "01100")
+    pool = index.filter_hard("SOLAR", "00022", pool)
+    assert index.words_at(pool) == ["CIGAR", "SOLAR", "RADAR", "SUGAR"]
+
+def test_hard_mode_game_rejects_guesses_ignoring_hints():
+    game = WordleGame("SUGAR", WORDS, hard_mode=True)
+    game.guess_and_update("CRANE")
+    assert not game.allows("MADAM") and game.allows("RADAR")
+    with pytest.raises(ValueError, match="hard mode"):
+        game.guess_and_update("MADAM")
+    assert [guess for guess, _ in game.history] == ["CRANE"]
+
+def test_hard_mode_entropy_guesses_stay_in_the_pool():
+    feedback = FeedbackMatrix(WORDS)
+    strategy = EntropyStrategy(feedback)
+    for solution in WORDS:
+        game = WordleGame(solution, WORDS, feedback=feedback, strategy=strategy, hard_mode=True)
+        while not game.solved:
+            guess = game.suggest_guess()
+            assert game.allows(guess)
+            game.guess_and_update(guess)
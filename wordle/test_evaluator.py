@@ -1,6 +1,21 @@
 import pytest
 from unittest.mock import patch
-from wordle.evaluator import simulate_game, evaluate_strategy
+from wordle.evaluator import (
+    simulate_game, evaluate_strategy, simulate_games_parallel, evaluate_parallel,
+    summarize_results, evaluate_exhaustive, simulate_multi_game, evaluate_multi_board,
+    summarize_multi_results,
+)
+from wordle.cache import LRUCache
+from wordle.candidates import CandidateIndex
+from wordle.feedback import FeedbackMatrix
+from wordle.scorer import QuordleGame, WordleGame
+from wordle.strategies import EntropyStrategy, make_multi_board_strategy
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    # The sharded runner loads the feedback table from the cache in each worker
+    monkeypatch.setenv("WORDLE_CACHE_DIR", str(tmp_path))
+    return tmp_path
 
 def test_simulate_game_first_guess_correct():
     """Test that if the first guess is correct, it returns 1."""
@@ -56,3 +71,143 @@ def test_simulate_game_with_provided_first_guess():
         assert guesses == 3
         # suggest_guess should have been called twice (for APPLE and CRANE)
         assert mock_suggest.call_count == 2
+
+def test_simulate_games_parallel_is_reproducible_across_worker_counts(cache_dir):
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    solutions = word_list * 10
+
+    serial = simulate_games_parallel(word_list, solutions, workers=1, seed=3)
+    parallel = simulate_games_parallel(word_list, solutions, workers=2, seed=3)
+
+    assert serial == parallel
+    assert list(cache_dir.glob("feedback-*.npy"))
+    assert len(serial) == len(solutions)
+    assert all(1 <= guesses <= len(word_list) for guesses in serial)
+
+def test_evaluate_parallel_with_first_guess(cache_dir):
+    word_list = ["APPLE", "BANAL", "CRANE"]
+    avg = evaluate_parallel(word_list, 6, first_guess="APPLE", workers=2, seed=1)
+    assert 1.0 <= avg <= 3.0
+
+def test_summarize_results():
+    summary = summarize_results([1, 3, 3, 7, 4])
+    assert summary["games"] == 5
+    assert summary["mean"] == 3.6
+    assert summary["max"] == 7
+    assert summary["failures"] == 1
+    assert summary["distribution"] == {1: 1, 3: 2, 4: 1, 7: 1}
+
+def test_evaluate_exhaustive_plays_each_solution_once():
+    word_list = ["APPLE", "BANAL", "CRANE"]
+    with patch('wordle.evaluator.simulate_game', return_value=2) as mock_simulate:
+        summary = evaluate_exhaustive(word_list, first_guess="APPLE")
+    solutions = [call.args[0] for call in mock_simulate.call_args_list]
+    assert solutions == word_list
+    assert summary["games"] == 3 and summary["mean"] == 2.0
+
+def test_evaluate_exhaustive_with_entropy_strategy_is_deterministic():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    feedback = FeedbackMatrix(word_list)
+    first = evaluate_exhaustive(word_list, feedback=feedback, strategy=EntropyStrategy(feedback))
+    second = evaluate_exhaustive(word_list, feedback=feedback, strategy=EntropyStrategy(feedback))
+    assert first == second
+    assert first["games"] == len(word_list)
+    assert first["failures"] == 0
+
+def test_simulate_multi_game_is_quiet_and_solves_every_board(capsys):
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    feedback = FeedbackMatrix(word_list)
+    won, guesses, solved = simulate_multi_game(["CRANE", "CIGAR"], word_list, feedback=feedback,
+                                               strategy=make_multi_board_strategy("entropy", feedback))
+    assert won and solved == 2
+    assert 2 <= guesses <= 7
+    assert capsys.readouterr().out == ""
+
+def test_simulate_multi_game_stops_at_max_guesses():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    won, guesses, solved = simulate_multi_game(["CRANE", "CIGAR", "REACT"], word_list,
+                                               first_guess="APPLE", max_guesses=1)
+    assert not won and guesses == 1 and solved == 0
+
+def test_summarize_multi_results():
+    summary = summarize_multi_results([(True, 6, 4), (False, 9, 3), (True, 8, 4)], 4)
+    assert summary["games"] == 3 and summary["wins"] == 2
+    assert summary["win_rate"] == 2 / 3
+    assert summary["mean"] == 7.0
+    assert summary["mean_boards_solved"] == 11 / 3
+    assert summary["distribution"] == {6: 1, 8: 1}
+
+def test_evaluate_multi_board_is_reproducible_across_worker_counts(cache_dir):
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    serial = evaluate_multi_board(word_list, 3, 40, workers=1, seed=5)
+    parallel = evaluate_multi_board(word_list, 3, 40, workers=2, seed=5)
+    for key in ("games", "wins", "mean", "distribution"):
+        assert serial[key] == parallel[key]
+    assert serial["games"] == 40
+    assert serial["games_per_sec"] > 0
+
+def test_filter_cache_reuses_candidate_sets_by_history():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    feedback = FeedbackMatrix(word_list)
+    index = CandidateIndex(word_list)
+    cache = LRUCache(64)
+    strategy = EntropyStrategy(feedback)
+
+    uncached = [simulate_game(s, word_list, "SLATE", feedback=feedback, index=index,
+                              strategy=strategy) for s in word_list]
+    cached = [simulate_game(s, word_list, "SLATE", feedback=feedback, index=index,
+                            strategy=strategy, filter_cache=cache) for s in word_list * 2]
+    assert cached == uncached * 2
+    stats = cache.stats()
+    assert stats["misses"] == stats["size"]
+    assert stats["hits"] + stats["misses"] == 2 * sum(uncached)
+    assert stats["hits"] >= sum(uncached)
+
+def test_filter_cache_is_not_used_for_partial_word_lists():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE"]
+    index = CandidateIndex(word_list)
+    cache = LRUCache(8)
+    game = WordleGame("CRANE", word_list[1:], index=index, filter_cache=cache)
+    game.guess_and_update("SLATE")
+    assert game.filter_cache is None and len(cache) == 0
+
+def test_cached_candidate_sets_are_read_only():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE"]
+    cache = LRUCache(8)
+    game = WordleGame("CRANE", word_list, filter_cache=cache)
+    game.guess_and_update("SLATE")
+    assert not game.candidate_ids.flags.writeable
+
+def test_hard_mode_multi_board_guesses_use_one_boards_hints():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    game = QuordleGame(["CRANE", "APPLE"], word_list, hard_mode=True)
+    game.guess_and_update("SLATE")
+    pools = [set(board.candidates) for board in game.games]
+    assert set(game.index.words_at(game.guess_pool_ids)) >= pools[0] | pools[1]
+    with pytest.raises(ValueError, match="hard mode"):
+        game.guess_and_update("BANAL")
+
+def test_evaluate_multi_board_hard_mode(cache_dir):
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    summary = evaluate_multi_board(word_list, 2, 20, strategy_name="entropy", seed=1,
+                                   hard_mode=True)
+    assert summary["games"] == 20 and summary["wins"] > 0
+
+def test_simulate_game_with_separate_guess_list():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE", "STALE", "CIGAR", "REACT"]
+    guesses = ["CHOMP", "FIGHT", "BLURT"] + word_list
+    feedback = FeedbackMatrix(guesses, word_list)
+    strategy = EntropyStrategy(feedback)
+    guess_index = CandidateIndex(guesses)
+    for hard_mode in (False, True):
+        summary = evaluate_exhaustive(word_list, feedback=feedback, strategy=strategy,
+                                      hard_mode=hard_mode, guess_index=guess_index)
+        assert summary["games"] == len(word_list) and summary["failures"] == 0
+
+def test_hard_mode_pool_covers_the_guess_list():
+    word_list = ["APPLE", "BANAL", "CRANE", "SLATE"]
+    guess_index = CandidateIndex(["CHOMP", "PLATE"] + word_list)
+    game = WordleGame("SLATE", word_list, hard_mode=True, guess_index=guess_index)
+    game.guess_and_update("CRANE")
+    assert guess_index.words_at(game.guess_pool_ids) == ["PLATE", "CRANE", "SLATE"]
+    assert game.allows("PLATE") and not game.allows("CHOMP")
@@ -0,0 +1,34 @@
+import pytest
+from wordle.export import NO_PARENT, export_web_artifact, read_web_artifact
+from wordle.feedback import FeedbackMatrix, decode_score
+from wordle.scorer import scoreGuess
+from wordle.strategies import EntropyStrategy
+from wordle.testutil import WORDS
+from wordle.tree import TreeBuilder
+
+@pytest.fixture
+def artifact():
+    feedback = FeedbackMatrix(WORDS)
+    tree = TreeBuilder(feedback, EntropyStrategy(feedback)).build("CRANE")
+    return tree, read_web_artifact(export_web_artifact(tree, WORDS))
+
+def test_artifact_replays_the_tree_with_the_scorers_scores(artifact):
+    tree, data = artifact
+    assert data["words"] == WORDS
+    assert data["parent"][0] == NO_PARENT and data["candidates"][0] == len(WORDS)
+    counts = tree.guess_counts()
+    for word_id, solution in enumerate(WORDS):
+        (node,) = [n for n in range(len(data["guess"]))
+                   if data["solves"][n] and data["guess"][n] == word_id]
+        path = [node]
+        while data["parent"][path[-1]] != NO_PARENT:
+            path.append(int(data["parent"][path[-1]]))
+        path.reverse()
+        assert len(path) == counts[solution]
+        for parent, child in zip(path, path[1:]):
+            guess = WORDS[data["guess"][parent]]
+            assert decode_score(int(data["code"][child])) == scoreGuess(guess, solution)
+
+def test_artifact_rejects_other_data():
+    with pytest.raises(ValueError, match="supported version"):
+        read_web_artifact(b"\0" * 64)
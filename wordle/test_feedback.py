@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+import pytest
+from wordle.feedback import (
+    FeedbackMatrix, encode_score, decode_score, compute_patterns, encode_words,
+    NUM_PATTERNS, SOLVED_PATTERN, cache_key, load_feedback_matrix, entropies,
+    pattern_entropies, pattern_histograms, prune_cache, sorted_entropies,
+)
+from wordle.scorer import scoreGuess
+from wordle.ranker import score_word, rank_words
+from wordle.testutil import WORDS as SHARED_WORDS
+
+WORDS = SHARED_WORDS[:-1] + ["MAMMA"]  # MAMMA for repeated-letter scores
+
+def test_encode_decode_round_trip():
+    for code in range(NUM_PATTERNS):
+        assert encode_score(decode_score(code)) == code
+    assert encode_score("00000") == 0
+    assert encode_score("20011") == 166
+    assert encode_score("22222") == SOLVED_PATTERN
+
+@pytest.mark.parametrize("score", ["2001", "2001X", "222222"])
+def test_encode_invalid_score(score):
+    with pytest.raises(ValueError):
+        encode_score(score)
+
+def test_encode_words_rejects_invalid_word():
+    with pytest.raises(ValueError):
+        encode_words(["APPL3"])
+
+def test_matrix_matches_score_guess():
+    matrix = FeedbackMatrix(WORDS, chunk_size=3)
+    assert matrix.shape == (len(WORDS), len(WORDS))
+    for guess in WORDS:
+        for solution in WORDS:
+            assert matrix.score(guess, solution) == scoreGuess(guess, solution)
+
+def test_rectangular_matrix():
+    matrix = FeedbackMatrix(["ARRAY", "SHEET"], ["CIGAR", "STEEL", "ARRAY"])
+    assert matrix.shape == (2, 3)
+    assert matrix.score("array", "cigar") == "01020"
+    assert matrix.pattern("SHEET", "STEEL") == encode_score("20221")
+
+def test_pattern_outside_matrix_is_computed():
+    matrix = FeedbackMatrix(["CIGAR"])
+    assert matrix.score("ALLEY", "BELLE") == "01210"
+
+def test_compute_patterns_shape_and_dtype():
+    letters = encode_words(WORDS)
+    patterns = compute_patterns(letters, letters[:4])
+    assert patterns.shape == (len(WORDS), 4)
+    assert patterns.dtype == np.uint8
+    assert (np.diag(patterns) == SOLVED_PATTERN).all()
+
+def test_ranker_lookup_matches_direct_scoring():
+    matrix = FeedbackMatrix(WORDS)
+    for word in WORDS:
+        assert score_word(word, WORDS, feedback=matrix) == score_word(word, WORDS)
+    ranked = rank_words(WORDS)
+    assert ranked == sorted(((w, score_word(w, WORDS)) for w in WORDS),
+                            key=lambda x: x[1], reverse=True)
+
+def test_load_feedback_matrix_builds_then_memory_maps(tmp_path):
+    first = load_feedback_matrix(WORDS, cache_dir=str(tmp_path))
+    cached = list(tmp_path.glob("feedback-*.npy"))
+    assert len(cached) == 1
+
+    second = load_feedback_matrix(WORDS, cache_dir=str(tmp_path))
+    assert isinstance(second.patterns, np.memmap)
+    assert not second.patterns.flags.writeable
+    assert (second.patterns == first.patterns).all()
+
+def test_load_feedback_matrix_rebuilds_stale_cache(tmp_path):
+    original = load_feedback_matrix(WORDS, cache_dir=str(tmp_path))
+
+    changed = WORDS[:-1] + ["CRANE"]
+    matrix = load_feedback_matrix(changed, cache_dir=str(tmp_path))
+    assert cache_key(changed) != cache_key(WORDS)
+    assert matrix.score("CRANE", "REACT") == scoreGuess("CRANE", "REACT")
+    assert len(list(tmp_path.glob("feedback-*.npy"))) == 2
+    assert load_feedback_matrix(WORDS, cache_dir=str(tmp_path)).shape == original.shape
+
+def test_load_feedback_matrix_recovers_from_corrupt_cache(tmp_path):
+    path = tmp_path / f"feedback-{cache_key(WORDS)[:16]}.npy"
+    path.write_bytes(b"not a numpy file")
+    matrix = load_feedback_matrix(WORDS, cache_dir=str(tmp_path))
+    assert matrix.score("SLATE", "STALE") == "21212"
+
+def test_prune_cache_keeps_the_most_recently_used_files_of_each_kind(tmp_path):
+    for n in range(5):
+        for kind in ("feedback", "totals"):
+            path = tmp_path / f"{kind}-{n:016x}.npy"
+            path.write_bytes(b"")
+            os.utime(path, ns=(n * 10**9, n * 10**9))
+    (tmp_path / "notes.txt").write_text("not a cache file")
+    keep = str(tmp_path / f"feedback-{0:016x}.npy")
+
+    removed = prune_cache(str(tmp_path), max_entries=3, keep=[keep])
+    assert len(removed) == 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"feedback-{0:016x}.npy", f"feedback-{3:016x}.npy", f"feedback-{4:016x}.npy",
+        "notes.txt", f"totals-{2:016x}.npy", f"totals-{3:016x}.npy", f"totals-{4:016x}.npy",
+    ]
+
+def test_loading_other_lists_keeps_their_caches(tmp_path):
+    load_feedback_matrix(WORDS, cache_dir=str(tmp_path))
+    load_feedback_matrix(WORDS[:8], WORDS[8:], cache_dir=str(tmp_path))
+    load_feedback_matrix(["CRANE", "SLATE"], cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("feedback-*.npy"))) == 3
+
+@pytest.mark.parametrize("columns", [0, 1, 2, 7, 60])
+def test_sorted_entropies_match_histogram_entropies(columns):
+    rng = np.random.default_rng(columns)
+    patterns = rng.integers(0, 6, size=(40, columns)).astype(np.uint8)
+    expected = entropies(pattern_histograms(patterns)) if columns else np.zeros(40)
+    assert np.allclose(sorted_entropies(patterns), expected, atol=1e-12)
+    assert np.allclose(pattern_entropies(patterns), expected, atol=1e-12)
+
+LONG_WORDS = ["BANANA", "ANANAS", "CASTLE", "CATTLE", "SETTLE", "LATTES", "TASSEL", "STEALS"]
+
+def test_longer_words_use_wider_pattern_codes():
+    matrix = FeedbackMatrix(LONG_WORDS, chunk_size=3)
+    assert matrix.length == 6 and matrix.num_patterns == 729
+    assert matrix.patterns.dtype == np.uint16
+    for guess in LONG_WORDS:
+        for solution in LONG_WORDS:
+            assert matrix.score(guess, solution) == scoreGuess(guess, solution, 6)
+    assert matrix.pattern("CASTLE", "CASTLE") == matrix.solved_pattern == encode_score("222222", 6)
+    assert decode_score(encode_score("201120", 6), 6) == "201120"
+    assert score_word("CASTLE", LONG_WORDS, feedback=matrix) == score_word("CASTLE", LONG_WORDS)
+    assert FeedbackMatrix(["SEEN", "NEST"]).patterns.dtype == np.uint8
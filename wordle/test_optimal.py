@@ -0,0 +1,90 @@
+import functools
+import sys
+
+import pytest
+from wordle.feedback import FeedbackMatrix, SOLVED_PATTERN
+from wordle.optimal import OptimalSolver
+from wordle.strategies import EntropyStrategy
+from wordle.testutil import WORDS, write_word_list
+from wordle.tree import TreeBuilder
+
+# A family of near-identical words that no single guess can tell apart
+HARD = ["BATCH", "CATCH", "HATCH", "LATCH", "MATCH", "PATCH", "WATCH",
+        "BIGHT", "EIGHT", "FIGHT", "LIGHT", "MIGHT", "NIGHT", "RIGHT", "SIGHT", "TIGHT"]
+
+@pytest.fixture
+def feedback():
+    return FeedbackMatrix(WORDS + HARD)
+
+def brute_force_total(feedback, columns):
+    """Fewest total guesses, trying every guess for every candidate set."""
+    @functools.lru_cache(maxsize=None)
+    def cost(columns):
+        if len(columns) == 1:
+            return 1
+        best = None
+        for row in range(len(feedback.guesses)):
+            buckets = {}
+            for column in columns:
+                code = feedback.patterns[row, column]
+                if code != SOLVED_PATTERN:
+                    buckets.setdefault(code, []).append(column)
+            if list(buckets.values()) == [list(columns)]:
+                continue
+            total = len(columns) + sum(cost(tuple(b)) for b in buckets.values())
+            best = total if best is None else min(best, total)
+        return best
+    return cost(tuple(columns))
+
+def test_solver_matches_brute_force(feedback):
+    for solutions in [WORDS, HARD, WORDS[:6] + HARD[:6]]:
+        solver = OptimalSolver(feedback)
+        result = solver.solve(solutions=solutions)
+        assert result["complete"]
+        assert result["total"] == brute_force_total(
+            feedback, sorted(feedback.solution_columns(solutions)))
+
+def test_optimal_tree_beats_or_ties_the_entropy_tree(feedback):
+    solver = OptimalSolver(feedback)
+    result = solver.solve(opener="CRANE")
+    counts = solver.tree("CRANE").guess_counts()
+    assert sorted(counts) == sorted(WORDS + HARD)
+    assert sum(counts.values()) == result["total"]
+    greedy = TreeBuilder(feedback, EntropyStrategy(feedback)).build("CRANE").guess_counts()
+    assert result["total"] <= sum(greedy.values())
+
+def test_budget_stops_search_and_checkpoint_resumes(feedback, tmp_path):
+    path = str(tmp_path / "search.npz")
+    stopped = OptimalSolver(feedback, max_nodes=50, checkpoint=path).solve()
+    assert not stopped["complete"]
+    assert stopped["lower_bound"] <= brute_force_total(feedback, range(len(WORDS + HARD)))
+
+    resumed = OptimalSolver(feedback, checkpoint=path).solve()
+    fresh = OptimalSolver(feedback).solve()
+    assert resumed["complete"] and resumed["total"] == fresh["total"]
+    assert resumed["nodes"] < fresh["nodes"]
+
+def test_checkpoint_rejects_other_word_lists(feedback, tmp_path):
+    path = str(tmp_path / "search.npz")
+    OptimalSolver(feedback, checkpoint=path).solve()
+    with pytest.raises(ValueError, match="different word lists"):
+        OptimalSolver(FeedbackMatrix(WORDS), checkpoint=path)
+
+def test_solutions_must_be_in_the_guess_list(feedback):
+    with pytest.raises(ValueError, match="not in the guess list: QUOTA."):
+        OptimalSolver(feedback).solve(solutions=["CRANE", "quota"])
+
+def test_cli_solves_the_word_list_with_a_separate_guess_list(monkeypatch, tmp_path, capsys):
+    from wordle import optimal
+    monkeypatch.setenv("WORDLE_CACHE_DIR", str(tmp_path))
+    solutions, extra = WORDS[:6], ["BATCH", "LIGHT"] + WORDS[6:12]
+    guess_list = tmp_path / "guesses.json"
+    write_word_list(guess_list, extra)
+    load = optimal.load_word_list
+    monkeypatch.setattr(optimal, "load_word_list",
+                        lambda path=None: solutions if path is None else load(path))
+    monkeypatch.setattr(sys, "argv", ["optimal.py", "--guesses", str(guess_list)])
+    optimal.main()
+
+    expected = OptimalSolver(FeedbackMatrix(extra + solutions, solutions)).solve()
+    assert f"guesses for 6 solutions, mean {expected['mean']:.4f}" in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import io
+import json
+import os
+import pytest
+from wordle import scorer
+from wordle.candidates import CandidateIndex
+from wordle.profiling import ENV_VAR, OUTPUT_ENV_VAR, PROFILER
+
+@pytest.fixture
+def profiler(monkeypatch):
+    # enable() exports the setting; monkeypatch removes it again afterwards
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    monkeypatch.delenv(OUTPUT_ENV_VAR, raising=False)
+    PROFILER.clear()
+    yield PROFILER
+    PROFILER.disable()
+    PROFILER.clear()
+
+def test_profiled_functions_record_nothing_while_disabled(profiler):
+    scorer.filterCandidates("CRANE", "00000", ["CRANE", "SLATE", "MOTOR"])
+    CandidateIndex(["CRANE", "SLATE"]).filter("CRANE", "00000")
+    assert profiler.summary() == []
+
+def test_profiler_records_calls_and_candidate_set_sizes(profiler):
+    # Taken before profiling starts, as by an import elsewhere
+    filter_candidates = scorer.filterCandidates
+    profiler.enable("json")
+    filter_candidates("CRANE", "00000", ["CRANE", "SLATE", "MOTOR"])
+    scorer.filterCandidates("CRANE", "00000", ["CRANE"])
+    rows = {row["phase"]: row for row in profiler.summary()}
+    assert rows["filterCandidates"]["calls"] == 2
+    assert rows["filterCandidates"]["mean_size"] == 2.0
+    assert rows["filterCandidates"]["max_size"] == 3
+    assert rows["CandidateIndex.filter"]["calls"] == 2
+
+    out = io.StringIO()
+    profiler.dump(out)
+    assert json.loads(out.getvalue())["phases"][0]["phase"] in rows
+    assert ENV_VAR in os.environ
+
+    recorded = profiler.summary()
+    profiler.disable()
+    filter_candidates("CRANE", "00000", ["CRANE"])
+    assert profiler.summary() == recorded
+
+def test_profiler_merges_worker_counters(profiler):
+    profiler.record("phase", 0.5, size=4)
+    taken = profiler.take()
+    assert profiler.summary() == []
+    profiler.record("phase", 0.25, size=10)
+    profiler.merge(taken)
+    (row,) = profiler.summary()
+    assert row["calls"] == 2 and row["seconds"] == 0.75
+    assert row["mean_size"] == 7.0 and row["max_size"] == 10
@@ -0,0 +1,37 @@
+import pytest
+from wordle.feedback import FeedbackMatrix
+from wordle.ranker import rank_guesses, rank_words, score_totals, score_word
+from wordle.testutil import WORDS
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 100])
+def test_score_totals_match_score_word(chunk_size):
+    totals = score_totals(WORDS, chunk_size=chunk_size)
+    assert list(totals) == [score_word(w, WORDS) for w in WORDS]
+
+def test_score_totals_from_feedback_matrix():
+    # A matrix over a larger, differently ordered list still covers WORDS
+    feedback = FeedbackMatrix(list(reversed(WORDS)) + ["PUFFS"])
+    assert list(score_totals(WORDS, feedback, chunk_size=5)) == list(score_totals(WORDS))
+
+def test_rank_words_keeps_list_order_on_ties():
+    ranked = rank_words(["SLATE", "STALE", "PUFFS"])
+    assert ranked[0][1] == ranked[1][1]
+    assert [w for w, _ in ranked] == ["SLATE", "STALE", "PUFFS"]
+
+def test_rank_guesses_metrics():
+    solutions = ["SLATE", "STALE", "CIGAR", "REACT"]
+    feedback = FeedbackMatrix(WORDS)
+    for metric in ["green-yellow", "entropy", "expected-size", "max-bucket"]:
+        direct = rank_guesses(WORDS, solutions, metric)
+        assert direct == rank_guesses(WORDS, solutions, metric, feedback=feedback)
+        assert len(direct) == len(WORDS)
+
+    best, worst = rank_guesses(["SLATE", "PUFFS"], solutions, "max-bucket")
+    assert best == ("SLATE", 1) and worst == ("PUFFS", 2)
+    best, _ = rank_guesses(["PUFFS", "SLATE"], solutions, "entropy")
+    assert best[0] == "SLATE" and best[1] == pytest.approx(2.0)
+    assert rank_guesses(["PUFFS"], solutions, "expected-size") == [("PUFFS", 2.0)]
+
+def test_rank_guesses_unknown_metric():
+    with pytest.raises(ValueError, match="Unknown metric"):
+        rank_guesses(WORDS, WORDS, "vowels")
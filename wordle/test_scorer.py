@@ -1,12 +1,15 @@
 import pytest
 try:
-    from wordle.scorer import scoreGuess, filterCandidates, main
+    from wordle.scorer import scoreGuess, filterCandidates, main, WordleGame
+    from wordle.feedback import FeedbackMatrix
+    from wordle.strategies import EntropyStrategy
 except ImportError:
-    from scorer import scoreGuess, filterCandidates, main
-from unittest.mock import patch, mock_open
+    from scorer import scoreGuess, filterCandidates, main, WordleGame
+    from feedback import FeedbackMatrix
+    from strategies import EntropyStrategy
+from unittest.mock import patch
 import io
 import sys
-import json
 
 # The test vectors are taken directly from the technical specification.
 # Note: There is a discrepancy in the spec for the "RAISE" vs "ARISE" case.
@@ -56,6 +59,12 @@ def test_non_alphabetic_solution():
     with pytest.raises(ValueError, match="Both guess and solution must contain only alphabetic characters."):
         scoreGuess("APPLE", "APPL3")
 
+def test_score_guess_other_lengths():
+    assert scoreGuess("BANANA", "ANANAS", 6) == "011111"
+    assert scoreGuess("seen", "NEST", 4) == "1201"
+    with pytest.raises(ValueError, match="Both guess and solution must be of length 6."):
+        scoreGuess("APPLE", "BANANA", 6)
+
 # Tests for filterCandidates
 # Note: Several test cases from the specification had incorrect expected outputs.
 # The expected values below have been corrected to align with the specified algorithm.
@@ -95,10 +104,28 @@ def test_filter_non_alphabetic_guess():
     with pytest.raises(ValueError, match="Guess must contain only alphabetic characters."):
         filterCandidates("STA-E", "20011", ["GREAT"])
 
+def test_filter_candidates_six_letter_words():
+    candidates = ["CASTLE", "CATTLE", "SETTLE", "TASSEL"]
+    assert filterCandidates("CATTLE", "220222", candidates) == ["CASTLE"]
+    # Words of another length never match
+    assert filterCandidates("CATTLE", "220222", candidates + ["CAST"]) == ["CASTLE"]
+
+def test_wordle_game_with_six_letter_words():
+    words = ["BANANA", "ANANAS", "CASTLE", "CATTLE", "SETTLE", "LATTES", "TASSEL", "STEALS"]
+    feedback = FeedbackMatrix(words)
+    for solution in words:
+        for matrix, strategy in [(feedback, EntropyStrategy(feedback)), (None, None)]:
+            game = WordleGame(solution, words, feedback=matrix, strategy=strategy)
+            while not game.solved:
+                game.guess_and_update(game.suggest_guess())
+            assert game.history[-1] == (solution, "222222")
+    with pytest.raises(ValueError, match="Solution must be a 6-letter alphabetic word."):
+        WordleGame("APPLE", words)
+
 @patch('argparse.ArgumentParser.parse_args')
 @patch('wordle.scorer.random.choice')
-@patch('builtins.open', new_callable=mock_open, read_data=json.dumps(["crane", "plane", "apple"]))
-def test_main_loop_success(mock_file, mock_random_choice, mock_parse_args):
+@patch('wordle.scorer.load_word_list', return_value=["CRANE", "PLANE", "APPLE"])
+def test_main_loop_success(mock_load_word_list, mock_random_choice, mock_parse_args):
     # Arrange
     # Mock command line arguments
     mock_parse_args.return_value.solution = "apple"
@@ -106,6 +133,10 @@ def test_main_loop_success(mock_file, mock_random_choice, mock_parse_args):
     mock_parse_args.return_value.s2 = None
     mock_parse_args.return_value.s3 = None
     mock_parse_args.return_value.s4 = None
+    mock_parse_args.return_value.strategy = "random"
+    mock_parse_args.return_value.hard = False
+    mock_parse_args.return_value.guesses = None
+    mock_parse_args.return_value.profile = None
 
     # Mock the sequence of random choices to ensure a deterministic test
     mock_random_choice.side_effect = ["crane", "plane", "apple"]
@@ -131,16 +162,21 @@ def test_main_loop_success(mock_file, mock_random_choice, mock_parse_args):
 class TestQuordleGame:
     @patch('argparse.ArgumentParser.parse_args')
     @patch('wordle.scorer.random.choice')
-    @patch('builtins.open', new_callable=mock_open, read_data=json.dumps([
-        "crane", "slate", "brick", "fight", "mound", "pluck", "pride", "wrong"
-    ]))
-    def test_quordle_game_solves_correctly(self, mock_file, mock_random_choice, mock_parse_args):
+    @patch('wordle.scorer.load_word_list', return_value=[
+        "CRANE", "SLATE", "BRICK", "FIGHT", "MOUND", "PLUCK", "PRIDE", "WRONG"
+    ])
+    def test_quordle_game_solves_correctly(self, mock_load_word_list, mock_random_choice,
+                                           mock_parse_args):
         # Arrange
         mock_parse_args.return_value.solution = None
         mock_parse_args.return_value.s1 = "brick"
         mock_parse_args.return_value.s2 = "fight"
         mock_parse_args.return_value.s3 = "mound"
         mock_parse_args.return_value.s4 = "wrong"
+        mock_parse_args.return_value.strategy = "random"
+        mock_parse_args.return_value.hard = False
+        mock_parse_args.return_value.guesses = None
+        mock_parse_args.return_value.profile = None
 
         mock_random_choice.side_effect = [
             "crane", "slate", "brick", "fight", "mound", "pluck", "pride", "wrong"
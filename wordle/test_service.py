@@ -0,0 +1,111 @@
+import asyncio
+import io
+import socket
+import threading
+
+import pytest
+
+from wordle.feedback import FeedbackMatrix
+from wordle.scorer import scoreGuess
+from wordle.service import SolverService
+from wordle.testutil import FILTER_WORDS as WORDS
+
+def make_service(strategy_name="entropy"):
+    return SolverService(WORDS, strategy_name, feedback=FeedbackMatrix(WORDS))
+
+def play(service, session, solution):
+    reply = service.handle(session, "suggest")
+    while not reply.startswith("solved"):
+        guess = reply.split()[0]
+        reply = service.handle(session, f"{guess} {scoreGuess(guess, solution)}")
+    return int(reply.split()[1])
+
+def test_handle_plays_a_game_to_the_end():
+    service = make_service()
+    session = service.new_session()
+    guesses = play(service, session, "MADAM")
+    assert 1 <= guesses <= 6
+    assert session.history[-1] == ("MADAM", "22222")
+    assert service.handle(session, "MADAM 22222").startswith("error:")
+
+def test_handle_reports_candidates_and_resets():
+    service = make_service()
+    session = service.new_session()
+    assert service.handle(session, "STARE 20011").endswith(" 2")
+    assert service.handle(session, "candidates") == "SCREW SUPER"
+    assert service.handle(session, "new").endswith(f" {len(WORDS)}")
+    assert session.history == []
+
+def test_malformed_requests_leave_the_game_unchanged():
+    service = make_service()
+    session = service.new_session()
+    assert service.handle(session, "STARE 2001X").startswith("error:")
+    assert service.handle(session, "hello there friend").startswith("error:")
+    assert service.handle(session, "").startswith("error:")
+    assert session.history == [] and len(session.candidate_ids) == len(WORDS)
+
+def test_sessions_share_strategy_but_not_state():
+    service = make_service()
+    first, second = service.new_session(), service.new_session()
+    assert first.strategy is second.strategy
+    service.handle(first, "STARE 20011")
+    assert len(second.candidate_ids) == len(WORDS)
+
+def test_random_sessions_get_their_own_strategy():
+    service = make_service("random")
+    assert service.new_session().strategy is not service.new_session().strategy
+
+def test_serve_stream_stops_at_quit():
+    out = io.StringIO()
+    make_service().serve_stream(io.StringIO("STARE 20011\nquit\nsuggest\n"), out)
+    assert out.getvalue().count("\n") == 1
+
+def test_socket_server_serves_one_session_per_connection(tmp_path):
+    service = make_service()
+    server = service.make_server(socket_path=str(tmp_path / "wordle.sock"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for _ in range(2):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(tmp_path / "wordle.sock"))
+                stream = client.makefile("rw")
+                stream.write("STARE 20011\ncandidates\nquit\n")
+                stream.flush()
+                assert stream.readline().endswith(" 2\n")
+                assert stream.readline() == "SCREW SUPER\n"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_suggest_many_matches_sessions():
+    service = make_service()
+    states = [[], [("STARE", "20011")], [("STARE", "00110")], [("STARE", "20011")],
+              [("CRANE", "22222")]]
+    results = asyncio.run(service.suggest_many(states))
+
+    expected = []
+    for state in states[:3]:
+        session = service.new_session()
+        for guess, score in state:
+            session.update(guess, score)
+        expected.append(session.suggest())
+    assert results == expected + [expected[1], None]
+
+def test_suggest_many_answers_each_state_once_and_caches_it():
+    service = make_service()
+    states = [[("stare", "20011")], [("STARE", "20011")], [("STARE", "20011"), ("SCREW", "20120")]]
+    asyncio.run(service.suggest_many(states))
+    assert service.suggestions.stats()["misses"] == 2
+    assert len(service.suggestions) == 2
+
+    asyncio.run(service.suggest_many(states))
+    assert service.suggestions.stats()["hits"] == 2
+
+def test_suggest_many_reports_malformed_states():
+    service = make_service()
+    states = [[("STARE", "20011")], [("STARE", "2001X")]]
+    with pytest.raises(ValueError, match="Score must only contain"):
+        asyncio.run(service.suggest_many(states))
+    results = asyncio.run(service.suggest_many(states, return_exceptions=True))
+    assert isinstance(results[0], str) and isinstance(results[1], ValueError)
@@ -0,0 +1,152 @@
+import random
+import numpy as np
+import pytest
+from wordle.candidates import CandidateIndex
+from wordle.feedback import FeedbackMatrix, pattern_histograms, entropies
+from wordle.scorer import QuordleGame, WordleGame
+from wordle.strategies import (
+    EntropyStrategy, FirstBoardStrategy, MultiBoardEntropyStrategy, RandomStrategy,
+)
+from wordle.testutil import WORDS
+
+def test_pattern_histograms_and_entropies():
+    patterns = np.array([[0, 0, 0, 0], [0, 1, 2, 3], [5, 5, 7, 7]], dtype=np.uint8)
+    histograms = pattern_histograms(patterns)
+    assert histograms.shape == (3, 243)
+    assert histograms[0, 0] == 4
+    assert histograms[2, 5] == 2 and histograms[2, 7] == 2
+    assert np.allclose(entropies(histograms), [0.0, 2.0, 1.0])
+
+def test_random_strategy_uses_given_rng():
+    first = WordleGame("CRANE", WORDS, strategy=RandomStrategy(random.Random(7)))
+    second = WordleGame("CRANE", WORDS, strategy=RandomStrategy(random.Random(7)))
+    assert first.suggest_guess() == second.suggest_guess()
+
+def test_random_strategy_skips_used_guesses():
+    game = WordleGame("CRANE", ["CRANE"])
+    game.used_guesses.add("CRANE")
+    with pytest.raises(ValueError, match="No more candidate words to suggest."):
+        game.suggest_guess()
+
+def test_entropy_strategy_picks_most_informative_guess():
+    matrix = FeedbackMatrix(WORDS)
+    strategy = EntropyStrategy(matrix)
+    guess = WordleGame("CRANE", WORDS, strategy=strategy).suggest_guess()
+    scores = entropies(pattern_histograms(matrix.patterns))
+    assert scores[matrix.guess_index[guess]] == pytest.approx(scores.max())
+
+def test_entropy_strategy_prefers_possible_solutions_on_ties():
+    matrix = FeedbackMatrix(WORDS)
+    game = WordleGame("STALE", WORDS, strategy=EntropyStrategy(matrix))
+    game.candidate_ids = game.index.ids(["SLATE", "STALE"])
+    assert game.suggest_guess() in ("SLATE", "STALE")
+
+def test_entropy_strategy_solves_every_word():
+    matrix = FeedbackMatrix(WORDS)
+    strategy = EntropyStrategy(matrix)
+    for solution in WORDS:
+        game = WordleGame(solution, WORDS, feedback=matrix, strategy=strategy)
+        while not game.solved and game.guess_count < len(WORDS):
+            game.guess_count += 1
+            game.guess_and_update(game.suggest_guess())
+        assert game.solved
+
+def test_entropy_strategy_remembers_a_bounded_number_of_decisions():
+    matrix = FeedbackMatrix(WORDS)
+    strategy = EntropyStrategy(matrix, cache_size=2)
+    unbounded = EntropyStrategy(matrix)
+    for solution in WORDS:
+        game = WordleGame(solution, WORDS, strategy=strategy)
+        while not game.solved:
+            guess = game.suggest_guess()
+            assert guess == unbounded.choose(game)
+            game.guess_and_update(guess)
+    assert len(strategy.decisions) == 2
+    assert strategy.decisions.stats()["evictions"] > 0
+
+def test_entropy_strategy_decisions_do_not_depend_on_used_guesses():
+    matrix = FeedbackMatrix(WORDS)
+    strategy = EntropyStrategy(matrix)
+    best = EntropyStrategy(matrix).choose(WordleGame("CRANE", WORDS))
+    # A game that already played the best guess must not change it for the others
+    played = WordleGame("CRANE", WORDS, strategy=strategy)
+    played.used_guesses.add(best)
+    assert played.suggest_guess() != best
+    assert WordleGame("CRANE", WORDS, strategy=strategy).suggest_guess() == best
+
+def test_shared_entropy_strategy_keeps_each_index_with_its_columns(monkeypatch):
+    matrix = FeedbackMatrix(WORDS)
+    strategy = EntropyStrategy(matrix)
+    # The same words in two orders, so each index needs its own column mapping
+    games = []
+    for index in (CandidateIndex(WORDS), CandidateIndex(WORDS[::-1])):
+        game = WordleGame("CRANE", WORDS, index=index)
+        game.candidate_ids = index.ids(["MOTOR", "ROTOR"])
+        games.append(game)
+    expected = [EntropyStrategy(matrix).choose(game) for game in games]
+
+    # Another thread asks about the second index while the first one's
+    # mapping is being computed
+    solution_columns = matrix.solution_columns
+    def interleaved(words):
+        monkeypatch.setattr(matrix, "solution_columns", solution_columns)
+        assert strategy.choose(games[1]) == expected[1]
+        return solution_columns(words)
+    monkeypatch.setattr(matrix, "solution_columns", interleaved)
+
+    assert strategy.choose(games[0]) == expected[0]
+    strategy.decisions.clear()
+    assert strategy.choose(games[1]) == expected[1]
+
+def _play_quietly(game):
+    while not all(board.solved for board in game.games) and game.guess_count < game.max_guesses:
+        game.guess_count += 1
+        guess = game.suggest_guess()
+        game.used_guesses.add(guess)
+        for board in game.games:
+            if not board.solved:
+                board.guess_and_update(guess)
+
+def test_first_board_strategy_uses_first_unsolved_board():
+    game = QuordleGame(["SLATE", "CIGAR"], WORDS, strategy=FirstBoardStrategy(random.Random(1)))
+    game.games[0].solved = True
+    game.games[1].candidate_ids = game.games[1].index.ids(["CIGAR"])
+    assert game.suggest_guess() == "CIGAR"
+
+@pytest.mark.parametrize("solutions", [
+    ["CIGAR", "STEEL", "BANAL", "ROTOR"],
+    ["SLATE", "STALE", "ARISE", "RAISE", "MOTOR", "ROTOR", "ALLEY", "BELLE"],
+])
+def test_multi_board_entropy_solves_all_boards(solutions):
+    matrix = FeedbackMatrix(WORDS)
+    game = QuordleGame(solutions, WORDS, feedback=matrix,
+                       strategy=MultiBoardEntropyStrategy(matrix))
+    assert game.max_guesses == len(solutions) + 5
+    _play_quietly(game)
+    assert all(board.solved for board in game.games)
+
+def test_multi_board_entropy_takes_forced_solve():
+    matrix = FeedbackMatrix(WORDS)
+    game = QuordleGame(["CIGAR", "STEEL"], WORDS, feedback=matrix,
+                       strategy=MultiBoardEntropyStrategy(matrix))
+    game.games[0].candidate_ids = game.games[0].index.ids(["CIGAR"])
+    game.games[1].solved = True
+    assert game.suggest_guess() == "CIGAR"
+
+def test_multi_board_entropy_never_repeats_a_guess():
+    matrix = FeedbackMatrix(WORDS)
+    game = QuordleGame(["CIGAR", "STEEL"], WORDS, feedback=matrix,
+                       strategy=MultiBoardEntropyStrategy(matrix))
+    first = game.suggest_guess()
+    game.used_guesses.add(first)
+    assert game.suggest_guess() != first
+
+def test_multi_board_entropy_decisions_do_not_depend_on_used_guesses():
+    matrix = FeedbackMatrix(WORDS)
+    game = QuordleGame(["CIGAR", "STEEL"], WORDS, feedback=matrix,
+                       strategy=MultiBoardEntropyStrategy(matrix))
+    best = MultiBoardEntropyStrategy(matrix).choose(game)
+    game.used_guesses.add(best)
+    assert game.suggest_guess() != best
+    game.used_guesses.clear()
+    assert game.suggest_guess() == best
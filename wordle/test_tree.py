@@ -0,0 +1,75 @@
+import sys
+
+import pytest
+from wordle.evaluator import simulate_game
+from wordle.feedback import FeedbackMatrix
+from wordle.scorer import WordleGame
+from wordle.strategies import EntropyStrategy, RandomStrategy
+from wordle.testutil import WORDS, write_word_list
+from wordle.tree import DecisionTree, TreeBuilder, TreeStrategy
+
+@pytest.fixture
+def builder():
+    feedback = FeedbackMatrix(WORDS)
+    return TreeBuilder(feedback, EntropyStrategy(feedback))
+
+def test_tree_walk_matches_simulated_games(builder):
+    tree = builder.build("CRANE")
+    counts = tree.guess_counts()
+    assert sorted(counts) == sorted(WORDS)
+    for solution in WORDS:
+        guesses = simulate_game(solution, WORDS, first_guess="CRANE",
+                                feedback=builder.feedback, strategy=builder.strategy)
+        assert counts[solution] == guesses
+
+def test_tree_for_solution_subset(builder):
+    tree = builder.build(solutions=["SLATE", "STALE", "CIGAR"])
+    assert sorted(tree.guess_counts()) == ["CIGAR", "SLATE", "STALE"]
+
+def test_build_rejects_unknown_opener(builder):
+    with pytest.raises(ValueError, match="not in the guess list"):
+        builder.build("ZZZZZ")
+
+def test_save_and_load_round_trip(builder, tmp_path):
+    tree = builder.build("CRANE")
+    path = tmp_path / "tree.json"
+    tree.save(str(path))
+    loaded = DecisionTree.load(str(path))
+    assert loaded.guess_counts() == tree.guess_counts()
+    assert loaded.num_nodes() == tree.num_nodes()
+
+def test_tree_strategy_replays_tree(builder):
+    tree = builder.build("CRANE")
+    counts = tree.guess_counts()
+    strategy = TreeStrategy(tree)
+    for solution in WORDS:
+        assert simulate_game(solution, WORDS, strategy=strategy) == counts[solution]
+
+def test_tree_strategy_falls_back_off_tree(builder):
+    tree = builder.build("CRANE")
+    game = WordleGame("STEEL", WORDS, strategy=TreeStrategy(tree))
+    game.guess_and_update("SHEET")
+    with pytest.raises(ValueError, match="left the decision tree"):
+        game.suggest_guess()
+
+    game.strategy = TreeStrategy(tree, fallback=RandomStrategy())
+    assert game.suggest_guess() in game.candidates
+
+def test_clis_report_an_unknown_opener(monkeypatch, tmp_path, capsys):
+    from wordle import evaluator, tree
+    monkeypatch.setenv("WORDLE_CACHE_DIR", str(tmp_path))
+    word_list = tmp_path / "words.json"
+    write_word_list(word_list, WORDS)
+
+    monkeypatch.setattr(sys, "argv", ["evaluator.py", "--strategy", "entropy", "--exhaustive",
+                                      "--tree", "--word-list", str(word_list),
+                                      "--words", "SALET", "CRANE"])
+    evaluator.main()
+    out = capsys.readouterr().out
+    assert "'SALET' is not in the guess list." in out
+    assert "Exhaustive evaluation (starting with 'CRANE')" in out
+
+    monkeypatch.setattr(tree, "load_word_list", lambda: WORDS)
+    monkeypatch.setattr(sys, "argv", ["tree.py", "--opener", "SALET"])
+    tree.main()
+    assert capsys.readouterr().out == "'SALET' is not in the guess list.\n"
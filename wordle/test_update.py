@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+import pytest
+
+from wordle.feedback import FeedbackMatrix, feedback_cache_path
+from wordle.ranker import load_score_totals, score_totals, score_totals_path, updated_score_totals
+from wordle.service import SolverService
+from wordle.testutil import WORDS, write_word_list
+from wordle.update import update_word_list, word_list_version
+from wordle.wordlist import load_word_list
+from wordle.words import WordTable
+
+EDITED = [w for w in WORDS if w not in ("REACT", "MOTOR")] + ["EERIE", "LLAMA", "TACIT"]
+
+def test_updated_structures_match_fresh_builds():
+    old = FeedbackMatrix(WORDS)
+    new = old.updated(EDITED)
+    assert np.array_equal(new.patterns, FeedbackMatrix(EDITED).patterns)
+    split = old.updated(EDITED, ["SHEET", "LLAMA", "CIGAR"])
+    assert np.array_equal(split.patterns, FeedbackMatrix(EDITED, ["SHEET", "LLAMA", "CIGAR"]).patterns)
+
+    table, fresh = WordTable(WORDS).updated(EDITED), WordTable(EDITED)
+    assert np.array_equal(table.letters, fresh.letters)
+    assert np.array_equal(table.letter_counts, fresh.letter_counts)
+
+    patched = updated_score_totals(score_totals(WORDS, old), old, new)
+    assert np.array_equal(patched, score_totals(EDITED))
+
+def test_update_word_list_publishes_the_new_version(tmp_path):
+    path, cache_dir = str(tmp_path / "list.txt"), str(tmp_path / "cache")
+    write_word_list(path, sorted(w.lower() for w in WORDS))
+    summary = update_word_list(path, add=["llama", "EERIE", "tacit"], remove=["react", "MOTOR"],
+                               cache_dir=cache_dir)
+    assert summary["old_version"] == word_list_version(sorted(WORDS))
+    assert summary["added"] == 3 and summary["removed"] == 2 and summary["words"] == 17
+
+    with open(path) as f:
+        assert f.read() == json.dumps(sorted(w.lower() for w in EDITED), indent=2) + "\n"
+    words = load_word_list(path, cache_dir)
+    assert words == sorted(EDITED)
+    assert summary["new_version"] == word_list_version(words)
+    # The new version's data is cached before the list is published
+    assert np.array_equal(np.load(feedback_cache_path(words, cache_dir=cache_dir)),
+                          FeedbackMatrix(words).patterns)
+    assert np.array_equal(np.load(score_totals_path(words, cache_dir)), score_totals(words))
+    assert np.array_equal(load_score_totals(words, cache_dir=cache_dir), score_totals(words))
+
+def test_update_word_list_rejects_bad_edits(tmp_path):
+    path, cache_dir = str(tmp_path / "list.txt"), str(tmp_path / "cache")
+    write_word_list(path, WORDS)
+    with pytest.raises(ValueError, match="Already in the word list: CRANE"):
+        update_word_list(path, add=["crane"], cache_dir=cache_dir)
+    with pytest.raises(ValueError, match="Not in the word list: QUOTA"):
+        update_word_list(path, remove=["QUOTA"], cache_dir=cache_dir)
+    with pytest.raises(ValueError, match="'LLAM' is not a 5-letter alphabetic word."):
+        update_word_list(path, add=["LLAM"], cache_dir=cache_dir)
+    assert load_word_list(path, cache_dir) == WORDS
+
+def test_service_switches_to_a_published_list(tmp_path):
+    path, cache_dir = str(tmp_path / "list.txt"), str(tmp_path / "cache")
+    write_word_list(path, WORDS)
+    service = SolverService(load_word_list(path, cache_dir), word_list_path=path,
+                            cache_dir=cache_dir)
+    playing = service.new_session()
+    assert not service.refresh()
+
+    update_word_list(path, add=["LLAMA"], remove=["MOTOR"], cache_dir=cache_dir)
+    session = service.new_session()
+    assert "LLAMA" in session.candidates and "MOTOR" not in session.candidates
+    assert "MOTOR" in playing.candidates  # Games in progress keep their list
+    assert service.handle(playing, "new").endswith(f" {len(WORDS)}")
+    assert "LLAMA" in playing.candidates
+    assert service.suggest_batch([[]])[0] in service.feedback.guesses
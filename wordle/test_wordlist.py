@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import pytest
+from wordle import wordlist
+from wordle.testutil import write_word_list
+from wordle.wordlist import PackedWords, compile_word_list, compiled_path, load_word_list
+
+def test_compiled_word_list_round_trips(tmp_path):
+    path = str(tmp_path / "words.bin")
+    compile_word_list(["crane", "Slate", "MOTOR"], path)
+    packed = PackedWords(path)
+    assert len(packed) == 3 and packed.length == 5
+    assert packed.words() == ["CRANE", "SLATE", "MOTOR"]
+    assert packed.records.dtype == np.uint8 and packed.records.shape == (3, 5)
+    assert bytes(packed.records[1]) == b"SLATE"
+
+def test_compile_rejects_mixed_lengths(tmp_path):
+    with pytest.raises(ValueError, match="'CRAN' is not a 5-letter alphabetic word."):
+        compile_word_list(["CRANE", "CRAN"], str(tmp_path / "words.bin"))
+
+def test_load_word_list_compiles_once_and_notices_edits(tmp_path):
+    source = str(tmp_path / "list.json")
+    cache_dir = str(tmp_path / "cache")
+    write_word_list(source, ["crane", "slate"])
+    assert load_word_list(source, cache_dir) == ["CRANE", "SLATE"]
+    binary = compiled_path(source, cache_dir)
+    assert PackedWords(binary).words() == ["CRANE", "SLATE"]
+
+    # Served from the binary while the JSON is unchanged (in a new process)
+    wordlist._loaded.clear()
+    compile_word_list(["MOTOR", "ROTOR"], binary, os.path.getsize(source),
+                      os.stat(source).st_mtime_ns)
+    assert load_word_list(source, cache_dir) == ["MOTOR", "ROTOR"]
+
+    write_word_list(source, ["crane", "slate", "arise"])
+    assert load_word_list(source, cache_dir) == ["CRANE", "SLATE", "ARISE"]
+
+def test_load_word_list_reuses_the_decoded_list_of_an_unchanged_file(tmp_path):
+    source = str(tmp_path / "list.json")
+    cache_dir = str(tmp_path / "cache")
+    write_word_list(source, ["crane", "slate"])
+    first = load_word_list(source, cache_dir)
+    os.remove(compiled_path(source, cache_dir))
+    first.append("MOTOR")
+    assert load_word_list(source, cache_dir) == ["CRANE", "SLATE"]
+
+def test_load_word_list_ignores_a_damaged_binary(tmp_path):
+    source = str(tmp_path / "list.json")
+    cache_dir = str(tmp_path / "cache")
+    write_word_list(source, ["crane", "slate"])
+    load_word_list(source, cache_dir)
+    binary = compiled_path(source, cache_dir)
+    with open(binary, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"X")
+    with pytest.raises(ValueError, match="checksum"):
+        PackedWords(binary)
+    assert load_word_list(source, cache_dir) == ["CRANE", "SLATE"]
+
+def test_load_word_list_keeps_lists_it_cannot_compile(tmp_path):
+    source = str(tmp_path / "list.json")
+    write_word_list(source, ["crane", "cran"])
+    assert load_word_list(source, str(tmp_path / "cache")) == ["CRANE", "CRAN"]
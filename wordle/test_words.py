@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from wordle.words import WordTable, merge_guess_list
+
+def test_word_table_packs_letters():
+    table = WordTable(["crane", "MAMMA"])
+    assert table.letters.dtype == np.uint8 and table.letters.shape == (2, 5)
+    assert table.letters[0].tolist() == [2, 17, 0, 13, 4]
+    assert table.letter_counts[ord("M") - ord("A")].tolist() == [0, 3]
+    assert table.letter_counts.sum(axis=0).tolist() == [5, 5]
+
+def test_word_table_ids_are_case_insensitive():
+    table = WordTable(["crane", "MAMMA"])
+    assert table.id("CRANE") == 0 and table.id("mamma") == 1
+    assert "Crane" in table and "SLATE" not in table
+    assert table.ids(["MAMMA", "crane"]).tolist() == [1, 0]
+    assert table.words_at([1, 0]) == ["MAMMA", "crane"]
+
+def test_word_table_all_ids_are_shared_and_read_only():
+    table = WordTable(["CRANE", "MAMMA", "SLATE"])
+    assert table.all_ids() is table.all_ids()
+    with pytest.raises(ValueError):
+        table.all_ids()[0] = 2
+
+def test_word_table_rejects_bad_words():
+    with pytest.raises(ValueError, match="'CRAN' is not a 5-letter alphabetic word."):
+        WordTable(["CRANE", "CRAN"])
+
+def test_merge_guess_list_adds_missing_solutions():
+    assert merge_guess_list(["ABACK", "crane"], ["CRANE", "SLATE"]) == ["ABACK", "crane", "SLATE"]
@@ -0,0 +1,17 @@
+"""Word lists and helpers shared by the test modules."""
+
+import json
+
+# A small list with anagrams (SLATE/STALE, RAISE/ARISE) and repeated letters
+WORDS = ["CIGAR", "REACT", "SLATE", "STALE", "RAISE", "ARISE", "BANAL", "CANOE",
+         "MOTOR", "ROTOR", "ALLEY", "BELLE", "ARRAY", "SHEET", "STEEL", "CRANE"]
+
+# Words sharing most of their letters, so filters leave a few candidates each
+FILTER_WORDS = ["GREAT", "SCREW", "ALIGN", "GIVEN", "SUPER", "SAVER", "DRAMA", "SCRAM",
+                "PARAM", "MAMMA", "MADAM", "CIGAR", "SOLAR", "RADAR", "SUGAR", "CRANE"]
+
+
+def write_word_list(path, words):
+    """Writes a JSON word list in the layout of wordle-list.txt."""
+    with open(path, "w") as f:
+        f.write(json.dumps(words, indent=2) + "\n")
@@ -0,0 +1,255 @@
+"""
+Precomputed decision trees for deterministic strategies.
+
+With a deterministic strategy, every game from a given opener follows a fixed
+path decided only by the feedback received.  The whole game can therefore be
+built once as a tree: each node holds the guess to play for its candidate set,
+and its children are keyed by the pattern code that guess can receive.
+
+Subtrees are memoized by a hash of their candidate set, so building trees for
+many openers only solves each distinct candidate set once.  A tree can be
+saved as JSON, replayed by `TreeStrategy` with one dictionary lookup per guess,
+and walked once to get the number of guesses for every solution.
+
+Usage:
+  python wordle/tree.py --opener CRANE --output crane-tree.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import weakref
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.feedback import FeedbackMatrix, encode_score, load_feedback_matrix
+    from wordle.strategies import EntropyStrategy
+    from wordle.wordlist import DEFAULT_WORD_LIST, load_word_list
+except ImportError:
+    from feedback import FeedbackMatrix, encode_score, load_feedback_matrix
+    from strategies import EntropyStrategy
+    from wordlist import DEFAULT_WORD_LIST, load_word_list
+
+TREE_FORMAT_VERSION = 1
+
+# A strategy making no progress would recurse forever; no sane game is this long.
+MAX_DEPTH = 50
+
+
+class Node:
+    """
+    One decision: the guess to play, whether it can be the solution, and the
+    next node for each non-solving pattern code.
+    """
+    __slots__ = ("guess", "solves", "children")
+
+    def __init__(self, guess: str, solves: bool, children: dict):
+        self.guess = guess
+        self.solves = solves
+        self.children = children
+
+
+def candidate_set_key(columns: np.ndarray) -> bytes:
+    """Canonical hash of a sorted array of candidate (solution column) indices."""
+    return hashlib.blake2b(np.ascontiguousarray(columns, dtype=np.int64).tobytes(),
+                           digest_size=16).digest()
+
+
+class DecisionTree:
+    def __init__(self, root: Node):
+        self.root = root
+
+    def guess_counts(self) -> dict[str, int]:
+        """
+        Returns the number of guesses the tree needs for every solution, in a
+        single walk over the tree.
+        """
+        counts = {}
+        stack = [(self.root, 1)]
+        while stack:
+            node, depth = stack.pop()
+            if node.solves:
+                counts[node.guess] = depth
+            for child in node.children.values():
+                stack.append((child, depth + 1))
+        return counts
+
+    def num_nodes(self) -> int:
+        return len(self._flatten()[1])
+
+    def _flatten(self):
+        """Numbers the distinct nodes and guesses in depth-first order."""
+        words, word_ids, nodes, node_ids = [], {}, [], {}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if id(node) in node_ids:
+                continue
+            node_ids[id(node)] = len(nodes)
+            nodes.append(node)
+            if node.guess not in word_ids:
+                word_ids[node.guess] = len(words)
+                words.append(node.guess)
+            stack.extend(node.children[code] for code in sorted(node.children, reverse=True))
+        return words, nodes, word_ids, node_ids
+
+    def to_dict(self) -> dict:
+        words, nodes, word_ids, node_ids = self._flatten()
+        return {
+            "format": TREE_FORMAT_VERSION,
+            "words": words,
+            # [word id, solves, [code, child node id, code, child node id, ...]]
+            "nodes": [
+                [word_ids[node.guess], int(node.solves),
+                 [x for code in sorted(node.children)
+                  for x in (int(code), node_ids[id(node.children[code])])]]
+                for node in nodes
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DecisionTree":
+        if data.get("format") != TREE_FORMAT_VERSION:
+            raise ValueError("Unsupported decision tree format.")
+        words = data["words"]
+        nodes = [Node(words[word_id], bool(solves), {}) for word_id, solves, _ in data["nodes"]]
+        for node, (_, _, pairs) in zip(nodes, data["nodes"]):
+            for code, child in zip(pairs[::2], pairs[1::2]):
+                node.children[code] = nodes[child]
+        return cls(nodes[0])
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "DecisionTree":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+class TreeBuilder:
+    """
+    Builds decision trees for a deterministic strategy over a FeedbackMatrix.
+
+    The strategy must offer `best_guess(columns)` for a sorted array of
+    solution columns, as EntropyStrategy does.  Subtrees are memoized by
+    candidate set across all trees built with the same builder.
+    """
+
+    def __init__(self, feedback: FeedbackMatrix, strategy):
+        self.feedback = feedback
+        self.strategy = strategy
+        self._memo = {}
+
+    def build(self, opener: str = None, solutions: list[str] = None) -> DecisionTree:
+        """
+        Builds the tree for all solutions of the matrix (or the given subset),
+        starting with `opener` if one is given.
+        """
+        if opener is not None and opener.upper() not in self.feedback.guess_index:
+            raise ValueError(f"'{opener}' is not in the guess list.")
+        if solutions is None:
+            columns = np.arange(len(self.feedback.solutions), dtype=np.intp)
+        else:
+            columns = np.sort(self.feedback.solution_columns(solutions))
+        return DecisionTree(self._build(columns, opener.upper() if opener else None, 0))
+
+    def _build(self, columns: np.ndarray, guess: str, depth: int) -> Node:
+        if depth > MAX_DEPTH:
+            raise ValueError("The strategy stopped narrowing down the candidates.")
+
+        key = None
+        if guess is None:
+            key = candidate_set_key(columns)
+            node = self._memo.get(key)
+            if node is not None:
+                return node
+            guess = self.strategy.best_guess(columns)
+
+        row = self.feedback.row(guess)[columns]
+        solved = self.feedback.solved_pattern
+        node = Node(guess, bool((row == solved).any()), {})
+        for code in np.unique(row):
+            if code != solved:
+                node.children[int(code)] = self._build(columns[row == code], None, depth + 1)
+
+        if key is not None:
+            self._memo[key] = node
+        return node
+
+
+class TreeStrategy:
+    """
+    Replays a DecisionTree in a WordleGame.
+
+    The game's position in the tree is remembered between calls, so each
+    guess costs a single lookup.  Once a game leaves the tree (for example
+    after a guess the tree would not have made) the optional fallback
+    strategy takes over.
+    """
+
+    def __init__(self, tree: DecisionTree, fallback=None):
+        self.tree = tree
+        self.fallback = fallback
+        self._positions = weakref.WeakKeyDictionary()
+
+    def choose(self, game) -> str:
+        node = self._node_for(game)
+        if node is None:
+            if self.fallback is None:
+                raise ValueError("The game has left the decision tree.")
+            return self.fallback.choose(game)
+        return node.guess
+
+    def _node_for(self, game):
+        played, node = self._positions.get(game, (0, self.tree.root))
+        for guess, score in game.history[played:]:
+            if node is None:
+                break
+            if guess.upper() != node.guess:
+                node = None
+            else:
+                node = node.children.get(encode_score(score, len(score)))
+        self._positions[game] = (len(game.history), node)
+        return node
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the decision tree of the entropy strategy and save it as JSON."
+    )
+    parser.add_argument("--opener", type=str, default=None,
+                        help="First guess (default: the strategy's own choice)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the tree to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        word_list = load_word_list()
+    except Exception as e:
+        print(f"Error loading word list from {DEFAULT_WORD_LIST}: {e}")
+        return
+
+    feedback = load_feedback_matrix(word_list)
+    try:
+        tree = TreeBuilder(feedback, EntropyStrategy(feedback)).build(args.opener)
+    except ValueError as e:
+        print(e)
+        return
+    counts = list(tree.guess_counts().values())
+    print(f"Opener {tree.root.guess}: {tree.num_nodes()} nodes, "
+          f"mean {sum(counts) / len(counts):.4f} guesses, max {max(counts)}")
+
+    if args.output:
+        tree.save(args.output)
+        print(f"Decision tree written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
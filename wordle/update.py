@@ -0,0 +1,158 @@
+"""
+Adds words to or removes them from the word list without rebuilding the
+precomputed data from scratch.
+
+Everything derived from the list is cached under its content: the feedback
+table as `feedback-<key>.npy` and the green-yellow totals of the ranker as
+`totals-<key>.npy`, where <key> is `feedback.cache_key` of the list.  The key
+is the list's version.  An update therefore never touches the files of the
+current version; it writes those of the new one next to them:
+
+  1. the feedback table, patched with `FeedbackMatrix.updated`, so only the
+     pairs involving added words are scored (O(n*d) for d added words);
+  2. the ranker's totals, patched with `ranker.updated_score_totals`;
+  3. last, the word list itself, replaced atomically.
+
+Until step 3 every reader still sees the old list and finds the old files;
+after it, `load_word_list` returns the new list and `load_feedback_matrix`
+finds its table already cached.  A long-running service notices the new
+list on its next game (see `SolverService.refresh`).  An update that fails
+part-way leaves the published list as it was.  The files of old versions
+stay until `feedback.prune_cache` finds them among the least recently used.
+
+Usage:
+  python wordle/update.py --add GRAIL QUOTA
+  python wordle/update.py --remove ABACK --add-file new-words.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.feedback import (
+        cache_key, encode_words, load_feedback_matrix, prune_cache, save_feedback_matrix,
+    )
+    from wordle.ranker import load_score_totals, save_score_totals, updated_score_totals
+    from wordle.wordlist import DEFAULT_WORD_LIST, compiled_path, save_word_list
+except ImportError:
+    from feedback import (
+        cache_key, encode_words, load_feedback_matrix, prune_cache, save_feedback_matrix,
+    )
+    from ranker import load_score_totals, save_score_totals, updated_score_totals
+    from wordlist import DEFAULT_WORD_LIST, compiled_path, save_word_list
+
+
+def word_list_version(words: list[str]) -> str:
+    """The short version id of a word list: the key of its cache files."""
+    return cache_key([w.upper() for w in words])[:16]
+
+
+def update_word_list(path: str = DEFAULT_WORD_LIST, add=(), remove=(),
+                     cache_dir: str = None) -> dict:
+    """
+    Adds and removes words in the JSON word list at `path`, updating the
+    cached feedback table and ranker totals first and publishing the list
+    last, as described above.  A sorted list stays sorted; otherwise added
+    words go at the end.
+
+    Raises ValueError if an added word is malformed or already listed, or a
+    removed word is not listed.  Returns a summary of the update.
+    """
+    start = time.perf_counter()
+    add = list(dict.fromkeys(w.upper() for w in add))
+    remove = set(w.upper() for w in remove)
+
+    with open(path, "r") as f:
+        stored = json.load(f)
+    old_words = [w.upper() for w in stored]
+    listed = set(old_words)
+    length = len(old_words[0]) if old_words else None
+    encode_words(add, length)  # Raises ValueError for a malformed word
+    if listed.intersection(add):
+        raise ValueError(f"Already in the word list: {', '.join(sorted(listed.intersection(add)))}.")
+    if remove - listed:
+        raise ValueError(f"Not in the word list: {', '.join(sorted(remove - listed))}.")
+    if set(add) & remove:
+        raise ValueError("A word cannot be both added and removed.")
+
+    lower = all(w.islower() for w in stored)
+    new_stored = [w for w in stored if w.upper() not in remove]
+    new_stored += [w.lower() if lower else w for w in add]
+    if stored == sorted(stored):
+        new_stored.sort()
+    new_words = [w.upper() for w in new_stored]
+
+    # Patch the derived data under the new version's keys, then publish
+    old_feedback = load_feedback_matrix(old_words, cache_dir=cache_dir)
+    new_feedback = old_feedback.updated(new_words)
+    written = []
+    try:
+        written.append(save_feedback_matrix(new_feedback, cache_dir))
+        totals = load_score_totals(old_words, old_feedback, cache_dir)
+        written.append(save_score_totals(
+            new_words, updated_score_totals(totals, old_feedback, new_feedback), cache_dir))
+    except OSError:
+        pass  # Read-only cache directory; readers will compute them on first use
+    save_word_list(new_stored, path, cache_dir)
+    prune_cache(cache_dir, keep=written + [compiled_path(path, cache_dir)])
+
+    return {
+        "old_version": word_list_version(old_words),
+        "new_version": word_list_version(new_words),
+        "added": len(add),
+        "removed": len(remove),
+        "words": len(new_words),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _read_words(path: str) -> list[str]:
+    """Words from a JSON word list, or one per line from any other file."""
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        return list(json.loads(text))
+    except ValueError:
+        return text.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Add or remove words and update the precomputed data to match."
+    )
+    parser.add_argument("--add", nargs="+", default=[], metavar="WORD", help="Words to add")
+    parser.add_argument("--remove", nargs="+", default=[], metavar="WORD", help="Words to remove")
+    parser.add_argument("--add-file", type=str, default=None,
+                        help="Also add the words in this file (a JSON list or one per line)")
+    parser.add_argument("--remove-file", type=str, default=None,
+                        help="Also remove the words in this file (a JSON list or one per line)")
+    parser.add_argument("--word-list", type=str, default=DEFAULT_WORD_LIST,
+                        help="The JSON word list to update (default: wordle/wordle-list.txt)")
+    args = parser.parse_args()
+
+    try:
+        add = args.add + (_read_words(args.add_file) if args.add_file else [])
+        remove = args.remove + (_read_words(args.remove_file) if args.remove_file else [])
+    except OSError as e:
+        print(f"Error reading words: {e}", file=sys.stderr)
+        sys.exit(2)
+    if not add and not remove:
+        parser.error("nothing to do; give --add, --remove, --add-file or --remove-file")
+
+    try:
+        summary = update_word_list(args.word_list, add, remove)
+    except (OSError, ValueError) as e:
+        print(f"Error updating {args.word_list}: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"Added {summary['added']} and removed {summary['removed']} words: "
+          f"{summary['words']} words, version {summary['old_version']} -> "
+          f"{summary['new_version']} ({summary['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Loading word lists, with a precompiled binary copy for fast startup.
+
+Word lists are kept as JSON arrays of words.  Parsing the JSON and
+upper-casing every word on each start is the slowest part of a short
+command, so `load_word_list` compiles each list once into a binary file in
+the cache directory (see feedback.cache_directory) and memory-maps that on
+later runs.  The binary file is used only while the JSON file still has the
+size and modification time it was compiled from; otherwise the JSON is
+parsed again and the binary rebuilt.  Within a process the decoded list is
+kept as well, so loading an unchanged list again costs one stat.
+
+Binary format (little-endian):
+
+  magic     8 bytes   b"WORDLST\\0"
+  version   uint16    WORD_LIST_FORMAT_VERSION
+  length    uint16    letters per word
+  count     uint32    number of words
+  checksum  uint32    CRC-32 of the records
+  size      uint64    size of the JSON file it was compiled from
+  mtime     int64     modification time (ns) of that file
+  records   count records of length + 1 bytes: the word in uppercase ASCII
+            and a newline, so the whole list decodes with a single split
+
+`save_word_list` replaces a JSON list atomically (see wordle/update.py), so
+a reader sees either the old list or the new one, never a partial file.
+
+Usage (to compile ahead of time, e.g. when deploying):
+  python wordle/wordlist.py
+  python wordle/wordlist.py my-list.json --output my-list.bin
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from wordle.feedback import cache_directory, mark_cache_used
+except ImportError:
+    from feedback import cache_directory, mark_cache_used
+
+DEFAULT_WORD_LIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordle-list.txt")
+
+MAGIC = b"WORDLST\0"
+# Bump whenever the layout changes so older files are ignored.
+WORD_LIST_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHHIIQq")
+
+# Absolute path of a JSON list -> (its word_list_stamp, its decoded words)
+_loaded = {}
+
+
+class PackedWords:
+    """
+    A compiled word list, memory-mapped read-only.
+
+    `records` is a zero-copy (count, length) uint8 view of the uppercase
+    ASCII letters, for callers that want the letters without decoding;
+    `words()` decodes them into a list of strings.
+    """
+
+    def __init__(self, path: str):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{path} is not a compiled word list.")
+        (magic, version, self.length, self.count, checksum,
+         self.source_size, self.source_mtime) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != WORD_LIST_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a compiled word list (version {WORD_LIST_FORMAT_VERSION}).")
+        if len(self._map) != _HEADER.size + self.count * (self.length + 1):
+            raise ValueError(f"{path} is truncated.")
+        self._body = np.frombuffer(self._map, dtype=np.uint8, offset=_HEADER.size)
+        if zlib.crc32(self._body) != checksum:
+            raise ValueError(f"{path} fails its checksum.")
+        self.records = self._body.reshape(self.count, self.length + 1)[:, :self.length]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def words(self) -> list[str]:
+        return self._body.tobytes().decode("ascii").split("\n")[:-1]
+
+
+def compile_word_list(words: list[str], path: str, source_size: int = 0, source_mtime: int = 0):
+    """
+    Writes the words, which must all have the same length, as a binary word
+    list.  The file is replaced atomically.
+    """
+    words = [w.upper() for w in words]
+    length = len(words[0]) if words else 0
+    if any(len(w) != length or not w.isascii() or not w.isalpha() for w in words):
+        bad = next(w for w in words if len(w) != length or not w.isascii() or not w.isalpha())
+        raise ValueError(f"'{bad}' is not a {length}-letter alphabetic word.")
+    records = "".join(w + "\n" for w in words).encode("ascii")
+    header = _HEADER.pack(MAGIC, WORD_LIST_FORMAT_VERSION, length, len(words),
+                          zlib.crc32(records), source_size, source_mtime)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            f.write(header)
+            f.write(records)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+
+
+def compiled_path(source: str, cache_dir: str = None) -> str:
+    """The cache file holding the compiled copy of a JSON word list."""
+    key = hashlib.sha256(os.path.abspath(source).encode()).hexdigest()
+    return os.path.join(cache_dir or cache_directory(), f"words-{key[:16]}.bin")
+
+
+def load_word_list(path: str = DEFAULT_WORD_LIST, cache_dir: str = None) -> list[str]:
+    """
+    Returns the words of a JSON word list in uppercase: the list this
+    process already decoded while the file is unchanged, else its compiled
+    copy when that is up to date.  Every call returns a new list.  Raises
+    OSError if the list cannot be read and ValueError if it is not valid
+    JSON.
+    """
+    stat = os.stat(path)
+    source = os.path.abspath(path)
+    stamp = _stamp(stat)
+    loaded = _loaded.get(source)
+    if loaded is not None and loaded[0] == stamp:
+        return list(loaded[1])
+
+    binary = compiled_path(path, cache_dir)
+    try:
+        packed = PackedWords(binary)
+        if packed.source_size == stat.st_size and packed.source_mtime == stat.st_mtime_ns:
+            mark_cache_used(binary)
+            words = packed.words()
+            _loaded[source] = (stamp, words)
+            return list(words)
+    except (OSError, ValueError):
+        pass  # Missing, stale or damaged; parse the JSON below
+
+    with open(path, "rb") as f:
+        data = f.read()
+    words = [w.upper() for w in json.loads(data)]
+    # Only cache what was read in one piece from an unchanged file
+    if len(data) == stat.st_size:
+        try:
+            compile_word_list(words, binary, stat.st_size, stat.st_mtime_ns)
+        except (OSError, ValueError):
+            pass  # Read-only cache directory or a list of mixed lengths
+        _loaded[source] = (stamp, words)
+    return list(words)
+
+
+def word_list_stamp(path: str = DEFAULT_WORD_LIST) -> tuple:
+    """
+    Identifies the current version of a list file: its size, modification
+    time and inode.  The inode changes on every atomic replace, so a
+    rewrite within the clock's resolution is still noticed.
+    """
+    return _stamp(os.stat(path))
+
+
+def _stamp(stat: os.stat_result) -> tuple:
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def save_word_list(words: list[str], path: str = DEFAULT_WORD_LIST,
+                   cache_dir: str = None):
+    """
+    Writes the words as a JSON word list in the layout of wordle-list.txt,
+    replacing the file atomically, and compiles its binary copy.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            f.write(json.dumps(list(words), indent=2) + "\n")
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    if os.path.exists(path):
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+    os.replace(tmp_path, path)
+
+    stat = os.stat(path)
+    try:
+        compile_word_list(words, compiled_path(path, cache_dir), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        pass  # Read-only cache directory; load_word_list parses the JSON instead
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a JSON word list to the binary format.")
+    parser.add_argument("source", nargs="?", default=DEFAULT_WORD_LIST,
+                        help="JSON word list (default: wordle/wordle-list.txt)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Where to write it (default: the cache file load_word_list reads)")
+    args = parser.parse_args()
+
+    try:
+        stat = os.stat(args.source)
+        with open(args.source, "r") as f:
+            words = json.load(f)
+        output = args.output or compiled_path(args.source)
+        compile_word_list(words, output, stat.st_size, stat.st_mtime_ns)
+    except (OSError, ValueError) as e:
+        print(f"Error compiling {args.source}: {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"Wrote {len(words)} words to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Interned word lists.
+
+A `WordTable` stores a word list once as a packed (n, length) uint8 array of
+letter indices (5 bytes per 5-letter word) together with the count of every
+letter in every word.  Everything below the command-line boundary can then refer to a
+word by its integer id, its position in the table, instead of passing
+strings around and upper-casing, validating and counting them again.
+"""
+
+import numpy as np
+
+try:
+    from wordle.feedback import encode_words
+except ImportError:
+    from feedback import encode_words
+
+ALPHABET_SIZE = 26
+
+
+class WordTable:
+    """
+    A word list interned as integer ids.
+
+    `letters[i]` holds the letter indices (A=0 ... Z=25) of word i and
+    `letter_counts[c, i]` how often letter c occurs in it.  `words` keeps the
+    original spelling of each word; lookups by word are case-insensitive.
+    All words have `length` letters, the length of the first one.
+    """
+
+    def __init__(self, words: list[str], letters: np.ndarray = None,
+                 letter_counts: np.ndarray = None):
+        self.words = list(words)
+        self.word_index = {w.upper(): i for i, w in enumerate(self.words)}
+        self.letters = encode_words(self.words) if letters is None else letters
+        self.length = self.letters.shape[1]
+
+        if letter_counts is None:
+            letter_counts = _count_letters(self.letters)
+        self.letter_counts = letter_counts
+
+        # Shared by every caller that starts from the whole list; read-only so
+        # nobody can change it for the others
+        self._all_ids = np.arange(len(self.words), dtype=np.intp)
+        self._all_ids.flags.writeable = False
+
+    def updated(self, words: list[str]) -> "WordTable":
+        """
+        Returns the table of an edited word list, copying the letters and
+        counts of the words kept and encoding only the words added.
+        """
+        old_ids = np.array([self.word_index.get(w.upper(), -1) for w in words], dtype=np.intp)
+        added = np.flatnonzero(old_ids < 0)
+        added_letters = encode_words([words[i] for i in added], self.length)
+
+        letters = np.empty((len(words), self.length), dtype=np.uint8)
+        letter_counts = np.empty((ALPHABET_SIZE, len(words)), dtype=np.uint8)
+        kept = np.flatnonzero(old_ids >= 0)
+        letters[kept] = self.letters[old_ids[kept]]
+        letter_counts[:, kept] = self.letter_counts[:, old_ids[kept]]
+        letters[added] = added_letters
+        letter_counts[:, added] = _count_letters(added_letters)
+        return WordTable(words, letters, letter_counts)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word.upper() in self.word_index
+
+    def all_ids(self) -> np.ndarray:
+        return self._all_ids
+
+    def id(self, word: str) -> int:
+        """Returns the id of a word, raising KeyError if it is not in the table."""
+        return self.word_index[word.upper()]
+
+    def ids(self, words: list[str]) -> np.ndarray:
+        """Returns the id of each word."""
+        return np.array([self.word_index[w.upper()] for w in words], dtype=np.intp)
+
+    def word(self, word_id: int) -> str:
+        return self.words[word_id]
+
+    def words_at(self, ids) -> list[str]:
+        """Returns the words with the given ids."""
+        return [self.words[i] for i in ids]
+
+    def same_words(self, words) -> bool:
+        """True if `words` is this table's word list (the same words, in order)."""
+        return words is self or words is self.words or words == self.words
+
+
+def _count_letters(letters: np.ndarray) -> np.ndarray:
+    """(26, n) counts of every letter in each row of encoded letters."""
+    counts = np.zeros((ALPHABET_SIZE, len(letters)), dtype=np.uint8)
+    for p in range(letters.shape[1]):
+        np.add.at(counts, (letters[:, p], np.arange(len(letters))), 1)
+    return counts
+
+
+def merge_guess_list(guesses: list[str], solutions: list[str]) -> list[str]:
+    """
+    Returns the allowed-guess list followed by any solutions it lacks, so that
+    every possible solution can also be guessed.
+    """
+    known = {w.upper() for w in guesses}
+    return list(guesses) + [w for w in solutions if w.upper() not in known]